@@ -0,0 +1,70 @@
+"""
+Benchmarks loading the cleaned conversion data from csv against the columnar format.
+
+Run from the root of the repo with:
+    python -m benchmarks.bench_columnar --rows 1000000 10000000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import pandas as pd
+from benchmarks.synthetic import make_ab_data
+from src.utils.helper_ab_test import summarise_conversions
+from src.utils.helper_columnar import read_columnar, write_columnar
+
+
+def time_load(load, repeat: int) -> float:
+    """
+    Returns the best wall time of loading the data and summarising conversions from it.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        summarise_conversions(
+            data=load(),
+            group_col="group",
+            convert_col="converted",
+            page_col="landing_page",
+        )
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = []
+    for n_rows in args.rows:
+        df = make_ab_data(n_rows=n_rows, mismatch_rate=0, duplicate_rate=0)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path_csv = os.path.join(tmp_dir, "df_conversion_clean.csv")
+            path_columnar = os.path.join(tmp_dir, "df_conversion_clean")
+            df.to_csv(path_or_buf=path_csv, index=False)
+            write_columnar(data=df, path=path_columnar)
+
+            csv = time_load(
+                load=lambda: pd.read_csv(filepath_or_buffer=path_csv),
+                repeat=args.repeat,
+            )
+            columnar = time_load(
+                load=lambda: read_columnar(path=path_columnar), repeat=args.repeat
+            )
+        results.append(
+            {
+                "rows": n_rows,
+                "csv_seconds": csv,
+                "columnar_seconds": columnar,
+                "speedup": csv / columnar,
+            }
+        )
+        print(json.dumps(results[-1]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+Benchmarks the helpers and the cleaning pipeline across data scales.
+
+Records the wall time, peak traced memory and throughput of each benchmark at each scale to a json file, so results
+can be compared before and after upgrading. Run from the root of the repo with:
+    python -m benchmarks.run --rows 1000 100000 10000000 --output benchmarks/results.json
+
+For the sample size and C.I. benchmarks, rows are the number of grid points and experiments respectively. The
+scalar get_sample_size and get_ab_test_ci benchmarks make one call per row, so they are skipped above
+SCALAR_MAX_ROWS, and their throughput can be compared with the batch versions at the same scale. Synthetic csvs are
+written in chunks, so scales up to 1e8 rows only need the disk space for them, though the in-memory benchmarks need
+the full frame to fit in memory.
+
+To spot regressions, pass the results of an earlier run, which are compared benchmark by benchmark after the run:
+    python -m benchmarks.run --output benchmarks/results_new.json --baseline benchmarks/results.json
+
+Every run also times importing src.utils.helper_ab_test in a fresh interpreter, which short-lived jobs pay on every
+start, and fails when the best of the repeats exceeds --import-budget seconds.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import scipy
+from benchmarks.synthetic import make_ab_data, write_ab_data
+from src.utils.helper_ab_test import (
+    get_ab_test_ci,
+    get_ab_test_ci_batch,
+    get_sample_size,
+    get_sample_sizes,
+    report_conversions,
+    summarise_conversions,
+)
+from src.utils.helper_data_wrangle import clean_ab_data_chunked, filter_group_pages
+from src.utils.helper_schema import read_ab_data
+
+# scalar benchmarks make one call per row, so larger scales are skipped
+SCALAR_MAX_ROWS = 10_000
+# module whose import time is checked against the import budget
+IMPORT_MODULE = "src.utils.helper_ab_test"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_report_conversions(n_rows: int, tmp_dir: str):
+    df = make_ab_data(n_rows=n_rows, mismatch_rate=0)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for group in ["control", "treatment"]:
+                report_conversions(
+                    data=df,
+                    group_col="group",
+                    group_filter=group,
+                    convert_col="converted",
+                    page_col="landing_page",
+                )
+
+    return run
+
+
+def setup_summarise_conversions(n_rows: int, tmp_dir: str):
+    df = make_ab_data(n_rows=n_rows, mismatch_rate=0)
+    return lambda: summarise_conversions(
+        data=df, group_col="group", convert_col="converted", page_col="landing_page"
+    )
+
+
+def setup_get_sample_sizes(n_rows: int, tmp_dir: str):
+    rng = np.random.default_rng(seed=2021)
+    baseline_rate = rng.uniform(low=0.01, high=0.5, size=n_rows)
+    practical_significance = rng.uniform(low=0.001, high=0.05, size=n_rows)
+    return lambda: get_sample_sizes(
+        baseline_rate=baseline_rate, practical_significance=practical_significance
+    )
+
+
+def setup_get_sample_size(n_rows: int, tmp_dir: str):
+    if n_rows > SCALAR_MAX_ROWS:
+        return None
+    rng = np.random.default_rng(seed=2021)
+    baseline_rate = rng.uniform(low=0.01, high=0.5, size=n_rows)
+    practical_significance = rng.uniform(low=0.001, high=0.05, size=n_rows)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for rate, significance in zip(baseline_rate, practical_significance):
+                get_sample_size(baseline_rate=rate, practical_significance=significance)
+
+    return run
+
+
+def setup_get_ab_test_ci(n_rows: int, tmp_dir: str):
+    if n_rows > SCALAR_MAX_ROWS:
+        return None
+    rng = np.random.default_rng(seed=2021)
+    total_users = rng.integers(low=1_000, high=100_000, size=(2, n_rows))
+    conversions = rng.binomial(n=total_users, p=0.12)
+
+    def run():
+        for i in range(n_rows):
+            get_ab_test_ci(
+                conversions_control=conversions[0, i],
+                conversions_treatment=conversions[1, i],
+                total_users_control=total_users[0, i],
+                total_users_treatment=total_users[1, i],
+            )
+
+    return run
+
+
+def setup_get_ab_test_ci_batch(n_rows: int, tmp_dir: str):
+    rng = np.random.default_rng(seed=2021)
+    total_users = rng.integers(low=1_000, high=100_000, size=(2, n_rows))
+    conversions = rng.binomial(n=total_users, p=0.12)
+    return lambda: get_ab_test_ci_batch(
+        conversions_control=conversions[0],
+        conversions_treatment=conversions[1],
+        total_users_control=total_users[0],
+        total_users_treatment=total_users[1],
+    )
+
+
+def setup_clean_in_memory(n_rows: int, tmp_dir: str):
+    path_in, path_out = os.path.join(tmp_dir, "ab_data.csv"), os.path.join(
+        tmp_dir, "df_conversion_clean.csv"
+    )
+    write_ab_data(path=path_in, n_rows=n_rows)
+
+    def run():
+        df_clean = filter_group_pages(data=read_ab_data(path=path_in))
+        df_clean = df_clean.drop_duplicates(subset="user_id", keep="last")
+        df_clean.to_csv(path_or_buf=path_out, index=False)
+
+    return run
+
+
+def setup_clean_chunked(n_rows: int, tmp_dir: str):
+    path_in, path_out = os.path.join(tmp_dir, "ab_data.csv"), os.path.join(
+        tmp_dir, "df_conversion_clean.csv"
+    )
+    write_ab_data(path=path_in, n_rows=n_rows)
+    return lambda: clean_ab_data_chunked(
+        path_in=path_in, path_out=path_out, spill_dir=tmp_dir
+    )
+
+
+BENCHMARKS = {
+    "report_conversions": setup_report_conversions,
+    "summarise_conversions": setup_summarise_conversions,
+    "get_sample_size": setup_get_sample_size,
+    "get_sample_sizes": setup_get_sample_sizes,
+    "get_ab_test_ci": setup_get_ab_test_ci,
+    "get_ab_test_ci_batch": setup_get_ab_test_ci_batch,
+    "clean_in_memory": setup_clean_in_memory,
+    "clean_chunked": setup_clean_chunked,
+}
+
+
+def measure(run, repeat: int) -> dict:
+    """
+    Returns the best wall time over repeated runs, and the peak traced memory of one further run. An untimed first
+    run warms up lazy imports and caches.
+    """
+    run()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    run()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": min(timings), "peak_memory_bytes": peak_memory}
+
+
+def measure_import(module: str, repeat: int) -> float:
+    """
+    Returns the best wall time of starting a fresh interpreter and importing a module, which includes the start up of
+    python itself and of every dependency the module imports.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], check=True, cwd=ROOT)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def compare(baseline: list, results: list, threshold: float) -> list:
+    """
+    Returns the benchmarks and scales found in both runs whose wall time grew by more than the threshold, printing
+    the ratio of the wall times and peak memory of each one.
+    """
+    previous = {(result["benchmark"], result["rows"]): result for result in baseline}
+    regressions = []
+    for result in results:
+        old = previous.get((result["benchmark"], result["rows"]))
+        if old is None:
+            continue
+        time_ratio = result["seconds"] / old["seconds"]
+        memory_ratio = result["peak_memory_bytes"] / max(old["peak_memory_bytes"], 1)
+        regressed = time_ratio > threshold
+        print(
+            f"{result['benchmark']:<24}{result['rows']:>12}"
+            f"  time x{time_ratio:.2f}  memory x{memory_ratio:.2f}"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+        if regressed:
+            regressions.append(result)
+    return regressions
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "scipy": scipy.__version__,
+        "timestamp": pd.Timestamp.now(tz="UTC").isoformat(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--benchmarks", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS)
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmarks/results.json")
+    parser.add_argument(
+        "--baseline", help="results json of an earlier run to compare against"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.2,
+        help="ratio of wall times above which a benchmark is flagged as a regression",
+    )
+    parser.add_argument(
+        "--import-budget",
+        type=float,
+        default=1.0,
+        help=f"seconds allowed to start python and import {IMPORT_MODULE}",
+    )
+    args = parser.parse_args()
+
+    import_seconds = measure_import(module=IMPORT_MODULE, repeat=args.repeat)
+    print(json.dumps({"import": IMPORT_MODULE, "seconds": import_seconds}))
+
+    results = []
+    for name in args.benchmarks:
+        for n_rows in args.rows:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                run = BENCHMARKS[name](n_rows=n_rows, tmp_dir=tmp_dir)
+                if run is None:
+                    continue
+                measurement = measure(run=run, repeat=args.repeat)
+            results.append(
+                {
+                    "benchmark": name,
+                    "rows": n_rows,
+                    **measurement,
+                    "rows_per_second": n_rows / measurement["seconds"],
+                }
+            )
+            print(json.dumps(results[-1]))
+
+    with open(args.output, "w") as file:
+        json.dump(
+            obj={
+                "environment": environment(),
+                "import_seconds": import_seconds,
+                "results": results,
+            },
+            fp=file,
+            indent=4,
+        )
+
+    failed = import_seconds > args.import_budget
+    print(
+        f"Importing {IMPORT_MODULE} took {import_seconds:.3f}s",
+        f"against a budget of {args.import_budget:.3f}s{', OVER BUDGET' if failed else ''}.",
+    )
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(
+            baseline=baseline, results=results, threshold=args.threshold
+        )
+        print(f"{len(regressions)} regressions above x{args.threshold:.2f}.")
+        failed = failed or bool(regressions)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
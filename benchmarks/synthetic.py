@@ -0,0 +1,87 @@
+"""
+Generates synthetic data with the layout of the Kaggle ab_data csv.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def make_ab_data(
+    n_rows: int,
+    seed: int = 2021,
+    conversion_rate: float = 0.12,
+    mismatch_rate: float = 0.01,
+    duplicate_rate: float = 0.01,
+    start: int = 0,
+) -> pd.DataFrame:
+    """
+    Generates synthetic raw events with the ab_data layout.
+
+    Parameters
+    __________
+    n_rows : int
+        Number of rows to generate.
+    seed : int
+        Seed of the random number generator.
+    conversion_rate : float
+        Probability that a user converted.
+    mismatch_rate : float
+        Probability that a user saw the landing page of the other group.
+    duplicate_rate : float
+        Probability that a row repeats the user id of an earlier row.
+    start : int
+        Index of the first row, for generating a large file in chunks with distinct user ids.
+
+    Returns
+    _______
+    pd.DataFrame
+        Dataframe of the synthetic events.
+    """
+    rng = np.random.default_rng(seed=[seed, start])
+    user_id = np.arange(start, start + n_rows) + 600_000
+    duplicate = rng.random(size=n_rows) < duplicate_rate
+    user_id[duplicate] = rng.integers(
+        low=600_000, high=600_000 + start + n_rows, size=duplicate.sum()
+    )
+
+    treatment = rng.integers(low=0, high=2, size=n_rows).astype(bool)
+    new_page = treatment ^ (rng.random(size=n_rows) < mismatch_rate)
+    return pd.DataFrame(
+        data={
+            "user_id": user_id,
+            "timestamp": pd.Timestamp("2017-01-02")
+            + pd.to_timedelta(
+                rng.integers(low=0, high=22 * 86_400_000_000, size=n_rows), unit="us"
+            ),
+            "group": np.where(treatment, "treatment", "control"),
+            "landing_page": np.where(new_page, "new_page", "old_page"),
+            "converted": rng.binomial(n=1, p=conversion_rate, size=n_rows),
+        }
+    )
+
+
+def write_ab_data(path: str, n_rows: int, chunksize: int = 1_000_000, **kwargs):
+    """
+    Writes synthetic raw events with the ab_data layout to a csv in chunks, so any number of rows can be written in
+    bounded memory.
+
+    Parameters
+    __________
+    path : str
+        String of the file path to write the csv to.
+    n_rows : int
+        Number of rows to write.
+    chunksize : int
+        Number of rows to generate at a time.
+    **kwargs
+        These parameters will be passed to make_ab_data().
+    """
+    for start in range(0, n_rows, chunksize):
+        make_ab_data(
+            n_rows=min(chunksize, n_rows - start), start=start, **kwargs
+        ).to_csv(
+            path_or_buf=path,
+            mode="w" if start == 0 else "a",
+            header=start == 0,
+            index=False,
+        )
@@ -1,29 +1,33 @@
+import os
 import src.utils.helper_ab_test as f
-import pandas as pd
+from src.utils.helper_columnar import read_columnar
+from src.utils.helper_schema import read_ab_data
 
 
-df = pd.read_csv(filepath_or_buffer="data/interim/df_conversion_clean.csv")
+# only load the columns used in the analysis
+columns = ["group", "landing_page", "converted"]
 
-(
-    conversions_control,
-    total_users_control,
-    percent_convert_control,
-) = f.report_conversions(
-    data=df,
-    group_col="group",
-    group_filter="control",
-    convert_col="converted",
-    page_col="landing_page",
-)
+# prefer the columnar cache from `data_wrangle.py --format columnar`, which loads without parsing
+if os.path.isdir("data/interim/df_conversion_clean"):
+    df = read_columnar(path="data/interim/df_conversion_clean", columns=columns)
+else:
+    df = read_ab_data(path="data/interim/df_conversion_clean.csv", columns=columns)
 
-(
-    conversions_treatment,
-    total_users_treatment,
-    percent_convert_treatment,
-) = f.report_conversions(
+# summarise every group in a single pass over the data
+df_summary = f.summarise_conversions(
     data=df,
     group_col="group",
-    group_filter="treatment",
     convert_col="converted",
     page_col="landing_page",
 )
+print(df_summary)
+
+conversions_control, conversions_treatment = df_summary.loc[
+    ["control", "treatment"], "conversions"
+]
+total_users_control, total_users_treatment = df_summary.loc[
+    ["control", "treatment"], "total_users"
+]
+percent_convert_control, percent_convert_treatment = df_summary.loc[
+    ["control", "treatment"], "conversion_rate"
+]
@@ -1,19 +1,92 @@
-import pandas as pd
+import argparse
+from src.utils.helper_columnar import write_columnar
+from src.utils.helper_data_wrangle import (
+    clean_ab_data_chunked,
+    clean_ab_data_partitioned,
+    filter_group_pages,
+)
+from src.utils.helper_schema import read_ab_data
+from src.utils.helper_srm import SrmMonitor
+from src.utils.helper_validation import (
+    DataValidator,
+    report_validation,
+    validate_ab_data,
+)
 
-df = pd.read_csv(filepath_or_buffer="data/raw/ab_data.csv")
+parser = argparse.ArgumentParser(description="Clean the raw A/B test data.")
+parser.add_argument(
+    "--chunksize",
+    type=int,
+    default=None,
+    help="Stream the raw data in chunks of this many rows, for data too large to fit in memory.",
+)
+parser.add_argument(
+    "--format",
+    choices=["csv", "columnar"],
+    default="csv",
+    help="Write the cleaned data as a csv, or as memory-mappable columns that load much faster.",
+)
+parser.add_argument(
+    "--buckets",
+    type=int,
+    default=None,
+    help="With --chunksize, deduplicate users in this many on-disk hash buckets, for more users than fit in memory.",
+)
+parser.add_argument(
+    "--jobs",
+    type=int,
+    default=1,
+    help="Number of processes to deduplicate the hash buckets in. Use -1 for one process per CPU.",
+)
+args = parser.parse_args()
+path_out = {
+    "csv": "data/interim/df_conversion_clean.csv",
+    "columnar": "data/interim/df_conversion_clean",
+}[args.format]
+
+# check the split of users across groups for sample ratio mismatch
+srm_monitor = SrmMonitor()
+# report on groups seeing unexpected pages and users in both groups
+validator = DataValidator()
+
+if args.chunksize is not None and args.buckets is not None:
+    # same cleaning as below, deduplicating users in hash buckets on disk
+    clean_ab_data_partitioned(
+        path_in="data/raw/ab_data.csv",
+        path_out=path_out,
+        chunksize=args.chunksize,
+        n_buckets=args.buckets,
+        n_jobs=args.jobs,
+        output_format=args.format,
+        srm_monitor=srm_monitor,
+        validator=validator,
+    )
+    report_validation(report=validator.report())
+    print(srm_monitor)
+    parser.exit()
+elif args.chunksize is not None:
+    # same cleaning as below, in bounded memory
+    clean_ab_data_chunked(
+        path_in="data/raw/ab_data.csv",
+        path_out=path_out,
+        chunksize=args.chunksize,
+        output_format=args.format,
+        srm_monitor=srm_monitor,
+        validator=validator,
+    )
+    report_validation(report=validator.report())
+    print(srm_monitor)
+    parser.exit()
+
+# read with categorical group/page, narrow integers and parsed timestamps
+df = read_ab_data(path="data/raw/ab_data.csv")
 
 # expect control group to see old_page
 # and treatment to see new_page only
-df.drop_duplicates(subset=["group", "landing_page"], inplace=False)
+report_validation(report=validate_ab_data(data=df))
 # remove control group seeing new_page
 # and treatment group seeing old_page
-mask_control_old = (df["group"] == "control") & (df["landing_page"] == "old_page")
-mask_treatment_new = (df["group"] == "treatment") & (df["landing_page"] == "new_page")
-mask = mask_control_old | mask_treatment_new
-df_clean = df.loc[mask].copy()
-
-# check balanced classes
-df_clean["group"].value_counts()
+df_clean = filter_group_pages(data=df).copy()
 
 # check and drop duplicate users
 df_clean["user_id"].count()
@@ -23,4 +96,10 @@ df_clean["user_id"].value_counts(sort=True)
 df_clean[df_clean["user_id"] == 773192]
 df_clean = df_clean.drop_duplicates(subset="user_id", keep="last", inplace=False)
 
-df_clean.to_csv(path_or_buf="data/interim/df_conversion_clean.csv", index=False)
+# check balanced classes
+print(srm_monitor.update(batch=df_clean))
+
+if args.format == "columnar":
+    write_columnar(data=df_clean, path=path_out)
+else:
+    df_clean.to_csv(path_or_buf=path_out, index=False)
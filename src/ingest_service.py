@@ -0,0 +1,28 @@
+import argparse
+from src.utils.helper_ingest import run_service
+
+parser = argparse.ArgumentParser(
+    description="Ingest conversion events over a socket and serve live A/B test statistics."
+)
+parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+parser.add_argument("--port", type=int, default=8765, help="Port to listen on.")
+parser.add_argument(
+    "--batch-size",
+    type=int,
+    default=1_000,
+    help="Largest number of events to commit at a time.",
+)
+parser.add_argument(
+    "--max-queue",
+    type=int,
+    default=100_000,
+    help="Largest number of uncommitted events before ingestion is paused.",
+)
+args = parser.parse_args()
+
+run_service(
+    host=args.host,
+    port=args.port,
+    batch_size=args.batch_size,
+    max_queue=args.max_queue,
+)
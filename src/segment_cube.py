@@ -0,0 +1,54 @@
+import argparse
+import os
+from src.utils.helper_columnar import read_columnar
+from src.utils.helper_schema import read_ab_data
+from src.utils.helper_segment_cube import (
+    add_day,
+    build_segment_cube,
+    merge_segment_cubes,
+    save_segment_cube,
+)
+
+parser = argparse.ArgumentParser(
+    description="Aggregate the cleaned A/B test data into a cube of segments."
+)
+parser.add_argument(
+    "--dims",
+    nargs="+",
+    default=["day"],
+    help="Columns of the cleaned data to segment by. 'day' is derived from the timestamp.",
+)
+parser.add_argument(
+    "--chunksize",
+    type=int,
+    default=None,
+    help="Stream the cleaned csv in chunks of this many rows, for data too large to fit in memory.",
+)
+args = parser.parse_args()
+columns = ["group", "converted"] + [
+    dim if dim != "day" else "timestamp" for dim in args.dims
+]
+
+# prefer the columnar cache from `data_wrangle.py --format columnar`, which loads without parsing
+if os.path.isdir("data/interim/df_conversion_clean"):
+    chunks = [read_columnar(path="data/interim/df_conversion_clean", columns=columns)]
+elif args.chunksize is not None:
+    chunks = read_ab_data(
+        path="data/interim/df_conversion_clean.csv",
+        columns=columns,
+        chunksize=args.chunksize,
+    )
+else:
+    chunks = [
+        read_ab_data(path="data/interim/df_conversion_clean.csv", columns=columns)
+    ]
+
+# aggregate each chunk once, keeping only the observed segments
+cube = merge_segment_cubes(
+    build_segment_cube(
+        data=add_day(data=chunk) if "day" in args.dims else chunk, dims=args.dims
+    )
+    for chunk in chunks
+)
+os.makedirs("data/processed", exist_ok=True)
+save_segment_cube(cube=cube, path="data/processed/segment_cube.csv")
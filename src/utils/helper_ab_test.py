@@ -1,9 +1,11 @@
-from doctest import testmod
 from typing import Union
+import numpy as np
 import pandas as pd
 import math
-import statsmodels.stats.api as sms
-import scipy.stats as st
+
+# Newton steps of get_sample_sizes() stop once they change the sample sizes by less than this relative tolerance
+NEWTON_TOLERANCE = 1e-10
+NEWTON_MAX_ITERATIONS = 50
 
 
 def report_conversions(
@@ -84,11 +86,98 @@ def report_conversions(
         raise
 
 
+def summarise_conversions(
+    data: pd.DataFrame,
+    group_col: str,
+    convert_col: str,
+    page_col: str,
+) -> pd.DataFrame:
+    """
+    Summarises conversions for every group in a single groupby pass over the data.
+
+    This is the multi-group companion of report_conversions(). Rather than filtering the data once per group, it
+    groups the data once and returns the counts, rates and page-uniqueness of every group together.
+
+    Parameters
+    __________
+    data : pd.DataFrame
+        Dataframe of data to use for calculating counts and percentages of conversions.
+    group_col : str
+        String of the grouping column that identifies whether conversion belongs to 'control' or 'treatment'.
+    convert_col: str
+        String of the column that identifies whether the user has converted or not.
+    page_col: str
+        String of the column that identifies the page seen by the user.
+
+    Returns
+    _______
+    pd.DataFrame
+        Dataframe indexed by group with columns:
+            - conversions: count of conversions.
+            - total_users: count of users.
+            - conversion_rate: decimal representation of the percentage of conversions.
+            - unique_page: whether the group only saw one page.
+            - page: the page seen by the group, missing if the group saw more than one page.
+            - percent_users: percentage of all users that are in the group.
+
+    See Also
+    ________
+    report_conversions : Calculates the count and percentages of conversions for a single group.
+
+    Examples
+    ________
+    >>> df = pd.DataFrame(data={'user_id': [1, 2, 3, 4, 5],
+    ...                         'group': ['control', 'control', 'treatment', 'control', 'treatment'],
+    ...                         'landing_page': ['old_page', 'old_page', 'new_page', 'old_page', 'new_page'],
+    ...                         'converted': [0, 1, 0, 0, 1]})
+    >>> summarise_conversions(data=df,
+    ...                       group_col='group',
+    ...                       convert_col='converted',
+    ...                       page_col='landing_page')[['conversions', 'total_users', 'conversion_rate']]
+    ... # doctest: +NORMALIZE_WHITESPACE
+               conversions  total_users  conversion_rate
+    group
+    control              1            3         0.333333
+    treatment            1            2         0.500000
+    """
+    try:
+        df_summary = data.groupby(by=group_col, observed=True, sort=True).agg(
+            conversions=(convert_col, "sum"),
+            total_users=(convert_col, "count"),
+            n_pages=(page_col, "nunique"),
+            page=(page_col, "first"),
+        )
+
+        df_summary["conversion_rate"] = (
+            df_summary["conversions"] / df_summary["total_users"]
+        )
+        # expect only one page seen by each group
+        df_summary["unique_page"] = df_summary["n_pages"] == 1
+        df_summary["page"] = df_summary["page"].where(df_summary["unique_page"])
+        df_summary["percent_users"] = (
+            df_summary["total_users"] / df_summary["total_users"].sum()
+        ) * 100
+
+        return df_summary[
+            [
+                "conversions",
+                "total_users",
+                "conversion_rate",
+                "unique_page",
+                "page",
+                "percent_users",
+            ]
+        ]
+    except Exception:
+        raise
+
+
 def get_sample_size(
     baseline_rate: Union[int, float],
     practical_significance: float = 0.01,
     confidence_level: float = 0.05,
     sensitivity: float = 0.8,
+    table=None,
 ) -> float:
     """
     Calculates the required sample size for hypothesis-testing.
@@ -109,32 +198,391 @@ def get_sample_size(
         should not be. Also called significance level.
     sensitivity : float
         Float of the probability that the null hypothesis is not rejected when it should be.
+    table : SampleSizeTable
+        Precomputed table from build_sample_size_table() to look the sample size up from. The exact solver is used
+        when the table cannot answer within its error budget.
 
     Returns
     _______
     sample_size : float
         Float of the sample size to use for the A/B test experiment.
 
+    See Also
+    ________
+    get_sample_sizes : Calculates the required sample sizes over arrays of inputs.
+    lookup_sample_sizes : Looks up the required sample sizes from a precomputed table.
+
     Examples
     ________
     >>> baseline_rate = 0.1204
     >>> get_sample_size(baseline_rate=baseline_rate)
     Required sample size: 17210 per group
-    17210.118424055283
+    17210.118424055505
     """
     try:
-        effect_size = sms.proportion_effectsize(
-            prop1=baseline_rate, prop2=baseline_rate + practical_significance
-        )
-        sample_size = sms.NormalIndPower().solve_power(
-            effect_size=effect_size, power=sensitivity, alpha=confidence_level, ratio=1
-        )
+        if table is None:
+            sample_size = get_sample_sizes(
+                baseline_rate=baseline_rate,
+                practical_significance=practical_significance,
+                confidence_level=confidence_level,
+                sensitivity=sensitivity,
+            )
+        else:
+            from src.utils.helper_sample_size_table import lookup_sample_sizes
+
+            sample_size = lookup_sample_sizes(
+                table=table,
+                baseline_rate=baseline_rate,
+                practical_significance=practical_significance,
+                confidence_level=confidence_level,
+                sensitivity=sensitivity,
+            )
+        sample_size = float(sample_size)
         print(f"Required sample size: {round(sample_size)} per group")
         return sample_size
     except Exception:
         raise
 
 
+def get_sample_sizes(
+    baseline_rate: Union[float, np.ndarray],
+    practical_significance: Union[float, np.ndarray] = 0.01,
+    confidence_level: Union[float, np.ndarray] = 0.05,
+    sensitivity: Union[float, np.ndarray] = 0.8,
+) -> np.ndarray:
+    """
+    Calculates the required sample sizes for hypothesis-testing over arrays of inputs.
+
+    Uses the same arcsine effect size as statsmodels' proportion_effectsize() and the same two-sided power as
+    NormalIndPower(), but solves for the sample size analytically rather than by root finding. The closed-form
+    solution ignores the rejection region on the opposite side of the effect, so it is refined with vectorised Newton
+    steps until they change every sample size by less than NEWTON_TOLERANCE, or NEWTON_MAX_ITERATIONS is reached,
+    which brings it in line with solve_power() to a relative difference within 1e-6 whenever the sensitivity is above
+    the confidence level.
+
+    Parameters
+    __________
+    baseline_rate : Union[float, np.ndarray]
+        Float or array of estimates of the metric being analyzed before making any changes.
+    practical_significance : Union[float, np.ndarray]
+        Float or array of the minimum change to the baseline rate that is useful to the business.
+    confidence_level : Union[float, np.ndarray]
+        Float or array of the probability that the null hypothesis (experiment and control are the same) is rejected
+        when it should not be. Also called significance level.
+    sensitivity : Union[float, np.ndarray]
+        Float or array of the probability that the null hypothesis is rejected when it should be. Also called power.
+
+    Returns
+    _______
+    sample_size : np.ndarray
+        Array of the sample sizes per group, broadcast over the shapes of the inputs.
+
+    See Also
+    ________
+    get_sample_size : Calculates the required sample size for hypothesis-testing.
+    get_sample_size_grid : Calculates the required sample sizes over every combination of inputs.
+
+    Examples
+    ________
+    >>> get_sample_sizes(baseline_rate=[0.1, 0.1204], practical_significance=[0.01, 0.02]).round(2)
+    array([14744.1,  4444.1])
+    """
+    # scipy.stats takes over a second to import, so it is only imported by the functions that use it
+    import scipy.stats as st
+
+    try:
+        baseline_rate = np.asarray(baseline_rate, dtype=float)
+        practical_significance = np.asarray(practical_significance, dtype=float)
+
+        # arcsine transformation, as in statsmodels' proportion_effectsize()
+        effect_size = np.abs(
+            2 * np.arcsin(np.sqrt(baseline_rate))
+            - 2 * np.arcsin(np.sqrt(baseline_rate + practical_significance))
+        )
+        z_alpha = st.norm.isf(np.asarray(confidence_level, dtype=float) / 2)
+        z_power = st.norm.ppf(np.asarray(sensitivity, dtype=float))
+
+        # closed-form solution for equal group sizes
+        sample_size = 2 * ((z_alpha + z_power) / effect_size) ** 2
+
+        # account for the opposite rejection region, which solve_power() includes
+        for _ in range(NEWTON_MAX_ITERATIONS):
+            shift = effect_size * np.sqrt(sample_size / 2)
+            power = st.norm.sf(z_alpha - shift) + st.norm.cdf(-z_alpha - shift)
+            slope = (st.norm.pdf(z_alpha - shift) - st.norm.pdf(-z_alpha - shift)) * (
+                shift / (2 * sample_size)
+            )
+            step = (power - sensitivity) / slope
+            sample_size = sample_size - step
+            # undefined sample sizes, such as for no effect, never converge and are left as they are
+            if not np.any(np.abs(step) > NEWTON_TOLERANCE * np.abs(sample_size)):
+                break
+
+        return sample_size
+    except Exception:
+        raise
+
+
+def get_sample_size_grid(
+    baseline_rate: Union[float, np.ndarray],
+    practical_significance: Union[float, np.ndarray] = 0.01,
+    confidence_level: Union[float, np.ndarray] = 0.05,
+    sensitivity: Union[float, np.ndarray] = 0.8,
+) -> pd.DataFrame:
+    """
+    Calculates the required sample sizes over every combination of the inputs in one vectorised call.
+
+    Parameters
+    __________
+    baseline_rate : Union[float, np.ndarray]
+        Float or array of estimates of the metric being analyzed before making any changes.
+    practical_significance : Union[float, np.ndarray]
+        Float or array of the minimum change to the baseline rate that is useful to the business.
+    confidence_level : Union[float, np.ndarray]
+        Float or array of significance levels.
+    sensitivity : Union[float, np.ndarray]
+        Float or array of powers.
+
+    Returns
+    _______
+    pd.DataFrame
+        Tidy dataframe with one row per combination of the inputs and a sample_size column.
+
+    See Also
+    ________
+    get_sample_sizes : Calculates the required sample sizes over arrays of inputs.
+
+    Examples
+    ________
+    >>> df_grid = get_sample_size_grid(baseline_rate=[0.1, 0.12], practical_significance=[0.01, 0.02])
+    >>> df_grid[['baseline_rate', 'practical_significance', 'sample_size']].round(2)
+       baseline_rate  practical_significance  sample_size
+    0           0.10                    0.01     14744.10
+    1           0.10                    0.02      3834.60
+    2           0.12                    0.01     17163.03
+    3           0.12                    0.02      4432.46
+    """
+    try:
+        grid = np.meshgrid(
+            np.atleast_1d(baseline_rate),
+            np.atleast_1d(practical_significance),
+            np.atleast_1d(confidence_level),
+            np.atleast_1d(sensitivity),
+            indexing="ij",
+        )
+        df_grid = pd.DataFrame(
+            data={
+                "baseline_rate": grid[0].ravel(),
+                "practical_significance": grid[1].ravel(),
+                "confidence_level": grid[2].ravel(),
+                "sensitivity": grid[3].ravel(),
+            }
+        )
+        df_grid["sample_size"] = get_sample_sizes(
+            baseline_rate=df_grid["baseline_rate"].to_numpy(),
+            practical_significance=df_grid["practical_significance"].to_numpy(),
+            confidence_level=df_grid["confidence_level"].to_numpy(),
+            sensitivity=df_grid["sensitivity"].to_numpy(),
+        )
+        return df_grid
+    except Exception:
+        raise
+
+
+def get_powers(
+    baseline_rate: Union[float, np.ndarray],
+    practical_significance: Union[float, np.ndarray] = 0.01,
+    sample_size: Union[float, np.ndarray] = 10_000,
+    confidence_level: Union[float, np.ndarray] = 0.05,
+) -> np.ndarray:
+    """
+    Calculates the power of hypothesis-testing over arrays of inputs, the inverse of get_sample_sizes().
+
+    Uses the same arcsine effect size h and two-sided power as get_sample_sizes(), which for n users per group is
+    Phi(h * sqrt(n / 2) - z) + Phi(-h * sqrt(n / 2) - z), where z is the z-score of the confidence level.
+
+    Parameters
+    __________
+    baseline_rate : Union[float, np.ndarray]
+        Float or array of estimates of the metric being analyzed before making any changes.
+    practical_significance : Union[float, np.ndarray]
+        Float or array of the change to the baseline rate to detect.
+    sample_size : Union[float, np.ndarray]
+        Float or array of the number of users per group.
+    confidence_level : Union[float, np.ndarray]
+        Float or array of the probability that the null hypothesis (experiment and control are the same) is rejected
+        when it should not be. Also called significance level.
+
+    Returns
+    _______
+    sensitivity : np.ndarray
+        Array of the probability that the null hypothesis is rejected when it should be, broadcast over the shapes of
+        the inputs.
+
+    See Also
+    ________
+    get_sample_sizes : Calculates the required sample sizes over arrays of inputs.
+    get_mdes : Calculates the minimum detectable effects over arrays of inputs.
+
+    Examples
+    ________
+    >>> get_powers(baseline_rate=0.1204, practical_significance=0.01, sample_size=[10_000, 17210.12]).round(4)
+    array([0.5697, 0.8   ])
+    """
+    import scipy.stats as st
+
+    try:
+        baseline_rate = np.asarray(baseline_rate, dtype=float)
+        effect_size = np.abs(
+            2 * np.arcsin(np.sqrt(baseline_rate))
+            - 2 * np.arcsin(np.sqrt(baseline_rate + practical_significance))
+        )
+        z_alpha = st.norm.isf(np.asarray(confidence_level, dtype=float) / 2)
+        shift = effect_size * np.sqrt(np.asarray(sample_size, dtype=float) / 2)
+        return st.norm.sf(z_alpha - shift) + st.norm.cdf(-z_alpha - shift)
+    except Exception:
+        raise
+
+
+def get_mdes(
+    baseline_rate: Union[float, np.ndarray],
+    sample_size: Union[float, np.ndarray],
+    confidence_level: Union[float, np.ndarray] = 0.05,
+    sensitivity: Union[float, np.ndarray] = 0.8,
+    increase: bool = True,
+) -> np.ndarray:
+    """
+    Calculates the minimum detectable effects (MDE) over arrays of inputs, the smallest change to the baseline rate
+    detected with the given sensitivity by sample_size users per group.
+
+    The arcsine effect size is solved for in closed form, as in get_sample_sizes(), refined with two vectorised Newton
+    steps for the opposite rejection region, and transformed back to a change in the rate by the inverse arcsine.
+
+    Parameters
+    __________
+    baseline_rate : Union[float, np.ndarray]
+        Float or array of estimates of the metric being analyzed before making any changes.
+    sample_size : Union[float, np.ndarray]
+        Float or array of the number of users per group, such as the users available per week.
+    confidence_level : Union[float, np.ndarray]
+        Float or array of the probability that the null hypothesis (experiment and control are the same) is rejected
+        when it should not be. Also called significance level.
+    sensitivity : Union[float, np.ndarray]
+        Float or array of the probability that the null hypothesis is rejected when it should be. Also called power.
+    increase : bool
+        Boolean of whether to return the smallest detectable increase, or otherwise decrease, in the rate.
+
+    Returns
+    _______
+    practical_significance : np.ndarray
+        Array of the minimum detectable changes to the baseline rate, negative for decreases, broadcast over the shapes
+        of the inputs. Missing where no change within the range of rates is detectable.
+
+    See Also
+    ________
+    get_sample_sizes : Calculates the required sample sizes over arrays of inputs.
+    get_powers : Calculates the power of hypothesis-testing over arrays of inputs.
+
+    Examples
+    ________
+    >>> get_mdes(baseline_rate=0.1204, sample_size=[17210.12, 100_000]).round(4)
+    array([0.01  , 0.0041])
+    """
+    import scipy.stats as st
+
+    try:
+        scale = np.sqrt(np.asarray(sample_size, dtype=float) / 2)
+        z_alpha = st.norm.isf(np.asarray(confidence_level, dtype=float) / 2)
+        z_power = st.norm.ppf(np.asarray(sensitivity, dtype=float))
+
+        # closed-form solution, then account for the opposite rejection region as get_sample_sizes() does
+        effect_size = (z_alpha + z_power) / scale
+        for _ in range(2):
+            shift = effect_size * scale
+            power = st.norm.sf(z_alpha - shift) + st.norm.cdf(-z_alpha - shift)
+            slope = (
+                st.norm.pdf(z_alpha - shift) - st.norm.pdf(-z_alpha - shift)
+            ) * scale
+            effect_size = effect_size - (power - sensitivity) / slope
+
+        # invert the arcsine transformation
+        angle = 2 * np.arcsin(np.sqrt(np.asarray(baseline_rate, dtype=float)))
+        angle_treatment = angle + effect_size if increase else angle - effect_size
+        angle_treatment = np.where(
+            (angle_treatment >= 0) & (angle_treatment <= np.pi), angle_treatment, np.nan
+        )
+        return np.sin(angle_treatment / 2) ** 2 - baseline_rate
+    except Exception:
+        raise
+
+
+def get_power_curve(
+    baseline_rate: Union[float, np.ndarray],
+    practical_significance: Union[float, np.ndarray],
+    sample_size: Union[float, np.ndarray],
+    confidence_level: Union[float, np.ndarray] = 0.05,
+) -> pd.DataFrame:
+    """
+    Calculates the power over every combination of the inputs in one vectorised call, such as to plot power curves
+    over effect sizes for each sample size and confidence level.
+
+    Parameters
+    __________
+    baseline_rate : Union[float, np.ndarray]
+        Float or array of estimates of the metric being analyzed before making any changes.
+    practical_significance : Union[float, np.ndarray]
+        Float or array of the changes to the baseline rate to detect.
+    sample_size : Union[float, np.ndarray]
+        Float or array of the numbers of users per group.
+    confidence_level : Union[float, np.ndarray]
+        Float or array of significance levels.
+
+    Returns
+    _______
+    pd.DataFrame
+        Tidy dataframe with one row per combination of the inputs and a sensitivity column of the power.
+
+    See Also
+    ________
+    get_powers : Calculates the power of hypothesis-testing over arrays of inputs.
+
+    Examples
+    ________
+    >>> df_curve = get_power_curve(baseline_rate=0.12, practical_significance=[0.005, 0.01], sample_size=[5000, 20000])
+    >>> df_curve[['practical_significance', 'sample_size', 'sensitivity']].round(4)
+       practical_significance  sample_size  sensitivity
+    0                   0.005         5000       0.1188
+    1                   0.005        20000       0.3321
+    2                   0.010         5000       0.3274
+    3                   0.010        20000       0.8564
+    """
+    try:
+        grid = np.meshgrid(
+            np.atleast_1d(baseline_rate),
+            np.atleast_1d(practical_significance),
+            np.atleast_1d(sample_size),
+            np.atleast_1d(confidence_level),
+            indexing="ij",
+        )
+        df_curve = pd.DataFrame(
+            data={
+                "baseline_rate": grid[0].ravel(),
+                "practical_significance": grid[1].ravel(),
+                "sample_size": grid[2].ravel(),
+                "confidence_level": grid[3].ravel(),
+            }
+        )
+        df_curve["sensitivity"] = get_powers(
+            baseline_rate=df_curve["baseline_rate"].to_numpy(),
+            practical_significance=df_curve["practical_significance"].to_numpy(),
+            sample_size=df_curve["sample_size"].to_numpy(),
+            confidence_level=df_curve["confidence_level"].to_numpy(),
+        )
+        return df_curve
+    except Exception:
+        raise
+
+
 def check_sample_sizes(
     total_users_control: int,
     total_users_treatment: int,
@@ -161,15 +609,15 @@ def check_sample_sizes(
     """
     try:
         sample_size = get_sample_size(baseline_rate=baseline_rate, **kwargs)
-        if total_users_control >= sample_size & total_users_treatment >= sample_size:
+        if total_users_control >= sample_size and total_users_treatment >= sample_size:
             print(
                 "Control and treatment groups are sufficiently large to conduct hypothesis testing"
             )
-        elif total_users_control >= sample_size & total_users_treatment < sample_size:
+        elif total_users_control >= sample_size and total_users_treatment < sample_size:
             print(
                 "Treatment group not sufficiently large to conduct hypothesis testing."
             )
-        elif total_users_control < sample_size & total_users_treatment >= sample_size:
+        elif total_users_control < sample_size and total_users_treatment >= sample_size:
             print("Control group not sufficiently large to conduct hypothesis testing.")
         else:
             print(
@@ -213,6 +661,8 @@ def get_ab_test_ci(
     lower_bound, upper_bound : float, float
         Floats of the lower and upper-bounds of the C.I.
     """
+    import scipy.stats as st
+
     try:
         # compute conversion rates
         conversion_rate_control = conversions_control / total_users_control
@@ -229,7 +679,94 @@ def get_ab_test_ci(
             / total_users_control
         )
         sd = math.sqrt(variance)
-        z_score = abs(st.norm.ppf(q=(1 - confidence_level) / 2))
+        z_score = st.norm.ppf(q=1 - confidence_level / 2)
+
+        # compute C.I.
+        lower_bound = conversion_mean - z_score * sd
+        upper_bound = conversion_mean + z_score * sd
+
+        return lower_bound, upper_bound
+    except Exception:
+        raise
+
+
+def get_ab_test_ci_batch(
+    conversions_control: Union[np.ndarray, pd.Series],
+    conversions_treatment: Union[np.ndarray, pd.Series],
+    total_users_control: Union[np.ndarray, pd.Series],
+    total_users_treatment: Union[np.ndarray, pd.Series],
+    confidence_level: Union[float, np.ndarray, pd.Series] = 0.05,
+) -> (np.ndarray, np.ndarray):
+    """
+    Vectorised version of get_ab_test_ci() over arrays of experiments.
+
+    Each element of the input arrays is one experiment. Inputs are broadcast against each other, so columns of a
+    dataframe of counts can be passed in directly. The z-score is only computed once for each distinct confidence
+    level.
+
+    Parameters
+    __________
+    conversions_control : Union[np.ndarray, pd.Series]
+        Array of the number of people who converted in the control group.
+    conversions_treatment : Union[np.ndarray, pd.Series]
+        Array of the number of people who converted in the treatment group.
+    total_users_control : Union[np.ndarray, pd.Series]
+        Array of the number of people in the control group.
+    total_users_treatment : Union[np.ndarray, pd.Series]
+        Array of the number of people in the treatment group.
+    confidence_level : Union[float, np.ndarray, pd.Series]
+        Float or array of the probability that the null hypothesis (experiment and control are the same) is rejected
+        when it should not be. Also called significance level.
+
+    Returns
+    _______
+    lower_bound, upper_bound : np.ndarray, np.ndarray
+        Arrays of the lower and upper-bounds of the C.I. for each experiment.
+
+    See Also
+    ________
+    get_ab_test_ci : Conducts an A/B test on a single experiment.
+
+    Examples
+    ________
+    >>> lower_bound, upper_bound = get_ab_test_ci_batch(conversions_control=[5329, 100],
+    ...                                                 conversions_treatment=[5648, 120],
+    ...                                                 total_users_control=[58583, 1000],
+    ...                                                 total_users_treatment=[56350, 1000])
+    >>> lower_bound.round(4), upper_bound.round(4)
+    (array([ 0.0059, -0.0074]), array([0.0127, 0.0474]))
+    """
+    import scipy.stats as st
+
+    try:
+        conversions_control = np.asarray(conversions_control, dtype=float)
+        conversions_treatment = np.asarray(conversions_treatment, dtype=float)
+        total_users_control = np.asarray(total_users_control, dtype=float)
+        total_users_treatment = np.asarray(total_users_treatment, dtype=float)
+
+        # compute conversion rates
+        conversion_rate_control = conversions_control / total_users_control
+        conversion_rate_treatment = conversions_treatment / total_users_treatment
+
+        # compute statistics for constructing C.I.
+        conversion_mean = conversion_rate_treatment - conversion_rate_control
+        variance = (
+            conversion_rate_treatment
+            * (1 - conversion_rate_treatment)
+            / total_users_treatment
+            + conversion_rate_control
+            * (1 - conversion_rate_control)
+            / total_users_control
+        )
+        sd = np.sqrt(variance)
+
+        # only compute z-score once per distinct confidence level
+        levels, inverse = np.unique(
+            np.asarray(confidence_level, dtype=float), return_inverse=True
+        )
+        z_score = st.norm.ppf(q=1 - levels / 2)[inverse].reshape(
+            np.shape(confidence_level)
+        )
 
         # compute C.I.
         lower_bound = conversion_mean - z_score * sd
@@ -240,6 +777,77 @@ def get_ab_test_ci(
         raise
 
 
+def get_ab_test_ci_from_moments(
+    mean_control: Union[float, np.ndarray],
+    mean_treatment: Union[float, np.ndarray],
+    variance_control: Union[float, np.ndarray],
+    variance_treatment: Union[float, np.ndarray],
+    total_users_control: Union[int, np.ndarray],
+    total_users_treatment: Union[int, np.ndarray],
+    confidence_level: float = 0.05,
+) -> (float, float):
+    """
+    Conducts an A/B test on the two sided hypothesis from the mean and variance of a metric in each group.
+
+    Unlike get_ab_test_ci(), the variances are not derived from the conversion rates, so this also applies to
+    metrics that are not binary, such as CUPED-adjusted conversions.
+
+    Parameters
+    __________
+    mean_control : Union[float, np.ndarray]
+        Float of the mean of the metric in the control group.
+    mean_treatment : Union[float, np.ndarray]
+        Float of the mean of the metric in the treatment group.
+    variance_control : Union[float, np.ndarray]
+        Float of the sample variance of the metric in the control group.
+    variance_treatment : Union[float, np.ndarray]
+        Float of the sample variance of the metric in the treatment group.
+    total_users_control : Union[int, np.ndarray]
+        Number of people in the control group.
+    total_users_treatment : Union[int, np.ndarray]
+        Number of people in the treatment group.
+    confidence_level : float
+        Float of the significance level.
+
+    Returns
+    _______
+    lower_bound, upper_bound : float, float
+        Floats of the lower and upper-bounds of the C.I.
+
+    See Also
+    ________
+    get_ab_test_ci : Conducts an A/B test on the two sided hypothesis of conversion rates.
+
+    Examples
+    ________
+    >>> p_control, p_treatment = 5329 / 58583, 5648 / 56350
+    >>> lower_bound, upper_bound = get_ab_test_ci_from_moments(mean_control=p_control,
+    ...                                                        mean_treatment=p_treatment,
+    ...                                                        variance_control=p_control * (1 - p_control),
+    ...                                                        variance_treatment=p_treatment * (1 - p_treatment),
+    ...                                                        total_users_control=58583,
+    ...                                                        total_users_treatment=56350)
+    >>> round(float(lower_bound), 4), round(float(upper_bound), 4)
+    (0.0059, 0.0127)
+    """
+    import scipy.stats as st
+
+    try:
+        z_score = st.norm.ppf(q=1 - confidence_level / 2)
+        mean = np.subtract(mean_treatment, mean_control)
+        sd = np.sqrt(
+            np.divide(variance_treatment, total_users_treatment)
+            + np.divide(variance_control, total_users_control)
+        )
+
+        lower_bound = mean - z_score * sd
+        upper_bound = mean + z_score * sd
+
+        return lower_bound, upper_bound
+    except Exception:
+        raise
+
+
 def conclude_ab_test(
     lower_bound: float,
     upper_bound: float,
@@ -266,4 +874,6 @@ def conclude_ab_test(
 
 
 if __name__ == "__main__":
+    from doctest import testmod
+
     testmod(verbose=True)
@@ -0,0 +1,199 @@
+from typing import Union
+import pandas as pd
+from src.utils.helper_ab_test import (
+    check_sample_sizes,
+    conclude_ab_test,
+    get_ab_test_ci,
+)
+
+
+class ConversionAccumulator:
+    """
+    Sufficient statistics of a conversion experiment, accumulated over batches of events.
+
+    Only the number of users and conversions of the control and treatment groups are kept, so new batches of cleaned
+    events update the results in time proportional to the batch rather than the full history. Accumulators over
+    separate batches can be merged together.
+
+    Parameters
+    __________
+    group_col : str
+        String of the grouping column that identifies whether conversion belongs to 'control' or 'treatment'.
+    convert_col: str
+        String of the column that identifies whether the user has converted or not.
+    control : str
+        String of the value of the grouping column for the control group.
+    treatment : str
+        String of the value of the grouping column for the treatment group.
+
+    Examples
+    ________
+    >>> df = pd.DataFrame(data={'user_id': [1, 2, 3, 4, 5],
+    ...                         'group': ['control', 'control', 'treatment', 'control', 'treatment'],
+    ...                         'landing_page': ['old_page', 'old_page', 'new_page', 'old_page', 'new_page'],
+    ...                         'converted': [0, 1, 0, 0, 1]})
+    >>> accumulator = ConversionAccumulator().update(batch=df.iloc[:3])
+    >>> accumulator.merge(other=ConversionAccumulator().update(batch=df.iloc[3:]))
+    ConversionAccumulator(users_control=3, conversions_control=1, users_treatment=2, conversions_treatment=1)
+    >>> accumulator.counts()
+    {'conversions_control': 1, 'conversions_treatment': 1, 'total_users_control': 3, 'total_users_treatment': 2}
+    """
+
+    __slots__ = (
+        "group_col",
+        "convert_col",
+        "control",
+        "treatment",
+        "users_control",
+        "conversions_control",
+        "users_treatment",
+        "conversions_treatment",
+    )
+
+    def __init__(
+        self,
+        group_col: str = "group",
+        convert_col: str = "converted",
+        control: str = "control",
+        treatment: str = "treatment",
+    ):
+        self.group_col = group_col
+        self.convert_col = convert_col
+        self.control = control
+        self.treatment = treatment
+        self.users_control = 0
+        self.conversions_control = 0
+        self.users_treatment = 0
+        self.conversions_treatment = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}("
+            f"users_control={self.users_control}, conversions_control={self.conversions_control}, "
+            f"users_treatment={self.users_treatment}, conversions_treatment={self.conversions_treatment})"
+        )
+
+    def update(self, batch: pd.DataFrame) -> "ConversionAccumulator":
+        """
+        Adds a batch of cleaned events, with one row per user, to the accumulated counts.
+
+        Parameters
+        __________
+        batch : pd.DataFrame
+            Dataframe of the new events. Rows that belong to neither group are ignored.
+
+        Returns
+        _______
+        ConversionAccumulator
+            The updated accumulator.
+        """
+        try:
+            counts = batch.groupby(by=self.group_col, observed=True)[
+                self.convert_col
+            ].agg(["count", "sum"])
+
+            if self.control in counts.index:
+                self.users_control += int(counts.at[self.control, "count"])
+                self.conversions_control += int(counts.at[self.control, "sum"])
+            if self.treatment in counts.index:
+                self.users_treatment += int(counts.at[self.treatment, "count"])
+                self.conversions_treatment += int(counts.at[self.treatment, "sum"])
+
+            return self
+        except Exception:
+            raise
+
+    def merge(self, other: "ConversionAccumulator") -> "ConversionAccumulator":
+        """
+        Adds the counts of another accumulator, such as one built over a separate batch of events.
+
+        Parameters
+        __________
+        other : ConversionAccumulator
+            The accumulator to merge in, which must count the same groups from the same columns.
+
+        Returns
+        _______
+        ConversionAccumulator
+            The merged accumulator.
+        """
+        try:
+            for attribute in ("group_col", "convert_col", "control", "treatment"):
+                if getattr(self, attribute) != getattr(other, attribute):
+                    raise ValueError(
+                        f"Cannot merge accumulators with different {attribute}: "
+                        f"'{getattr(self, attribute)}' and '{getattr(other, attribute)}'."
+                    )
+            self.users_control += other.users_control
+            self.conversions_control += other.conversions_control
+            self.users_treatment += other.users_treatment
+            self.conversions_treatment += other.conversions_treatment
+            return self
+        except Exception:
+            raise
+
+    def counts(self) -> dict:
+        """
+        Returns the accumulated counts as keyword arguments of get_ab_test_ci().
+        """
+        return {
+            "conversions_control": self.conversions_control,
+            "conversions_treatment": self.conversions_treatment,
+            "total_users_control": self.users_control,
+            "total_users_treatment": self.users_treatment,
+        }
+
+    def to_ci(self, confidence_level: float = 0.05) -> (float, float):
+        """
+        Calculates the C.I. of the difference in conversion rates from the accumulated counts.
+
+        See Also
+        ________
+        get_ab_test_ci : Conducts an A/B test on the two sided hypothesis.
+        """
+        return get_ab_test_ci(confidence_level=confidence_level, **self.counts())
+
+    def check_sample_sizes(self, baseline_rate: Union[int, float] = None, **kwargs):
+        """
+        Checks whether the accumulated groups are large enough to conduct hypothesis-testing.
+
+        The baseline rate defaults to the accumulated conversion rate of the control group, which needs at least one
+        control user.
+
+        See Also
+        ________
+        check_sample_sizes : Checks whether the control and treatment sizes are large enough.
+        """
+        if baseline_rate is None:
+            if not self.users_control:
+                raise ValueError(
+                    "There are no control users yet, so please pass the baseline rate."
+                )
+            baseline_rate = self.conversions_control / self.users_control
+        check_sample_sizes(
+            total_users_control=self.users_control,
+            total_users_treatment=self.users_treatment,
+            baseline_rate=baseline_rate,
+            **kwargs,
+        )
+
+    def conclude(self, practical_significance: float, confidence_level: float = 0.05):
+        """
+        Concludes whether we reject or do not reject H_0 from the accumulated counts.
+
+        See Also
+        ________
+        conclude_ab_test : Concludes whether we reject or do not reject H_0.
+        """
+        lower_bound, upper_bound = self.to_ci(confidence_level=confidence_level)
+        conclude_ab_test(
+            lower_bound=lower_bound,
+            upper_bound=upper_bound,
+            practical_significance=practical_significance,
+        )
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
@@ -0,0 +1,280 @@
+from typing import NamedTuple, Union
+import numpy as np
+from src.utils.helper_parallel import split_shards
+
+
+class BayesianResult(NamedTuple):
+    """
+    Posterior summaries of the conversion rates of the treatment and control groups, under beta priors.
+
+    Attributes
+    __________
+    prob_treatment_better : np.ndarray
+        Array of the posterior probability that the treatment conversion rate is greater than the control rate.
+    expected_loss_treatment : np.ndarray
+        Array of the expected loss in conversion rate from choosing treatment, E[max(control - treatment, 0)].
+    expected_loss_control : np.ndarray
+        Array of the expected loss in conversion rate from choosing control, E[max(treatment - control, 0)].
+    """
+
+    prob_treatment_better: np.ndarray
+    expected_loss_treatment: np.ndarray
+    expected_loss_control: np.ndarray
+
+
+def _sum_terms(
+    a_x: np.ndarray,
+    b_x: np.ndarray,
+    a_y: np.ndarray,
+    b_y: np.ndarray,
+    max_elements: int,
+) -> np.ndarray:
+    """
+    Calculates P(X > Y) for X ~ Beta(a_x, b_x) and Y ~ Beta(a_y, b_y) with integer a_x, by summing the a_x terms of
+    the closed form in log space. Experiments are summed together, in chunks of at most max_elements terms.
+    """
+    from scipy.special import betaln
+
+    n_terms = a_x.astype(np.int64)
+    ends = np.cumsum(n_terms)
+    prob = np.empty(len(a_x))
+    start = 0
+    while start < len(a_x):
+        offset = ends[start] - n_terms[start]
+        stop = max(
+            start + 1, np.searchsorted(ends, offset + max_elements, side="right")
+        )
+        chunk = slice(start, stop)
+        experiment = np.repeat(np.arange(stop - start), n_terms[chunk])
+        i = (
+            np.arange(len(experiment))
+            - (ends[chunk] - n_terms[chunk] - offset)[experiment]
+        )
+        a_y_i, b_y_i, b_x_i = (
+            a_y[chunk][experiment],
+            b_y[chunk][experiment],
+            b_x[chunk][experiment],
+        )
+        log_terms = (
+            betaln(a_y_i + i, b_y_i + b_x_i)
+            - np.log(b_x_i + i)
+            - betaln(1 + i, b_x_i)
+            - betaln(a_y_i, b_y_i)
+        )
+        prob[chunk] = np.bincount(
+            experiment, weights=np.exp(log_terms), minlength=stop - start
+        )
+        start = stop
+    return prob
+
+
+def _prob_greater(
+    a_x: np.ndarray,
+    b_x: np.ndarray,
+    a_y: np.ndarray,
+    b_y: np.ndarray,
+    max_elements: int,
+) -> np.ndarray:
+    """
+    Calculates P(X > Y) for X ~ Beta(a_x, b_x) and Y ~ Beta(a_y, b_y) exactly, summing over the smaller of the two
+    integer alphas, as P(X > Y) = 1 - P(Y > X).
+    """
+    swap = a_y < a_x
+    prob = _sum_terms(
+        a_x=np.where(swap, a_y, a_x),
+        b_x=np.where(swap, b_y, b_x),
+        a_y=np.where(swap, a_x, a_y),
+        b_y=np.where(swap, b_x, b_y),
+        max_elements=max_elements,
+    )
+    return np.where(swap, 1 - prob, prob)
+
+
+def _exact(
+    a_control: np.ndarray,
+    b_control: np.ndarray,
+    a_treatment: np.ndarray,
+    b_treatment: np.ndarray,
+    max_elements: int,
+) -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    Calculates the posterior summaries with the closed forms, where the expected loss of choosing treatment is
+    E[C 1(C > T)] - E[T 1(C > T)], and each expectation is a probability under a beta with its alpha incremented.
+    """
+    mean_control = a_control / (a_control + b_control)
+    mean_treatment = a_treatment / (a_treatment + b_treatment)
+    prob_treatment_better = _prob_greater(
+        a_treatment, b_treatment, a_control, b_control, max_elements
+    )
+    expected_loss_treatment = mean_control * _prob_greater(
+        a_control + 1, b_control, a_treatment, b_treatment, max_elements
+    ) - mean_treatment * _prob_greater(
+        a_control, b_control, a_treatment + 1, b_treatment, max_elements
+    )
+    # E[max(T - C, 0)] - E[max(C - T, 0)] = E[T - C]
+    expected_loss_control = expected_loss_treatment + mean_treatment - mean_control
+    return (
+        prob_treatment_better,
+        np.maximum(expected_loss_treatment, 0),
+        np.maximum(expected_loss_control, 0),
+    )
+
+
+def _monte_carlo(
+    a_control: np.ndarray,
+    b_control: np.ndarray,
+    a_treatment: np.ndarray,
+    b_treatment: np.ndarray,
+    n_draws: int,
+    max_elements: int,
+    rng: np.random.Generator,
+) -> (np.ndarray, np.ndarray, np.ndarray):
+    """
+    Estimates the posterior summaries from draws of the posteriors, in chunks of at most max_elements draws.
+    """
+    totals = np.zeros(shape=(3, len(a_control)))
+    shard_size = max(1, max_elements // len(a_control))
+    for size in split_shards(n_total=n_draws, shard_size=shard_size):
+        draws_control = rng.beta(a_control, b_control, size=(size, len(a_control)))
+        draws_treatment = rng.beta(
+            a_treatment, b_treatment, size=(size, len(a_control))
+        )
+        difference = draws_treatment - draws_control
+        totals[0] += np.count_nonzero(difference > 0, axis=0)
+        totals[1] += np.maximum(-difference, 0).sum(axis=0)
+        totals[2] += np.maximum(difference, 0).sum(axis=0)
+    return tuple(totals / n_draws)
+
+
+def get_bayesian_ab_test(
+    conversions_control: Union[int, np.ndarray],
+    conversions_treatment: Union[int, np.ndarray],
+    total_users_control: Union[int, np.ndarray],
+    total_users_treatment: Union[int, np.ndarray],
+    prior_alpha: float = 1,
+    prior_beta: float = 1,
+    n_draws: int = 100_000,
+    max_elements: int = 10_000_000,
+    seed: int = None,
+) -> BayesianResult:
+    """
+    Calculates the posterior probability that treatment beats control, and the expected loss of choosing each group,
+    with beta-binomial models of the conversion rates.
+
+    Where the posterior alphas are integers, which they are for integer priors such as the default uniform prior,
+    the exact beta-difference formula is used. It sums as many terms as the smaller posterior alpha, and the terms of
+    all experiments are summed together in chunks of at most max_elements. Other experiments, or those with more than
+    max_elements terms, are estimated from n_draws posterior draws, drawn for all of them together in chunks of at most
+    max_elements draws.
+
+    Parameters
+    __________
+    conversions_control : Union[int, np.ndarray]
+        Number of people who converted in the control group.
+    conversions_treatment : Union[int, np.ndarray]
+        Number of people who converted in the treatment group.
+    total_users_control : Union[int, np.ndarray]
+        Number of people in the control group.
+    total_users_treatment : Union[int, np.ndarray]
+        Number of people in the treatment group.
+    prior_alpha : float
+        Float of the alpha of the beta prior of both conversion rates.
+    prior_beta : float
+        Float of the beta of the beta prior of both conversion rates.
+    n_draws : int
+        Number of posterior draws for experiments without an exact formula.
+    max_elements : int
+        Largest number of terms or draws held in memory at once.
+    seed : int
+        Seed of the random number generator, for reproducible Monte Carlo estimates.
+
+    Returns
+    _______
+    BayesianResult
+        Named tuple of arrays of the probability treatment is better and the expected loss of choosing each group.
+
+    See Also
+    ________
+    conclude_bayesian_ab_test : Concludes which group to choose from the expected losses.
+
+    Examples
+    ________
+    >>> result = get_bayesian_ab_test(conversions_control=5329,
+    ...                               conversions_treatment=5648,
+    ...                               total_users_control=58583,
+    ...                               total_users_treatment=56350)
+    >>> round(float(result.prob_treatment_better), 4)
+    1.0
+    >>> round(float(result.expected_loss_treatment), 6), round(float(result.expected_loss_control), 6)
+    (0.0, 0.009266)
+    """
+    try:
+        arrays = np.broadcast_arrays(
+            conversions_control,
+            conversions_treatment,
+            total_users_control,
+            total_users_treatment,
+        )
+        shape = arrays[0].shape
+        conv_c, conv_t, users_c, users_t = (
+            array.ravel().astype(float) for array in arrays
+        )
+        a_control, b_control = prior_alpha + conv_c, prior_beta + users_c - conv_c
+        a_treatment, b_treatment = prior_alpha + conv_t, prior_beta + users_t - conv_t
+
+        # the closed form sums over an integer alpha, incremented by one for the expected losses
+        exact = (
+            (a_control == np.round(a_control))
+            & (a_treatment == np.round(a_treatment))
+            & (np.minimum(a_control, a_treatment) + 1 <= max_elements)
+        )
+
+        summaries = np.empty(shape=(3, len(conv_c)))
+        parameters = (a_control, b_control, a_treatment, b_treatment)
+        if exact.any():
+            summaries[:, exact] = _exact(
+                *(parameter[exact] for parameter in parameters),
+                max_elements=max_elements,
+            )
+        if not exact.all():
+            summaries[:, ~exact] = _monte_carlo(
+                *(parameter[~exact] for parameter in parameters),
+                n_draws=n_draws,
+                max_elements=max_elements,
+                rng=np.random.default_rng(seed=seed),
+            )
+        return BayesianResult(*(summary.reshape(shape) for summary in summaries))
+    except Exception:
+        raise
+
+
+def conclude_bayesian_ab_test(
+    expected_loss_treatment: float,
+    expected_loss_control: float,
+    threshold_of_caring: float,
+):
+    """
+    Concludes whether we choose treatment, choose control, or keep collecting data.
+
+    Parameters
+    __________
+    expected_loss_treatment : float
+        Float of the expected loss in conversion rate from choosing treatment.
+    expected_loss_control : float
+        Float of the expected loss in conversion rate from choosing control.
+    threshold_of_caring : float
+        Float of the largest loss in conversion rate that is not worth worrying about, similar to the practical
+        significance of conclude_ab_test().
+    """
+    if expected_loss_treatment < threshold_of_caring:
+        print("Choose treatment.")
+    elif expected_loss_control < threshold_of_caring:
+        print("Choose control.")
+    else:
+        print("Insufficient evidence to choose a group.")
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
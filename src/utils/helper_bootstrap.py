@@ -0,0 +1,222 @@
+from typing import Callable, Union
+import numpy as np
+from src.utils.helper_parallel import map_shards, split_shards
+
+
+def _resample_counts(
+    size: int,
+    rng: np.random.Generator,
+    conversion_rate_control: np.ndarray,
+    conversion_rate_treatment: np.ndarray,
+    total_users_control: np.ndarray,
+    total_users_treatment: np.ndarray,
+) -> np.ndarray:
+    """
+    Draws resampled differences in conversion rates as binomial draws on the counts of each arm.
+    """
+    shape = (size,) + np.shape(conversion_rate_control)
+    resampled_control = (
+        rng.binomial(n=total_users_control, p=conversion_rate_control, size=shape)
+        / total_users_control
+    )
+    resampled_treatment = (
+        rng.binomial(n=total_users_treatment, p=conversion_rate_treatment, size=shape)
+        / total_users_treatment
+    )
+    return resampled_treatment - resampled_control
+
+
+def _resample_users(
+    size: int,
+    rng: np.random.Generator,
+    values_control: np.ndarray,
+    values_treatment: np.ndarray,
+    statistic: Callable,
+    max_elements: int,
+) -> np.ndarray:
+    """
+    Draws resampled differences in a user-level statistic from matrices of resampled indices, in batches of at most
+    max_elements indices.
+    """
+    batch_size = max(1, max_elements // max(len(values_control), len(values_treatment)))
+    differences = []
+    for batch in split_shards(n_total=size, shard_size=batch_size):
+        index_control = rng.integers(
+            len(values_control), size=(batch, len(values_control))
+        )
+        index_treatment = rng.integers(
+            len(values_treatment), size=(batch, len(values_treatment))
+        )
+        differences.append(
+            statistic(values_treatment[index_treatment], axis=1)
+            - statistic(values_control[index_control], axis=1)
+        )
+    return np.concatenate(differences)
+
+
+def _percentile_ci(
+    differences: np.ndarray, confidence_level: float
+) -> (np.ndarray, np.ndarray):
+    """
+    Calculates the percentile C.I. from resampled differences along the first axis.
+    """
+    lower_bound, upper_bound = np.quantile(
+        differences, q=[confidence_level / 2, 1 - confidence_level / 2], axis=0
+    )
+    return lower_bound, upper_bound
+
+
+def get_bootstrap_ci(
+    conversions_control: Union[int, np.ndarray],
+    conversions_treatment: Union[int, np.ndarray],
+    total_users_control: Union[int, np.ndarray],
+    total_users_treatment: Union[int, np.ndarray],
+    confidence_level: float = 0.05,
+    n_resamples: int = 10_000,
+    shard_size: int = 10_000,
+    n_jobs: int = 1,
+    seed: int = None,
+) -> (np.ndarray, np.ndarray):
+    """
+    Calculates the bootstrap C.I. of the difference in conversion rates between the treatment and control groups.
+
+    Resampling the users of an arm with replacement and counting their conversions is a binomial draw on the
+    counts of the arm, so resamples are drawn as batches of binomials rather than by resampling users. Resamples are
+    split into shards of shard_size, each with its own random number stream, which can be spread across a process
+    pool. The C.I. is the percentile interval of the resampled differences. Inputs can also be arrays, to bootstrap
+    many experiments at once.
+
+    Parameters
+    __________
+    conversions_control : Union[int, np.ndarray]
+        Number of people who converted in the control group.
+    conversions_treatment : Union[int, np.ndarray]
+        Number of people who converted in the treatment group.
+    total_users_control : Union[int, np.ndarray]
+        Number of people in the control group.
+    total_users_treatment : Union[int, np.ndarray]
+        Number of people in the treatment group.
+    confidence_level : float
+        Float of the probability that the null hypothesis (experiment and control are the same) is rejected when it
+        should not be. Also called significance level.
+    n_resamples : int
+        Number of bootstrap resamples.
+    shard_size : int
+        Number of resamples drawn by each shard.
+    n_jobs : int
+        Number of processes to spread the shards across. Use -1 for one process per CPU.
+    seed : int
+        Seed of the random number streams, for reproducible intervals.
+
+    Returns
+    _______
+    lower_bound, upper_bound : np.ndarray, np.ndarray
+        Arrays of the lower and upper-bounds of the C.I.
+
+    See Also
+    ________
+    get_ab_test_ci : Conducts an A/B test on the two sided hypothesis, with the normal approximation C.I.
+
+    Examples
+    ________
+    >>> lower_bound, upper_bound = get_bootstrap_ci(conversions_control=5329,
+    ...                                             conversions_treatment=5648,
+    ...                                             total_users_control=58583,
+    ...                                             total_users_treatment=56350,
+    ...                                             seed=2021)
+    >>> round(float(lower_bound), 4), round(float(upper_bound), 4)
+    (0.0058, 0.0127)
+    """
+    try:
+        total_users_control = np.asarray(total_users_control)
+        total_users_treatment = np.asarray(total_users_treatment)
+        differences = map_shards(
+            func=_resample_counts,
+            shard_sizes=split_shards(n_total=n_resamples, shard_size=shard_size),
+            seed=seed,
+            n_jobs=n_jobs,
+            conversion_rate_control=np.asarray(conversions_control)
+            / total_users_control,
+            conversion_rate_treatment=np.asarray(conversions_treatment)
+            / total_users_treatment,
+            total_users_control=total_users_control,
+            total_users_treatment=total_users_treatment,
+        )
+        return _percentile_ci(
+            differences=np.concatenate(differences), confidence_level=confidence_level
+        )
+    except Exception:
+        raise
+
+
+def get_bootstrap_ci_user_level(
+    values_control: np.ndarray,
+    values_treatment: np.ndarray,
+    statistic: Callable = np.mean,
+    confidence_level: float = 0.05,
+    n_resamples: int = 10_000,
+    shard_size: int = 1_000,
+    n_jobs: int = 1,
+    seed: int = None,
+    max_elements: int = 10_000_000,
+) -> (float, float):
+    """
+    Calculates the bootstrap C.I. of the difference in a user-level statistic between the treatment and control
+    groups.
+
+    For metrics that are not binary, users are resampled with matrices of random indices, one row per resample, in
+    batches of at most max_elements indices to bound memory. Shards of resamples can be spread across a process pool
+    as in get_bootstrap_ci().
+
+    Parameters
+    __________
+    values_control : np.ndarray
+        Array of the metric of each user in the control group.
+    values_treatment : np.ndarray
+        Array of the metric of each user in the treatment group.
+    statistic : Callable
+        Function that reduces a 2d array along axis=1, such as np.mean or np.median.
+    confidence_level : float
+        Float of the significance level.
+    n_resamples : int
+        Number of bootstrap resamples.
+    shard_size : int
+        Number of resamples drawn by each shard.
+    n_jobs : int
+        Number of processes to spread the shards across. Use -1 for one process per CPU.
+    seed : int
+        Seed of the random number streams, for reproducible intervals.
+    max_elements : int
+        Largest number of resampled indices held in memory at once by each shard.
+
+    Returns
+    _______
+    lower_bound, upper_bound : float, float
+        Floats of the lower and upper-bounds of the C.I.
+
+    See Also
+    ________
+    get_bootstrap_ci : Calculates the bootstrap C.I. of the difference in conversion rates.
+    """
+    try:
+        differences = map_shards(
+            func=_resample_users,
+            shard_sizes=split_shards(n_total=n_resamples, shard_size=shard_size),
+            seed=seed,
+            n_jobs=n_jobs,
+            values_control=np.asarray(values_control),
+            values_treatment=np.asarray(values_treatment),
+            statistic=statistic,
+            max_elements=max_elements,
+        )
+        return _percentile_ci(
+            differences=np.concatenate(differences), confidence_level=confidence_level
+        )
+    except Exception:
+        raise
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
@@ -0,0 +1,213 @@
+from typing import Sequence
+import json
+import os
+import numpy as np
+import pandas as pd
+from src.utils.helper_schema import CLEAN_DTYPES
+
+SCHEMA_FILE = "schema.json"
+
+
+class ColumnarWriter:
+    """
+    Writes a dataframe, possibly in chunks, to a directory of one memory-mappable .npy file per column.
+
+    Categorical columns are stored as their integer codes, with their categories kept in a schema.json file
+    alongside. Every chunk is cast to the given dtypes before it is written, so categorical columns should be given
+    a pd.CategoricalDtype with fixed categories. Values outside of those categories raise a ValueError.
+
+    Parameters
+    __________
+    path : str
+        String of the directory to write the columns to.
+    n_rows : int
+        Number of rows that will be written in total.
+    dtypes : dict
+        Dictionary of the dtype to cast each column to before writing.
+
+    Examples
+    ________
+    >>> import tempfile
+    >>> df = pd.DataFrame(data={'user_id': [1, 2, 3],
+    ...                         'group': ['control', 'treatment', 'control'],
+    ...                         'converted': [0, 1, 1]})
+    >>> path = os.path.join(tempfile.mkdtemp(), 'df_conversion_clean')
+    >>> with ColumnarWriter(path=path, n_rows=3, dtypes=CLEAN_DTYPES) as writer:
+    ...     writer.write(chunk=df.iloc[:2])
+    ...     writer.write(chunk=df.iloc[2:])
+    >>> df_columnar = read_columnar(path=path)
+    >>> df_columnar
+       user_id      group  converted
+    0        1    control          0
+    1        2  treatment          1
+    2        3    control          1
+    >>> df_columnar['group'].cat.codes.dtype, df_columnar['converted'].dtype
+    (dtype('int8'), dtype('int8'))
+    """
+
+    def __init__(self, path: str, n_rows: int, dtypes: dict = None):
+        self.path = path
+        self.n_rows = n_rows
+        self.dtypes = dtypes or {}
+        self.position = 0
+        self.columns = {}
+        self.schema = {}
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+    def _open(self, chunk: pd.DataFrame):
+        """
+        Allocates the memory-mapped column files from the dtypes of the first chunk.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        for col, values in chunk.items():
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                dtype = values.cat.codes.dtype
+                self.schema[col] = {
+                    "kind": "categorical",
+                    "categories": values.cat.categories.tolist(),
+                }
+            elif pd.api.types.is_numeric_dtype(
+                values.dtype
+            ) or pd.api.types.is_datetime64_dtype(values.dtype):
+                dtype = values.to_numpy().dtype
+                self.schema[col] = {"kind": "array"}
+            else:
+                raise TypeError(
+                    f"Column {col} has dtype {values.dtype}, which cannot be stored as an array. "
+                    f"Please give it a categorical dtype."
+                )
+            self.columns[col] = np.lib.format.open_memmap(
+                filename=os.path.join(self.path, f"{col}.npy"),
+                mode="w+",
+                dtype=dtype,
+                shape=(self.n_rows,),
+            )
+
+    def write(self, chunk: pd.DataFrame):
+        """
+        Writes the next chunk of rows.
+
+        Parameters
+        __________
+        chunk : pd.DataFrame
+            Dataframe of the rows to write.
+        """
+        try:
+            dtypes = {col: dtype for col, dtype in self.dtypes.items() if col in chunk}
+            for col, dtype in dtypes.items():
+                if isinstance(dtype, pd.CategoricalDtype):
+                    # casting would turn labels outside the fixed categories into missing values
+                    unknown = ~chunk[col].isin(dtype.categories) & chunk[col].notna()
+                    if unknown.any():
+                        raise ValueError(
+                            f"Column {col} has values {chunk[col][unknown].unique().tolist()} outside of its "
+                            f"categories {dtype.categories.tolist()}."
+                        )
+            chunk = chunk.astype(dtypes)
+            if not self.columns:
+                self._open(chunk=chunk)
+
+            rows = slice(self.position, self.position + len(chunk))
+            for col, values in chunk.items():
+                if self.schema[col]["kind"] == "categorical":
+                    values = values.cat.codes
+                self.columns[col][rows] = values.to_numpy()
+            self.position = rows.stop
+        except Exception:
+            raise
+
+    def close(self):
+        """
+        Flushes the column files and writes the schema.
+        """
+        try:
+            if self.position != self.n_rows:
+                raise ValueError(
+                    f"Wrote {self.position} rows but expected {self.n_rows} rows."
+                )
+            for values in self.columns.values():
+                values.flush()
+            with open(os.path.join(self.path, SCHEMA_FILE), "w") as file:
+                json.dump(
+                    obj={"n_rows": self.n_rows, "columns": self.schema},
+                    fp=file,
+                    indent=4,
+                )
+            self.columns = {}
+        except Exception:
+            raise
+
+
+def write_columnar(data: pd.DataFrame, path: str, dtypes: dict = CLEAN_DTYPES):
+    """
+    Writes a dataframe to a directory of one memory-mappable .npy file per column.
+
+    Parameters
+    __________
+    data : pd.DataFrame
+        Dataframe to write.
+    path : str
+        String of the directory to write the columns to.
+    dtypes : dict
+        Dictionary of the dtype to cast each column to before writing.
+
+    See Also
+    ________
+    ColumnarWriter : Writes a dataframe, possibly in chunks, to a directory of .npy files.
+    read_columnar : Reads a dataframe written by write_columnar().
+    """
+    with ColumnarWriter(path=path, n_rows=len(data), dtypes=dtypes) as writer:
+        writer.write(chunk=data)
+
+
+def read_columnar(
+    path: str, columns: Sequence[str] = None, mmap_mode: str = "r"
+) -> pd.DataFrame:
+    """
+    Reads a dataframe written by write_columnar().
+
+    Columns are memory-mapped rather than parsed, so only the pages that are used are read from disk. Columns that
+    are not asked for are never loaded.
+
+    Parameters
+    __________
+    path : str
+        String of the directory the columns were written to.
+    columns : Sequence[str]
+        Sequence of the columns to read. Defaults to all columns.
+    mmap_mode : str
+        Memory-map mode passed to np.load(). Use None to load the columns fully into memory.
+
+    Returns
+    _______
+    pd.DataFrame
+        Dataframe backed by the memory-mapped columns.
+    """
+    try:
+        with open(os.path.join(path, SCHEMA_FILE)) as file:
+            schema = json.load(fp=file)["columns"]
+
+        data = {}
+        for col in schema if columns is None else columns:
+            values = np.load(file=os.path.join(path, f"{col}.npy"), mmap_mode=mmap_mode)
+            if schema[col]["kind"] == "categorical":
+                values = pd.Categorical.from_codes(
+                    codes=values, categories=schema[col]["categories"], validate=False
+                )
+            data[col] = pd.Series(data=values, name=col, copy=False)
+
+        return pd.DataFrame(data=data, copy=False)
+    except Exception:
+        raise
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
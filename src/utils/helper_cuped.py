@@ -0,0 +1,253 @@
+from typing import Union
+import numpy as np
+import pandas as pd
+from src.utils.helper_ab_test import get_ab_test_ci_from_moments, get_sample_sizes
+
+
+def _combine_moments(moments_a: tuple, moments_b: tuple) -> tuple:
+    """
+    Combines the counts, means and centred co-moments of two sets of observations, as in Chan et al.'s parallel
+    algorithm, which avoids the cancellation of subtracting large raw sums.
+    """
+    n_a, mean_x_a, mean_y_a, m_xx_a, m_xy_a, m_yy_a = moments_a
+    n_b, mean_x_b, mean_y_b, m_xx_b, m_xy_b, m_yy_b = moments_b
+    n = n_a + n_b
+    weight = np.divide(n_b, n, out=np.zeros(np.shape(n)), where=n > 0)
+    delta_x = mean_x_b - mean_x_a
+    delta_y = mean_y_b - mean_y_a
+    return (
+        n,
+        mean_x_a + delta_x * weight,
+        mean_y_a + delta_y * weight,
+        m_xx_a + m_xx_b + delta_x * delta_x * n_a * weight,
+        m_xy_a + m_xy_b + delta_x * delta_y * n_a * weight,
+        m_yy_a + m_yy_b + delta_y * delta_y * n_a * weight,
+    )
+
+
+class CupedAccumulator:
+    """
+    Streaming moments of a metric and a pre-experiment covariate per group, for CUPED variance reduction.
+
+    CUPED adjusts the metric y of each user to y - theta * (x - mean(x)), where x is a covariate measured before the
+    experiment, such as conversions in a prior period. The adjustment keeps the difference in means unbiased while
+    removing the variance of y explained by x. Only the count, means and centred co-moments of x and y per group are
+    kept, so theta and the adjusted statistics come from a single pass over batches of users. Accumulators over
+    separate batches can be merged together.
+
+    Parameters
+    __________
+    metric_col : str
+        String of the column of the metric, such as whether the user has converted or not.
+    covariate_col : str
+        String of the column of the pre-experiment covariate.
+    group_col : str
+        String of the grouping column that identifies whether conversion belongs to 'control' or 'treatment'.
+    control : str
+        String of the value of the grouping column for the control group.
+    treatment : str
+        String of the value of the grouping column for the treatment group.
+
+    Examples
+    ________
+    >>> df = pd.DataFrame(data={'group': ['control', 'control', 'treatment', 'control', 'treatment', 'treatment'],
+    ...                         'converted': [0, 1, 1, 0, 1, 0],
+    ...                         'prior_converted': [0, 1, 1, 1, 0, 0]})
+    >>> accumulator = CupedAccumulator().update(batch=df.iloc[:3])
+    >>> accumulator.merge(other=CupedAccumulator().update(batch=df.iloc[3:]))
+    CupedAccumulator(users_control=3, users_treatment=3, theta=0.5)
+    """
+
+    __slots__ = (
+        "metric_col",
+        "covariate_col",
+        "group_col",
+        "control",
+        "treatment",
+        "moments",
+    )
+
+    def __init__(
+        self,
+        metric_col: str = "converted",
+        covariate_col: str = "prior_converted",
+        group_col: str = "group",
+        control: str = "control",
+        treatment: str = "treatment",
+    ):
+        self.metric_col = metric_col
+        self.covariate_col = covariate_col
+        self.group_col = group_col
+        self.control = control
+        self.treatment = treatment
+        # count, mean of x, mean of y and co-moments xx, xy, yy of the control and treatment groups
+        self.moments = tuple(np.zeros(2) for _ in range(6))
+
+    def __repr__(self) -> str:
+        n = self.moments[0]
+        return (
+            f"{type(self).__name__}("
+            f"users_control={n[0]:.0f}, users_treatment={n[1]:.0f}, theta={self.theta():.4g})"
+        )
+
+    def update(self, batch: pd.DataFrame) -> "CupedAccumulator":
+        """
+        Adds a batch of users, with one row per user, to the accumulated moments.
+
+        Parameters
+        __________
+        batch : pd.DataFrame
+            Dataframe of the new users. Rows that belong to neither group are ignored.
+
+        Returns
+        _______
+        CupedAccumulator
+            The updated accumulator.
+        """
+        try:
+            group = batch[self.group_col].to_numpy()
+            arm = np.select(
+                condlist=[group == self.control, group == self.treatment],
+                choicelist=[0, 1],
+                default=-1,
+            )
+            mask = arm >= 0
+            arm = arm[mask]
+            x = batch[self.covariate_col].to_numpy(dtype=float)[mask]
+            y = batch[self.metric_col].to_numpy(dtype=float)[mask]
+
+            n = np.bincount(arm, minlength=2).astype(float)
+            n_safe = np.maximum(n, 1)
+            mean_x = np.bincount(arm, weights=x, minlength=2) / n_safe
+            mean_y = np.bincount(arm, weights=y, minlength=2) / n_safe
+            x_centred = x - mean_x[arm]
+            y_centred = y - mean_y[arm]
+            batch_moments = (
+                n,
+                mean_x,
+                mean_y,
+                np.bincount(arm, weights=x_centred * x_centred, minlength=2),
+                np.bincount(arm, weights=x_centred * y_centred, minlength=2),
+                np.bincount(arm, weights=y_centred * y_centred, minlength=2),
+            )
+
+            self.moments = _combine_moments(self.moments, batch_moments)
+            return self
+        except Exception:
+            raise
+
+    def merge(self, other: "CupedAccumulator") -> "CupedAccumulator":
+        """
+        Adds the moments of another accumulator, such as one built over a separate batch of users.
+
+        Parameters
+        __________
+        other : CupedAccumulator
+            The accumulator to merge in.
+
+        Returns
+        _______
+        CupedAccumulator
+            The merged accumulator.
+        """
+        self.moments = _combine_moments(self.moments, other.moments)
+        return self
+
+    def theta(self) -> float:
+        """
+        Calculates the CUPED coefficient, the covariance of the metric and covariate over the variance of the
+        covariate, pooled within the groups.
+        """
+        _, _, _, m_xx, m_xy, _ = self.moments
+        return float(m_xy.sum() / m_xx.sum()) if m_xx.sum() > 0 else 0.0
+
+    def adjusted_moments(self, adjust: bool = True) -> dict:
+        """
+        Returns the mean and variance of the CUPED-adjusted metric in each group, as keyword arguments of
+        get_ab_test_ci_from_moments(). Use adjust=False for the unadjusted metric.
+        """
+        n, mean_x, mean_y, m_xx, m_xy, m_yy = self.moments
+        theta = self.theta() if adjust else 0.0
+        mean_x_pooled = (n * mean_x).sum() / n.sum()
+
+        mean = mean_y - theta * (mean_x - mean_x_pooled)
+        variance = (m_yy - 2 * theta * m_xy + theta**2 * m_xx) / np.maximum(n - 1, 1)
+        return {
+            "mean_control": mean[0],
+            "mean_treatment": mean[1],
+            "variance_control": variance[0],
+            "variance_treatment": variance[1],
+            "total_users_control": n[0],
+            "total_users_treatment": n[1],
+        }
+
+    def variance_reduction(self) -> float:
+        """
+        Calculates the proportion of the within-group variance of the metric removed by CUPED, the squared pooled
+        correlation of the metric and covariate. Nothing is removed when either has no variance.
+        """
+        _, _, _, m_xx, m_xy, m_yy = self.moments
+        denominator = m_xx.sum() * m_yy.sum()
+        return float(m_xy.sum() ** 2 / denominator) if denominator > 0 else 0.0
+
+    def to_ci(
+        self, confidence_level: float = 0.05, adjust: bool = True
+    ) -> (float, float):
+        """
+        Calculates the C.I. of the difference in the mean of the CUPED-adjusted metric between groups.
+
+        See Also
+        ________
+        get_ab_test_ci_from_moments : Conducts an A/B test on the two sided hypothesis from means and variances.
+        """
+        return get_ab_test_ci_from_moments(
+            confidence_level=confidence_level, **self.adjusted_moments(adjust=adjust)
+        )
+
+    def report_sample_sizes(
+        self,
+        baseline_rate: Union[int, float] = None,
+        practical_significance: float = 0.01,
+        confidence_level: float = 0.05,
+        sensitivity: float = 0.8,
+    ) -> (float, float):
+        """
+        Reports the variance reduction and the required sample size per group with and without CUPED.
+
+        The required sample size scales with the variance of the metric, so CUPED shrinks it by the variance
+        reduction. The baseline rate defaults to the accumulated mean of the metric in the control group.
+
+        See Also
+        ________
+        get_sample_size : Calculates the required sample size for hypothesis-testing.
+
+        Returns
+        _______
+        sample_size, sample_size_adjusted : float, float
+            Floats of the required sample size per group without and with CUPED.
+        """
+        if baseline_rate is None:
+            baseline_rate = self.moments[2][0]
+        variance_reduction = self.variance_reduction()
+        sample_size = float(
+            get_sample_sizes(
+                baseline_rate=baseline_rate,
+                practical_significance=practical_significance,
+                confidence_level=confidence_level,
+                sensitivity=sensitivity,
+            )
+        )
+        sample_size_adjusted = sample_size * (1 - variance_reduction)
+
+        print(f"Variance reduction from CUPED: {round(variance_reduction * 100, 2)}%")
+        print(
+            f"Required sample size: {round(sample_size)} per group,",
+            f"{round(sample_size_adjusted)} per group with CUPED",
+        )
+        return sample_size, sample_size_adjusted
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
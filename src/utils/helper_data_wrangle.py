@@ -0,0 +1,445 @@
+from typing import Iterable, Sequence, Tuple
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from src.utils.helper_columnar import ColumnarWriter
+from src.utils.helper_dedup import (
+    DedupReport,
+    dedup_buckets,
+    merge_buckets,
+    partition_by_user,
+)
+from src.utils.helper_schema import CLEAN_DTYPES, GROUP_PAGES, read_ab_data
+from src.utils.helper_srm import SrmMonitor
+from src.utils.helper_validation import DataValidator
+
+
+def filter_group_pages(
+    data: pd.DataFrame,
+    group_col: str = "group",
+    page_col: str = "landing_page",
+    group_pages: Sequence[Tuple[str, str]] = GROUP_PAGES,
+) -> pd.DataFrame:
+    """
+    Removes rows where a group saw a landing page other than the one it is expected to see.
+
+    Parameters
+    __________
+    data : pd.DataFrame
+        Dataframe of the raw events.
+    group_col : str
+        String of the grouping column that identifies whether conversion belongs to 'control' or 'treatment'.
+    page_col: str
+        String of the column that identifies the page seen by the user.
+    group_pages : Sequence[Tuple[str, str]]
+        Sequence of pairs of group and the landing page that group is expected to see.
+
+    Returns
+    _______
+    pd.DataFrame
+        Dataframe of the rows where each group saw its expected landing page.
+
+    Examples
+    ________
+    >>> df = pd.DataFrame(data={'user_id': [1, 2, 3, 4],
+    ...                         'group': ['control', 'control', 'treatment', 'treatment'],
+    ...                         'landing_page': ['old_page', 'new_page', 'new_page', 'old_page'],
+    ...                         'converted': [0, 1, 0, 1]})
+    >>> filter_group_pages(data=df)
+       user_id      group landing_page  converted
+    0        1    control     old_page          0
+    2        3  treatment     new_page          0
+    """
+    try:
+        mask = np.zeros(shape=len(data), dtype=bool)
+        for group, page in group_pages:
+            mask |= (data[group_col] == group).to_numpy() & (
+                data[page_col] == page
+            ).to_numpy()
+        return data.loc[mask]
+    except Exception:
+        raise
+
+
+def clean_ab_data_chunked(
+    path_in: str,
+    path_out: str,
+    chunksize: int = 1_000_000,
+    user_col: str = "user_id",
+    group_col: str = "group",
+    page_col: str = "landing_page",
+    group_pages: Sequence[Tuple[str, str]] = GROUP_PAGES,
+    spill_dir: str = None,
+    output_format: str = "csv",
+    dtypes: dict = CLEAN_DTYPES,
+    columns: Sequence[str] = None,
+    srm_monitor: SrmMonitor = None,
+    validator: DataValidator = None,
+) -> int:
+    """
+    Cleans raw events too large to fit in memory by streaming them in fixed-size chunks.
+
+    Applies the same cleaning as data_wrangle.py: rows where a group saw an unexpected landing page are removed, then
+    users are deduplicated across all chunks, keeping their last row. Chunks are read with the compact dtypes of
+    read_ab_data(). This takes two passes in chunks:
+        1. Filter each chunk of the raw data and spill it to a temporary file, recording the position of the last
+           row of each user.
+        2. Stream the spilled rows back and write the last row of each user to the output file.
+
+    Peak memory is bounded by the chunk size plus one position per distinct user, regardless of the number of rows.
+    An SrmMonitor can be passed to check the split of cleaned users across groups as they are written in pass 2, and
+    a DataValidator to report on the raw events as they are read in pass 1.
+
+    See Also
+    ________
+    ColumnarWriter : Writes a dataframe, possibly in chunks, to a directory of .npy files.
+    SrmMonitor : Checks for sample ratio mismatch incrementally over chunks of users.
+
+    Parameters
+    __________
+    path_in : str
+        String of the file path of the raw events csv.
+    path_out : str
+        String of the file path to write the cleaned csv, or directory to write the cleaned columns, to.
+    chunksize : int
+        Number of rows to read at a time.
+    user_col : str
+        String of the column that identifies the user.
+    group_col : str
+        String of the grouping column that identifies whether conversion belongs to 'control' or 'treatment'.
+    page_col: str
+        String of the column that identifies the page seen by the user.
+    group_pages : Sequence[Tuple[str, str]]
+        Sequence of pairs of group and the landing page that group is expected to see.
+    spill_dir : str
+        String of the directory to spill the filtered rows to. Defaults to the system's temporary directory.
+    output_format : str
+        String of the format to write, either 'csv' or 'columnar'.
+    dtypes : dict
+        Dictionary of the dtype to cast each column to when writing the columnar format.
+    columns : Sequence[str]
+        Sequence of the columns to keep, which must include the user, group and page columns. Defaults to all
+        columns of the ab_data layout.
+    srm_monitor : SrmMonitor
+        Monitor to update with each chunk of cleaned users, to check for sample ratio mismatch.
+    validator : DataValidator
+        Validator to update with each chunk of raw events, to report on the consistency of groups and pages.
+
+    Returns
+    _______
+    int
+        Number of rows written to the cleaned data.
+    """
+    try:
+        with tempfile.TemporaryDirectory(dir=spill_dir) as tmp_dir:
+            path_spill = os.path.join(tmp_dir, "spill.csv")
+
+            # pass 1: filter each chunk and record the last position of each user
+            keep = _spill_last_positions(
+                chunks=_observe(
+                    chunks=read_ab_data(
+                        path=path_in, columns=columns, chunksize=chunksize
+                    ),
+                    observer=validator,
+                ),
+                path_spill=path_spill,
+                chunksize=chunksize,
+                user_col=user_col,
+                group_col=group_col,
+                page_col=page_col,
+                group_pages=group_pages,
+            )
+            if keep is None:
+                # replace any output of an earlier run, so an empty input leaves an empty output
+                _write_empty(
+                    path_in=path_in,
+                    path_out=path_out,
+                    columns=columns,
+                    output_format=output_format,
+                    dtypes=dtypes,
+                )
+                return 0
+
+            # pass 2: write the last row of each user
+            n_written = 0
+            with _open_writer(
+                output_format=output_format,
+                path=path_out,
+                n_rows=len(keep),
+                dtypes=dtypes,
+            ) as writer:
+                for i, chunk in enumerate(
+                    read_ab_data(path=path_spill, columns=columns, chunksize=chunksize)
+                ):
+                    start = i * chunksize
+                    chunk = chunk.loc[
+                        _isin_sorted(
+                            values=np.arange(start, start + len(chunk)),
+                            sorted_values=keep,
+                        )
+                    ]
+                    writer.write(chunk=chunk)
+                    n_written += len(chunk)
+                    if srm_monitor is not None:
+                        srm_monitor.update(batch=chunk)
+
+        return n_written
+    except Exception:
+        raise
+
+
+def clean_ab_data_partitioned(
+    path_in: str,
+    path_out: str,
+    chunksize: int = 1_000_000,
+    n_buckets: int = 64,
+    n_jobs: int = 1,
+    user_col: str = "user_id",
+    group_col: str = "group",
+    page_col: str = "landing_page",
+    group_pages: Sequence[Tuple[str, str]] = GROUP_PAGES,
+    spill_dir: str = None,
+    output_format: str = "csv",
+    dtypes: dict = CLEAN_DTYPES,
+    columns: Sequence[str] = None,
+    srm_monitor: SrmMonitor = None,
+    validator: DataValidator = None,
+) -> DedupReport:
+    """
+    Cleans raw events too large to fit in memory, deduplicating users in on-disk hash buckets.
+
+    Applies the same cleaning as clean_ab_data_chunked(), with the same output, but without keeping a position per
+    distinct user in memory:
+        1. Filter each chunk of the raw data and spill its rows to buckets by the hash of their user.
+        2. Keep the last row of each user in each bucket independently, optionally in a process pool, counting the
+           users whose rows conflict.
+        3. Merge the buckets back into the order of the raw data and write them to the output file.
+
+    Peak memory is bounded by the chunk size plus the largest bucket, so use more buckets for more distinct users.
+
+    See Also
+    ________
+    clean_ab_data_chunked : Cleans raw events too large to fit in memory by streaming them in fixed-size chunks.
+
+    Parameters
+    __________
+    path_in : str
+        String of the file path of the raw events csv.
+    path_out : str
+        String of the file path to write the cleaned csv, or directory to write the cleaned columns, to.
+    chunksize : int
+        Number of rows to read at a time.
+    n_buckets : int
+        Number of buckets to partition users across.
+    n_jobs : int
+        Number of processes to deduplicate buckets in. Use -1 for one process per CPU.
+    user_col : str
+        String of the column that identifies the user.
+    group_col : str
+        String of the grouping column that identifies whether conversion belongs to 'control' or 'treatment'.
+    page_col: str
+        String of the column that identifies the page seen by the user.
+    group_pages : Sequence[Tuple[str, str]]
+        Sequence of pairs of group and the landing page that group is expected to see.
+    spill_dir : str
+        String of the directory to write the buckets to. Defaults to the system's temporary directory.
+    output_format : str
+        String of the format to write, either 'csv' or 'columnar'.
+    dtypes : dict
+        Dictionary of the dtype to cast each column to when writing the columnar format.
+    columns : Sequence[str]
+        Sequence of the columns to keep, which must include the user, group and page columns. Defaults to all
+        columns of the ab_data layout.
+    srm_monitor : SrmMonitor
+        Monitor to update with each chunk of cleaned users, to check for sample ratio mismatch.
+    validator : DataValidator
+        Validator to update with each chunk of raw events, to report on the consistency of groups and pages.
+
+    Returns
+    _______
+    DedupReport
+        Named tuple of the number of filtered rows, users written and users with conflicting rows.
+    """
+    try:
+        with tempfile.TemporaryDirectory(dir=spill_dir) as tmp_dir:
+            paths, n_rows = partition_by_user(
+                chunks=(
+                    filter_group_pages(
+                        data=chunk,
+                        group_col=group_col,
+                        page_col=page_col,
+                        group_pages=group_pages,
+                    )
+                    for chunk in _observe(
+                        chunks=read_ab_data(
+                            path=path_in, columns=columns, chunksize=chunksize
+                        ),
+                        observer=validator,
+                    )
+                ),
+                bucket_dir=tmp_dir,
+                n_buckets=n_buckets,
+                user_col=user_col,
+            )
+            report = dedup_buckets(paths=paths, user_col=user_col, n_jobs=n_jobs)
+            print(
+                f"Kept {report.n_users} of {report.n_rows} rows.",
+                f"Found {report.n_conflicts} users with conflicting rows: {report.conflict_examples}",
+            )
+            if not paths:
+                _write_empty(
+                    path_in=path_in,
+                    path_out=path_out,
+                    columns=columns,
+                    output_format=output_format,
+                    dtypes=dtypes,
+                )
+                return report
+
+            with _open_writer(
+                output_format=output_format,
+                path=path_out,
+                n_rows=report.n_users,
+                dtypes=dtypes,
+            ) as writer:
+                for chunk in merge_buckets(
+                    paths=paths, n_rows=n_rows, chunksize=chunksize
+                ):
+                    writer.write(chunk=chunk)
+                    if srm_monitor is not None:
+                        srm_monitor.update(batch=chunk)
+
+        return report
+    except Exception:
+        raise
+
+
+def _observe(chunks: Iterable[pd.DataFrame], observer=None) -> Iterable[pd.DataFrame]:
+    """
+    Passes each chunk to the update method of an observer, such as a DataValidator, as it is read.
+    """
+    for chunk in chunks:
+        if observer is not None:
+            observer.update(batch=chunk)
+        yield chunk
+
+
+class _CsvWriter:
+    """
+    Writes a dataframe in chunks to a csv, with the same interface as ColumnarWriter.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.header = True
+
+    def __enter__(self) -> "_CsvWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def write(self, chunk: pd.DataFrame):
+        chunk.to_csv(
+            path_or_buf=self.path,
+            mode="w" if self.header else "a",
+            header=self.header,
+            index=False,
+        )
+        self.header = False
+
+
+def _open_writer(output_format: str, path: str, n_rows: int, dtypes: dict):
+    """
+    Opens a chunked writer for the output format.
+    """
+    if output_format == "csv":
+        return _CsvWriter(path=path)
+    if output_format == "columnar":
+        return ColumnarWriter(path=path, n_rows=n_rows, dtypes=dtypes)
+    raise ValueError(
+        f"Unknown output format {output_format}. Please use 'csv' or 'columnar'."
+    )
+
+
+def _write_empty(
+    path_in: str,
+    path_out: str,
+    columns: Sequence[str],
+    output_format: str,
+    dtypes: dict,
+):
+    """
+    Writes an output with the columns of the raw data but no rows.
+    """
+    with _open_writer(
+        output_format=output_format, path=path_out, n_rows=0, dtypes=dtypes
+    ) as writer:
+        writer.write(chunk=read_ab_data(path=path_in, columns=columns, nrows=0))
+
+
+def _spill_last_positions(
+    chunks: Iterable[pd.DataFrame],
+    path_spill: str,
+    chunksize: int,
+    user_col: str,
+    **kwargs,
+) -> np.ndarray:
+    """
+    Filters chunks of raw data, spilling them to a csv, and returns the sorted positions of the last row of each user
+    in the spilled csv. Returns None if nothing was spilled.
+    """
+    last_positions = []
+    n_positions = 0
+    n_compacted = 0
+    n_spilled = 0
+
+    for chunk in chunks:
+        chunk = filter_group_pages(data=chunk, **kwargs)
+        chunk.to_csv(
+            path_or_buf=path_spill,
+            mode="a",
+            header=not os.path.exists(path_spill),
+            index=False,
+        )
+        positions = pd.Series(
+            data=np.arange(n_spilled, n_spilled + len(chunk)),
+            index=chunk[user_col].to_numpy(),
+        )
+        n_spilled += len(chunk)
+
+        last_positions.append(positions[~positions.index.duplicated(keep="last")])
+        n_positions += len(last_positions[-1])
+        # compact once the positions have doubled, so memory follows distinct users rather than rows
+        if n_positions > 2 * max(n_compacted, chunksize):
+            last_positions = [_compact(positions=last_positions)]
+            n_positions = n_compacted = len(last_positions[0])
+
+    if not os.path.exists(path_spill):
+        return None
+    return np.sort(_compact(positions=last_positions).to_numpy())
+
+
+def _compact(positions: list) -> pd.Series:
+    """
+    Combines series of user positions, keeping the last position of each user.
+    """
+    positions = pd.concat(objs=positions)
+    return positions[~positions.index.duplicated(keep="last")]
+
+
+def _isin_sorted(values: np.ndarray, sorted_values: np.ndarray) -> np.ndarray:
+    """
+    Checks which values are in a sorted array by binary search.
+    """
+    if len(sorted_values) == 0:
+        return np.zeros(shape=len(values), dtype=bool)
+    index = np.minimum(np.searchsorted(sorted_values, values), len(sorted_values) - 1)
+    return sorted_values[index] == values
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
@@ -0,0 +1,259 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, NamedTuple, Sequence
+import functools
+import os
+import pandas as pd
+from src.utils.helper_schema import read_ab_data
+
+# column of the position of each row in the input, so buckets can be merged back in order
+ROW_COL = "_row"
+# columns that should agree across the rows of a user, see dedup_buckets()
+CONFLICT_COLS = ("group", "landing_page", "converted")
+
+
+class DedupReport(NamedTuple):
+    """
+    Summary of a deduplication of users.
+
+    Attributes
+    __________
+    n_rows : int
+        Number of rows before deduplication.
+    n_users : int
+        Number of distinct users, which is the number of rows kept.
+    n_conflicts : int
+        Number of users whose rows disagree on the conflict columns, such as being assigned to both groups.
+    conflict_examples : list
+        List of up to max_examples of the users with conflicting rows, to inspect.
+    """
+
+    n_rows: int
+    n_users: int
+    n_conflicts: int
+    conflict_examples: list
+
+
+def partition_by_user(
+    chunks: Iterable[pd.DataFrame],
+    bucket_dir: str,
+    n_buckets: int = 64,
+    user_col: str = "user_id",
+) -> (List[str], int):
+    """
+    Spills chunks of rows to on-disk csv buckets by the hash of their user, so all rows of a user land in the same
+    bucket. The position of each row in the input is kept in a ROW_COL column.
+
+    Parameters
+    __________
+    chunks : Iterable[pd.DataFrame]
+        Iterable of chunks of the rows to partition.
+    bucket_dir : str
+        String of the directory to write the buckets to.
+    n_buckets : int
+        Number of buckets. Each bucket needs to fit in memory when it is deduplicated.
+    user_col : str
+        String of the column that identifies the user.
+
+    Returns
+    _______
+    paths, n_rows : List[str], int
+        List of the file paths of the non-empty buckets, and the number of rows partitioned.
+    """
+    try:
+        paths = set()
+        n_rows = 0
+        for chunk in chunks:
+            chunk = chunk.assign(**{ROW_COL: range(n_rows, n_rows + len(chunk))})
+            n_rows += len(chunk)
+            bucket = pd.util.hash_array(chunk[user_col].to_numpy()) % n_buckets
+            for i, part in chunk.groupby(by=bucket, sort=False):
+                path = os.path.join(bucket_dir, f"bucket_{i}.csv")
+                part.to_csv(
+                    path_or_buf=path, mode="a", header=path not in paths, index=False
+                )
+                paths.add(path)
+        return sorted(paths), n_rows
+    except Exception:
+        raise
+
+
+def _bucket_columns(path: str) -> List[str]:
+    """
+    Reads the columns of a bucket, other than ROW_COL, from its header.
+    """
+    return pd.read_csv(path, nrows=0).columns.drop(ROW_COL).tolist()
+
+
+def _dedup_bucket(
+    path: str,
+    user_col: str,
+    columns: Sequence[str],
+    conflict_cols: Sequence[str],
+    max_examples: int,
+) -> DedupReport:
+    """
+    Keeps the last row of each user in a bucket, overwriting it, and finds users with conflicting rows.
+    """
+    df = read_ab_data(path=path, columns=list(columns) + [ROW_COL])
+    n_rows = len(df)
+    duplicated = df[df.duplicated(subset=user_col, keep=False)]
+    conflicts = (
+        duplicated.groupby(by=user_col)[list(conflict_cols)].nunique() > 1
+    ).any(axis=1)
+    conflicts = conflicts.index[conflicts.to_numpy()]
+
+    # rows were appended to the bucket in input order, so the last row of a user is its last row in the input
+    df = df.drop_duplicates(subset=user_col, keep="last")
+    df.to_csv(path_or_buf=path, index=False)
+    return DedupReport(
+        n_rows=n_rows,
+        n_users=len(df),
+        n_conflicts=len(conflicts),
+        conflict_examples=conflicts[:max_examples].tolist(),
+    )
+
+
+def dedup_buckets(
+    paths: Sequence[str],
+    user_col: str = "user_id",
+    columns: Sequence[str] = None,
+    conflict_cols: Sequence[str] = CONFLICT_COLS,
+    n_jobs: int = 1,
+    max_examples: int = 5,
+) -> DedupReport:
+    """
+    Deduplicates each bucket from partition_by_user() independently, keeping the last row of each user, optionally
+    in a process pool.
+
+    Users whose rows disagree on any of the conflict columns, such as a user seen in both groups, are counted, as
+    keeping their last row hides the disagreement.
+
+    Parameters
+    __________
+    paths : Sequence[str]
+        Sequence of the file paths of the buckets, which are overwritten with their deduplicated rows.
+    user_col : str
+        String of the column that identifies the user.
+    columns : Sequence[str]
+        Sequence of the columns of the buckets, other than ROW_COL. Defaults to the columns of the first bucket.
+    conflict_cols : Sequence[str]
+        Sequence of the columns that should agree across the rows of a user. Those not in columns are skipped.
+    n_jobs : int
+        Number of processes to spread the buckets across. Use -1 for one process per CPU.
+    max_examples : int
+        Largest number of users with conflicting rows to report.
+
+    Returns
+    _______
+    DedupReport
+        Named tuple of the number of rows, users and users with conflicting rows.
+    """
+    try:
+        if not paths:
+            return DedupReport(n_rows=0, n_users=0, n_conflicts=0, conflict_examples=[])
+        columns = _bucket_columns(path=paths[0]) if columns is None else columns
+        func = functools.partial(
+            _dedup_bucket,
+            user_col=user_col,
+            columns=columns,
+            conflict_cols=[col for col in conflict_cols if col in columns],
+            max_examples=max_examples,
+        )
+        n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+        if n_jobs == 1 or len(paths) <= 1:
+            reports = [func(path) for path in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=min(n_jobs, len(paths))) as executor:
+                reports = list(executor.map(func, paths))
+
+        return DedupReport(
+            n_rows=sum(report.n_rows for report in reports),
+            n_users=sum(report.n_users for report in reports),
+            n_conflicts=sum(report.n_conflicts for report in reports),
+            conflict_examples=[
+                user for report in reports for user in report.conflict_examples
+            ][:max_examples],
+        )
+    except Exception:
+        raise
+
+
+class _BucketReader:
+    """
+    Reads the rows of a bucket in input order, up to a bound on their position.
+    """
+
+    def __init__(self, chunks: Iterator[pd.DataFrame]):
+        self.chunks = chunks
+        self.pending = None
+
+    def take(self, bound: int) -> List[pd.DataFrame]:
+        parts = []
+        while True:
+            if self.pending is None:
+                self.pending = next(self.chunks, None)
+                if self.pending is None:
+                    return parts
+            below = (self.pending[ROW_COL] < bound).to_numpy()
+            parts.append(self.pending[below])
+            if not below.all():
+                self.pending = self.pending[~below]
+                return parts
+            self.pending = None
+
+
+def merge_buckets(
+    paths: Sequence[str],
+    n_rows: int,
+    columns: Sequence[str] = None,
+    chunksize: int = 1_000_000,
+) -> Iterator[pd.DataFrame]:
+    """
+    Merges deduplicated buckets back into the order of the input, yielding chunks of rows without ROW_COL.
+
+    Each step takes the rows of every bucket whose position falls in the next chunksize positions of the input, so
+    memory is bounded by the chunk size however many buckets there are.
+
+    Parameters
+    __________
+    paths : Sequence[str]
+        Sequence of the file paths of the deduplicated buckets.
+    n_rows : int
+        Number of rows that were partitioned, from partition_by_user().
+    columns : Sequence[str]
+        Sequence of the columns of the buckets, other than ROW_COL. Defaults to the columns of the first bucket.
+    chunksize : int
+        Number of input positions to merge at a time.
+
+    Returns
+    _______
+    Iterator[pd.DataFrame]
+        Iterator over chunks of the deduplicated rows, in input order.
+    """
+    if not paths:
+        return
+    columns = _bucket_columns(path=paths[0]) if columns is None else columns
+    readers = [
+        _BucketReader(
+            chunks=iter(
+                read_ab_data(
+                    path=path,
+                    columns=list(columns) + [ROW_COL],
+                    chunksize=max(1, chunksize // len(paths)),
+                )
+            )
+        )
+        for path in paths
+    ]
+    for bound in range(chunksize, n_rows + chunksize, chunksize):
+        parts = [part for reader in readers for part in reader.take(bound=bound)]
+        if parts:
+            chunk = pd.concat(objs=parts).sort_values(by=ROW_COL)
+            if len(chunk):
+                yield chunk.drop(columns=ROW_COL).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
@@ -0,0 +1,434 @@
+from typing import Iterable, Union
+import asyncio
+import contextlib
+import json
+import numpy as np
+import pandas as pd
+from src.utils.helper_ab_test import get_ab_test_ci, get_sample_sizes
+from src.utils.helper_accumulator import ConversionAccumulator
+
+
+class IngestService:
+    """
+    Local asyncio service that ingests conversion events over a socket and serves live experiment statistics.
+
+    Clients send newline-delimited JSON. Each event, such as {"group": "control", "converted": 0}, is one cleaned
+    user, as in ConversionAccumulator.update(). A query, {"query": "stats"}, is answered with a JSON line of the
+    current counts, C.I. and sample size check. Events without a string group and a converted of 0, 1 or a boolean
+    are answered with {"error": ...} and dropped. Add "wait": true to a query to answer it only once every event
+    queued before it has been committed, which includes every event sent before it on the same connection. Events
+    queued afterwards by other connections are not waited for, so a wait returns promptly under concurrent producers.
+
+    At most max_queue events wait to be committed. Once that many are waiting, connections stop reading until the
+    committer catches up, so a fast producer is slowed by TCP flow control rather than growing memory. Paused
+    connections are let back in turn, so fast producers cannot starve a slow one. The committer takes events off the
+    queue in batches of up to batch_size, or whatever arrived within flush_interval, and updates the accumulator
+    once per batch. The C.I. and sample size are recomputed once per batch and cached, so queries only serialise the
+    cached statistics and never wait on scipy.
+
+    Parameters
+    __________
+    host : str
+        String of the address to listen on.
+    port : int
+        Number of the port to listen on. Use 0 to pick a free port, which is then available from the port attribute.
+    batch_size : int
+        Largest number of events to commit at a time.
+    flush_interval : float
+        Float of the longest time, in seconds, to wait for a batch to fill before committing it.
+    max_queue : int
+        Largest number of events waiting to be committed, and so held in memory, before ingestion is paused.
+    confidence_level : float
+        Float of the significance level of the C.I. and sample size.
+    practical_significance : float
+        Float of the minimum change to the baseline rate that is useful to the business, for the sample size.
+    sensitivity : float
+        Float of the power of the sample size.
+    accumulator : ConversionAccumulator
+        Accumulator to update, such as one already holding the history of the experiment.
+
+    Examples
+    ________
+    >>> async def main():
+    ...     service = await IngestService().start()
+    ...     await send_events(port=service.port, events=[{'group': 'control', 'converted': 1},
+    ...                                                  {'group': 'treatment', 'converted': 0}])
+    ...     stats = await query_stats(port=service.port)
+    ...     await service.close()
+    ...     return stats['total_users_control'], stats['total_users_treatment']
+    >>> asyncio.run(main())
+    (1, 1)
+    """
+
+    __slots__ = (
+        "host",
+        "port",
+        "batch_size",
+        "flush_interval",
+        "confidence_level",
+        "practical_significance",
+        "sensitivity",
+        "accumulator",
+        "max_queue",
+        "queue",
+        "capacity",
+        "stats",
+        "n_batches",
+        "n_queued",
+        "n_committed",
+        "committed",
+        "server",
+        "committer",
+        "handlers",
+    )
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        batch_size: int = 1_000,
+        flush_interval: float = 0.05,
+        max_queue: int = 100_000,
+        confidence_level: float = 0.05,
+        practical_significance: float = 0.01,
+        sensitivity: float = 0.8,
+        accumulator: ConversionAccumulator = None,
+    ):
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.confidence_level = confidence_level
+        self.practical_significance = practical_significance
+        self.sensitivity = sensitivity
+        self.accumulator = (
+            ConversionAccumulator() if accumulator is None else accumulator
+        )
+        self.max_queue = max_queue
+        self.queue = asyncio.Queue()
+        # slots for uncommitted events, which a semaphore hands out in the order connections asked for them
+        self.capacity = asyncio.Semaphore(max_queue)
+        self.n_batches = 0
+        # running totals of the events queued and committed, which wait queries compare
+        self.n_queued = 0
+        self.n_committed = 0
+        self.committed = asyncio.Condition()
+        self.server = None
+        self.committer = None
+        self.handlers = set()
+        self._refresh()
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}("
+            f"port={self.port}, n_batches={self.n_batches}, pending={self.queue.qsize()}, "
+            f"accumulator={self.accumulator})"
+        )
+
+    async def start(self) -> "IngestService":
+        """
+        Starts listening for connections and committing events.
+        """
+        self.server = await asyncio.start_server(
+            self._handle, host=self.host, port=self.port
+        )
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.committer = asyncio.create_task(self._commit_batches())
+        return self
+
+    async def serve_forever(self):
+        """
+        Starts the service if needed, and serves until cancelled.
+        """
+        if self.server is None:
+            await self.start()
+        print(f"Listening for events on {self.host}:{self.port}")
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """
+        Stops accepting connections, closes the open connections, commits the events already queued, and stops the
+        committer.
+        """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for handler in list(self.handlers):
+            handler.cancel()
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+        if self.committer is not None:
+            await self._wait_committed(target=self.n_queued)
+            self.committer.cancel()
+            await asyncio.gather(self.committer, return_exceptions=True)
+            self.committer = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Reads the lines of a connection, queueing events and answering queries.
+        """
+        self.handlers.add(asyncio.current_task())
+        try:
+            async for line in reader:
+                await self._process(line=line, writer=writer)
+        except (asyncio.CancelledError, ConnectionError):
+            # the service is closing or the client went away
+            pass
+        finally:
+            self.handlers.discard(asyncio.current_task())
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _process(self, line: bytes, writer: asyncio.StreamWriter):
+        """
+        Queues the event or answers the query of one line.
+        """
+        try:
+            message = json.loads(line)
+            if isinstance(message, dict) and "query" in message:
+                if message.get("wait"):
+                    await self._wait_committed(target=self.n_queued)
+                await self._reply(writer=writer, message=self.stats)
+                return
+            event = self._parse_event(message=message)
+        except ValueError as error:
+            await self._reply(writer=writer, message={"error": str(error)})
+            return
+        # waits while max_queue events are uncommitted, which stops reading from the connection
+        await self.capacity.acquire()
+        self.queue.put_nowait(event)
+        self.n_queued += 1
+
+    async def _wait_committed(self, target: int):
+        """
+        Waits until at least target events have been committed.
+        """
+        async with self.committed:
+            await self.committed.wait_for(lambda: self.n_committed >= target)
+
+    def _parse_event(self, message) -> dict:
+        """
+        Validates an event, keeping only its group and whether the user converted, so a bad event is rejected when
+        it is read rather than failing the batch it is committed in.
+        """
+        group_col = self.accumulator.group_col
+        convert_col = self.accumulator.convert_col
+        if not isinstance(message, dict):
+            raise ValueError(f"Expected a JSON object, not {json.dumps(message)}.")
+        group = message.get(group_col)
+        converted = message.get(convert_col)
+        if not isinstance(group, str):
+            raise ValueError(
+                f"'{group_col}' must be a string, not {json.dumps(group)}."
+            )
+        if isinstance(converted, bool) or (
+            isinstance(converted, int) and converted in (0, 1)
+        ):
+            return {group_col: group, convert_col: int(converted)}
+        raise ValueError(
+            f"'{convert_col}' must be 0, 1 or a boolean, not {json.dumps(converted)}."
+        )
+
+    @staticmethod
+    async def _reply(writer: asyncio.StreamWriter, message: dict):
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+
+    async def _commit_batches(self):
+        """
+        Takes events off the queue in batches and commits them, until cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.flush_interval
+            # a batch cannot hold more than the uncommitted events allowed, so it never waits for more than that
+            while len(batch) < min(self.batch_size, self.max_queue):
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                self._commit(batch=batch)
+            except Exception as error:
+                # keep committing later batches, as a stopped committer would stall every wait and close()
+                print(f"Failed to commit a batch of {len(batch)} events: {error!r}")
+            finally:
+                for _ in batch:
+                    self.capacity.release()
+                self.n_committed += len(batch)
+                async with self.committed:
+                    self.committed.notify_all()
+
+    def _commit(self, batch: list):
+        """
+        Adds a batch of events to the accumulator and refreshes the cached statistics.
+        """
+        columns = [self.accumulator.group_col, self.accumulator.convert_col]
+        self.accumulator.update(
+            batch=pd.DataFrame.from_records(
+                [{col: event.get(col) for col in columns} for event in batch],
+                columns=columns,
+            )
+        )
+        self.n_batches += 1
+        self._refresh()
+
+    def _refresh(self):
+        """
+        Recomputes the cached statistics from the accumulator, as in ConversionAccumulator.to_ci() and
+        check_sample_sizes().
+        """
+        stats = {
+            **self.accumulator.counts(),
+            "n_batches": self.n_batches,
+            "lower_bound": None,
+            "upper_bound": None,
+            "sample_size": None,
+            "sufficient_control": None,
+            "sufficient_treatment": None,
+        }
+        if self.accumulator.users_control and self.accumulator.users_treatment:
+            stats["lower_bound"], stats["upper_bound"] = (
+                float(bound)
+                for bound in get_ab_test_ci(
+                    confidence_level=self.confidence_level,
+                    **self.accumulator.counts(),
+                )
+            )
+            # undefined while the baseline rate is too close to 0 or 1 for the practical significance
+            with np.errstate(invalid="ignore"):
+                sample_size = float(
+                    get_sample_sizes(
+                        baseline_rate=self.accumulator.conversions_control
+                        / self.accumulator.users_control,
+                        practical_significance=self.practical_significance,
+                        confidence_level=self.confidence_level,
+                        sensitivity=self.sensitivity,
+                    )
+                )
+            if np.isnan(sample_size):
+                self.stats = stats
+                return
+            stats["sample_size"] = sample_size
+            stats["sufficient_control"] = self.accumulator.users_control >= sample_size
+            stats["sufficient_treatment"] = (
+                self.accumulator.users_treatment >= sample_size
+            )
+        self.stats = stats
+
+
+async def send_events(
+    events: Iterable[dict], host: str = "127.0.0.1", port: int = 8765
+) -> dict:
+    """
+    Sends events to an IngestService, as newline-delimited JSON over one connection, and waits for them to be
+    committed.
+
+    Parameters
+    __________
+    events : Iterable[dict]
+        Iterable of the events, such as the records of a dataframe of cleaned users.
+    host : str
+        String of the address of the service.
+    port : int
+        Number of the port of the service.
+
+    Returns
+    _______
+    dict
+        Dictionary of the statistics once the events are committed, as from query_stats(). Events rejected by the
+        service are counted and skipped.
+    """
+
+    async def read_replies() -> dict:
+        # replies are read while sending, so error replies to rejected events cannot fill the connection
+        n_errors = 0
+        async for line in reader:
+            reply = json.loads(line)
+            if "error" not in reply:
+                if n_errors:
+                    print(f"{n_errors} events were rejected by the service.")
+                return reply
+            n_errors += 1
+        raise ConnectionError("The service closed the connection before replying.")
+
+    reader, writer = await asyncio.open_connection(host=host, port=port)
+    replies = asyncio.create_task(read_replies())
+    try:
+        for event in events:
+            writer.write(json.dumps(event).encode() + b"\n")
+            # waits while the service has paused reading
+            await writer.drain()
+        writer.write(json.dumps({"query": "stats", "wait": True}).encode() + b"\n")
+        await writer.drain()
+        return await replies
+    finally:
+        replies.cancel()
+        writer.close()
+        await writer.wait_closed()
+
+
+async def query_stats(
+    host: str = "127.0.0.1", port: int = 8765, wait: bool = False
+) -> dict:
+    """
+    Queries the current statistics of an IngestService.
+
+    Parameters
+    __________
+    host : str
+        String of the address of the service.
+    port : int
+        Number of the port of the service.
+    wait : bool
+        Boolean of whether to wait for the events already queued to be committed. Events still being sent on other
+        connections may not be queued yet, so use the statistics returned by send_events() to see its own events.
+
+    Returns
+    _______
+    dict
+        Dictionary of the counts of each group, the C.I. of the difference in conversion rates, and the required
+        sample size and whether each group has reached it.
+    """
+    reader, writer = await asyncio.open_connection(host=host, port=port)
+    try:
+        writer.write(json.dumps({"query": "stats", "wait": wait}).encode() + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def run_service(port: Union[int, str] = 8765, **kwargs):
+    """
+    Runs an IngestService until interrupted.
+
+    Parameters
+    __________
+    port : Union[int, str]
+        Number of the port to listen on.
+    **kwargs
+        These parameters will be passed to IngestService().
+    """
+    try:
+        asyncio.run(IngestService(port=int(port), **kwargs).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
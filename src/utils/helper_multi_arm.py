@@ -0,0 +1,250 @@
+from typing import Union
+import numpy as np
+import pandas as pd
+from src.utils.helper_multiple_testing import adjust_p_values
+
+# ways of choosing the pairs of arms to compare, see get_multi_arm_ci()
+COMPARISONS = ("control", "pairwise")
+# adjustments of the C.I. for multiple comparisons, see get_multi_arm_ci()
+ADJUSTMENTS = (None, "bonferroni", "dunnett")
+
+
+def _dunnett_coverage(
+    z_score: Union[float, np.ndarray], weights: np.ndarray, n_nodes: int = 64
+) -> np.ndarray:
+    """
+    Calculates the probability that every one of a set of standard normal statistics lies within +/- z_score, when
+    they are correlated only through a shared control arm.
+
+    Comparisons against the same control have correlations weights[i] * weights[j], so each statistic is
+    weights[i] * W + sqrt(1 - weights[i] ** 2) * E_i for independent standard normals W and E_i. Conditional on W the
+    statistics are independent, which leaves a one-dimensional integral over W, taken by Gauss-Hermite quadrature
+    for every z_score at once.
+    """
+    import scipy.stats as st
+
+    nodes, node_weights = np.polynomial.hermite_e.hermegauss(n_nodes)
+    z_score = np.asarray(z_score, dtype=float)[..., np.newaxis, np.newaxis]
+    scale = np.sqrt(1 - weights**2)
+    shift = weights * nodes[:, np.newaxis]
+    inside = st.norm.cdf((z_score - shift) / scale) - st.norm.cdf(
+        (-z_score - shift) / scale
+    )
+    return np.prod(inside, axis=-1) @ node_weights / np.sqrt(2 * np.pi)
+
+
+def get_dunnett_critical_value(
+    weights: np.ndarray, confidence_level: float = 0.05
+) -> float:
+    """
+    Calculates Dunnett's critical value for comparing several arms against a shared control, the z-score that every
+    comparison stays within with probability 1 - confidence_level under the null hypothesis.
+
+    It lies between the unadjusted and Bonferroni z-scores, so the root is bracketed by them.
+
+    Parameters
+    __________
+    weights : np.ndarray
+        Array of the share of the variance of each comparison that comes from the control arm, square-rooted.
+    confidence_level : float
+        Float of the familywise error rate to control.
+
+    Returns
+    _______
+    float
+        Float of the critical value.
+
+    Examples
+    ________
+    >>> # equal arms, where each pair of comparisons has a correlation of 0.5
+    >>> round(get_dunnett_critical_value(weights=np.full(3, np.sqrt(0.5))), 3)
+    2.349
+    """
+    import scipy.optimize as opt
+    import scipy.stats as st
+
+    try:
+        n_comparisons = len(weights)
+        lower = st.norm.ppf(q=1 - confidence_level / 2)
+        upper = st.norm.ppf(q=1 - confidence_level / (2 * n_comparisons))
+        if n_comparisons == 1:
+            return float(lower)
+        return opt.brentq(
+            lambda z: _dunnett_coverage(z_score=z, weights=weights)
+            - (1 - confidence_level),
+            a=lower,
+            b=upper + 1e-6,
+            xtol=1e-8,
+        )
+    except Exception:
+        raise
+
+
+def get_multi_arm_ci(
+    summary: pd.DataFrame,
+    control: str = "control",
+    comparisons: str = "control",
+    adjustment: str = "dunnett",
+    confidence_level: float = 0.05,
+    conversions_col: str = "conversions",
+    total_users_col: str = "total_users",
+) -> pd.DataFrame:
+    """
+    Conducts A/B tests between the arms of an A/B/n test, on the two sided hypotheses that the difference in the
+    probability of conversion between each pair of arms is 0.
+
+    The arms are aggregated beforehand in one pass, such as with summarise_conversions(). The rates and variances of
+    every arm are computed once, and every comparison is then an indexed difference of them, so many arms cost a few
+    array operations rather than a loop of two-arm tests.
+
+    The C.I.s are widened for the number of comparisons, so that they all cover the true differences with probability
+    1 - confidence_level. Bonferroni divides the confidence level by the number of comparisons. Dunnett is less
+    conservative for comparisons against control, as it accounts for their correlation through the shared control
+    arm.
+
+    Parameters
+    __________
+    summary : pd.DataFrame
+        Dataframe indexed by arm, with the number of conversions and users of each arm.
+    control : str
+        String of the arm to compare against when comparisons is 'control'.
+    comparisons : str
+        String of the pairs of arms to compare, either 'control' for every arm against control, or 'pairwise' for
+        every pair of arms.
+    adjustment : str
+        String of the adjustment for multiple comparisons, one of None, 'bonferroni' or 'dunnett'. Dunnett only
+        applies to comparisons against control.
+    confidence_level : float
+        Float of the familywise error rate, the probability that any null hypothesis is rejected when it should not
+        be.
+    conversions_col : str
+        String of the column of the number of conversions of each arm.
+    total_users_col : str
+        String of the column of the number of users of each arm.
+
+    Returns
+    _______
+    pd.DataFrame
+        Dataframe indexed by arm and baseline, the arm it is compared against, with columns:
+            - difference: conversion rate of the arm minus that of the baseline.
+            - lower_bound: lower bound of the adjusted C.I. of the difference.
+            - upper_bound: upper bound of the adjusted C.I. of the difference.
+            - p_value: adjusted p-value of the difference being 0.
+
+    See Also
+    ________
+    summarise_conversions : Summarises conversions for every group in a single groupby pass over the data.
+    get_ab_test_ci_batch : Vectorised version of get_ab_test_ci() over arrays of experiments.
+
+    Examples
+    ________
+    >>> summary = pd.DataFrame(data={'conversions': [100, 120, 130, 95],
+    ...                              'total_users': [1000, 1000, 1000, 1000]},
+    ...                        index=pd.Index(['control', 'a', 'b', 'c'], name='group'))
+    >>> get_multi_arm_ci(summary=summary).round(4)  # doctest: +NORMALIZE_WHITESPACE
+                  difference  lower_bound  upper_bound  p_value
+    arm baseline
+    a   control        0.020      -0.0129       0.0529   0.3489
+    b   control        0.030      -0.0035       0.0635   0.0919
+    c   control       -0.005      -0.0362       0.0262   0.9666
+    """
+    import scipy.stats as st
+
+    try:
+        if comparisons not in COMPARISONS:
+            raise ValueError(
+                f"comparisons must be one of {COMPARISONS}, not '{comparisons}'."
+            )
+        if adjustment not in ADJUSTMENTS:
+            raise ValueError(
+                f"adjustment must be one of {ADJUSTMENTS}, not '{adjustment}'."
+            )
+        if adjustment == "dunnett" and comparisons != "control":
+            raise ValueError(
+                "Dunnett's adjustment only applies to comparisons against control."
+            )
+
+        arms = summary.index
+        conversion_rate = summary[conversions_col].to_numpy(dtype=float) / summary[
+            total_users_col
+        ].to_numpy(dtype=float)
+        variance = (
+            conversion_rate
+            * (1 - conversion_rate)
+            / summary[total_users_col].to_numpy(dtype=float)
+        )
+
+        if comparisons == "control":
+            baseline = np.full(len(arms) - 1, arms.get_loc(control))
+            arm = np.delete(np.arange(len(arms)), baseline[0])
+        else:
+            baseline, arm = np.triu_indices(len(arms), k=1)
+
+        difference = conversion_rate[arm] - conversion_rate[baseline]
+        sd = np.sqrt(variance[arm] + variance[baseline])
+        z_observed = np.abs(difference) / sd
+
+        if adjustment == "dunnett":
+            weights = np.sqrt(variance[baseline] / (variance[arm] + variance[baseline]))
+            z_score = get_dunnett_critical_value(
+                weights=weights, confidence_level=confidence_level
+            )
+            p_value = 1 - _dunnett_coverage(z_score=z_observed, weights=weights)
+        else:
+            n_comparisons = len(arm) if adjustment == "bonferroni" else 1
+            z_score = st.norm.ppf(q=1 - confidence_level / (2 * n_comparisons))
+            p_value = 2 * st.norm.sf(z_observed)
+            if adjustment == "bonferroni":
+                p_value = adjust_p_values(p_values=p_value, method="bonferroni")
+
+        return pd.DataFrame(
+            data={
+                "difference": difference,
+                "lower_bound": difference - z_score * sd,
+                "upper_bound": difference + z_score * sd,
+                "p_value": np.clip(p_value, 0, 1),
+            },
+            index=pd.MultiIndex.from_arrays(
+                arrays=[arms[arm], arms[baseline]], names=["arm", "baseline"]
+            ),
+        )
+    except Exception:
+        raise
+
+
+def conclude_multi_arm_test(
+    df_ci: pd.DataFrame, practical_significance: float = 0.0
+) -> pd.Series:
+    """
+    Concludes whether we reject or do not reject H_0 for each comparison between arms.
+
+    Parameters
+    __________
+    df_ci : pd.DataFrame
+        Dataframe of the adjusted C.I. of each comparison, from get_multi_arm_ci().
+    practical_significance : float
+        Float of an estimate of the the minimum change to the baseline rate that is useful to the business.
+
+    Returns
+    _______
+    pd.Series
+        Series of booleans of whether the null hypothesis of each comparison is rejected.
+    """
+    try:
+        reject = (practical_significance < df_ci["lower_bound"]) | (
+            practical_significance > df_ci["upper_bound"]
+        )
+        print(
+            f"Reject null hypothesis for {reject.sum()} of {len(reject)} comparisons."
+        )
+        for arm, baseline in reject.index[reject.to_numpy()]:
+            print(f"    {arm} vs {baseline}")
+        return reject
+    except Exception:
+        raise
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
@@ -0,0 +1,214 @@
+from typing import Union
+import numpy as np
+import pandas as pd
+
+# methods of correcting p-values for multiple tests, see adjust_p_values()
+METHODS = ("bonferroni", "holm", "bh")
+
+
+def get_ab_test_p_values(
+    conversions_control: Union[np.ndarray, pd.Series],
+    conversions_treatment: Union[np.ndarray, pd.Series],
+    total_users_control: Union[np.ndarray, pd.Series],
+    total_users_treatment: Union[np.ndarray, pd.Series],
+    practical_significance: Union[float, np.ndarray] = 0.0,
+) -> np.ndarray:
+    """
+    Calculates the two sided p-values of the difference in conversion rates of arrays of experiments.
+
+    The p-values use the same normal approximation as get_ab_test_ci_batch(), so a p-value is below the confidence
+    level exactly when the C.I. excludes practical_significance.
+
+    Parameters
+    __________
+    conversions_control : Union[np.ndarray, pd.Series]
+        Array of the number of people who converted in the control group of each experiment.
+    conversions_treatment : Union[np.ndarray, pd.Series]
+        Array of the number of people who converted in the treatment group of each experiment.
+    total_users_control : Union[np.ndarray, pd.Series]
+        Array of the number of people in the control group of each experiment.
+    total_users_treatment : Union[np.ndarray, pd.Series]
+        Array of the number of people in the treatment group of each experiment.
+    practical_significance : Union[float, np.ndarray]
+        Float of the difference in conversion rates under the null hypothesis.
+
+    Returns
+    _______
+    np.ndarray
+        Array of the p-value of each experiment.
+
+    Examples
+    ________
+    >>> get_ab_test_p_values(conversions_control=[5329, 100],
+    ...                      conversions_treatment=[5648, 120],
+    ...                      total_users_control=[58583, 1000],
+    ...                      total_users_treatment=[56350, 1000]).round(4)
+    array([0.    , 0.1527])
+    """
+    import scipy.stats as st
+
+    try:
+        conversion_rate_control = np.asarray(conversions_control, dtype=float) / (
+            np.asarray(total_users_control, dtype=float)
+        )
+        conversion_rate_treatment = np.asarray(conversions_treatment, dtype=float) / (
+            np.asarray(total_users_treatment, dtype=float)
+        )
+        sd = np.sqrt(
+            conversion_rate_treatment
+            * (1 - conversion_rate_treatment)
+            / np.asarray(total_users_treatment, dtype=float)
+            + conversion_rate_control
+            * (1 - conversion_rate_control)
+            / np.asarray(total_users_control, dtype=float)
+        )
+        z_score = (
+            conversion_rate_treatment - conversion_rate_control - practical_significance
+        ) / sd
+        return 2 * st.norm.sf(np.abs(z_score))
+    except Exception:
+        raise
+
+
+def get_p_values_from_ci(
+    lower_bound: Union[float, np.ndarray],
+    upper_bound: Union[float, np.ndarray],
+    practical_significance: Union[float, np.ndarray] = 0.0,
+    confidence_level: Union[float, np.ndarray] = 0.05,
+) -> np.ndarray:
+    """
+    Recovers the two sided p-values from symmetric normal C.I.s, such as those from get_ab_test_ci().
+
+    Parameters
+    __________
+    lower_bound : Union[float, np.ndarray]
+        Array of the lower bounds of the C.I.s.
+    upper_bound : Union[float, np.ndarray]
+        Array of the upper bounds of the C.I.s.
+    practical_significance : Union[float, np.ndarray]
+        Float of the difference in conversion rates under the null hypothesis.
+    confidence_level : Union[float, np.ndarray]
+        Float of the significance level the C.I.s were calculated at.
+
+    Returns
+    _______
+    np.ndarray
+        Array of the p-value of each C.I.
+
+    Examples
+    ________
+    >>> get_p_values_from_ci(lower_bound=[-0.0074], upper_bound=[0.0474]).round(2)
+    array([0.15])
+    """
+    import scipy.stats as st
+
+    try:
+        lower_bound = np.asarray(lower_bound, dtype=float)
+        upper_bound = np.asarray(upper_bound, dtype=float)
+        sd = (upper_bound - lower_bound) / (
+            2 * st.norm.ppf(q=1 - np.asarray(confidence_level) / 2)
+        )
+        z_score = ((lower_bound + upper_bound) / 2 - practical_significance) / sd
+        return 2 * st.norm.sf(np.abs(z_score))
+    except Exception:
+        raise
+
+
+def adjust_p_values(
+    p_values: Union[np.ndarray, pd.Series], method: str = "holm"
+) -> np.ndarray:
+    """
+    Adjusts p-values for multiple testing, so adjusted p-values can be compared directly against the confidence
+    level.
+
+    Bonferroni and Holm control the familywise error rate, the probability of rejecting any true null hypothesis.
+    Benjamini-Hochberg ('bh') controls the false discovery rate, the expected proportion of rejections that are
+    false. Holm and Benjamini-Hochberg sort the p-values once, and take running maxima or minima along them, rather
+    than looping over the tests.
+
+    Parameters
+    __________
+    p_values : Union[np.ndarray, pd.Series]
+        Array of the p-values of each test.
+    method : str
+        String of the correction, one of 'bonferroni', 'holm' or 'bh'.
+
+    Returns
+    _______
+    np.ndarray
+        Array of the adjusted p-values, in the same order as p_values.
+
+    Examples
+    ________
+    >>> p_values = [0.01, 0.04, 0.03, 0.005]
+    >>> adjust_p_values(p_values=p_values, method='bonferroni')
+    array([0.04, 0.16, 0.12, 0.02])
+    >>> adjust_p_values(p_values=p_values, method='holm')
+    array([0.03, 0.06, 0.06, 0.02])
+    >>> adjust_p_values(p_values=p_values, method='bh')
+    array([0.02, 0.04, 0.04, 0.02])
+    """
+    try:
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {METHODS}, not '{method}'.")
+
+        p_values = np.asarray(p_values, dtype=float)
+        n_tests = p_values.size
+        if method == "bonferroni":
+            return np.minimum(p_values * n_tests, 1)
+
+        order = np.argsort(p_values, axis=None, kind="stable")
+        p_sorted = p_values.ravel()[order]
+        rank = np.arange(1, n_tests + 1)
+        if method == "holm":
+            p_sorted = np.maximum.accumulate((n_tests - rank + 1) * p_sorted)
+        else:
+            p_sorted = np.minimum.accumulate((p_sorted * n_tests / rank)[::-1])[::-1]
+
+        p_adjusted = np.empty(n_tests)
+        p_adjusted[order] = np.minimum(p_sorted, 1)
+        return p_adjusted.reshape(p_values.shape)
+    except Exception:
+        raise
+
+
+def conclude_multiple_ab_tests(
+    p_values: Union[np.ndarray, pd.Series],
+    confidence_level: float = 0.05,
+    method: str = "holm",
+) -> np.ndarray:
+    """
+    Concludes whether we reject or do not reject H_0 for each of many tests, correcting for multiple testing.
+
+    Parameters
+    __________
+    p_values : Union[np.ndarray, pd.Series]
+        Array of the p-values of each test, such as from get_ab_test_p_values().
+    confidence_level : float
+        Float of the familywise error rate, or false discovery rate for 'bh', to control.
+    method : str
+        String of the correction, one of 'bonferroni', 'holm' or 'bh'.
+
+    Returns
+    _______
+    np.ndarray
+        Array of booleans of whether the null hypothesis of each test is rejected.
+
+    Examples
+    ________
+    >>> conclude_multiple_ab_tests(p_values=[0.01, 0.04, 0.03, 0.005], method='bh')
+    Reject null hypothesis for 4 of 4 tests.
+    array([ True,  True,  True,  True])
+    """
+    try:
+        reject = adjust_p_values(p_values=p_values, method=method) < confidence_level
+        print(f"Reject null hypothesis for {reject.sum()} of {reject.size} tests.")
+        return reject
+    except Exception:
+        raise
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
@@ -0,0 +1,84 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Union
+import functools
+import os
+import numpy as np
+
+
+def split_shards(n_total: int, shard_size: int) -> List[int]:
+    """
+    Splits a number of draws into shards of at most shard_size.
+
+    Examples
+    ________
+    >>> split_shards(n_total=25, shard_size=10)
+    [10, 10, 5]
+    """
+    return [min(shard_size, n_total - start) for start in range(0, n_total, shard_size)]
+
+
+def map_shards(
+    func: Callable,
+    shard_sizes: List[int],
+    seed: Union[int, np.random.SeedSequence] = None,
+    n_jobs: int = 1,
+    **kwargs,
+) -> list:
+    """
+    Runs a random function over shards, each with an independent random number stream, optionally in a process pool.
+
+    Each shard is given its own stream spawned from np.random.SeedSequence(seed). Results therefore depend only on
+    the seed and the shard sizes, not on the number of processes the shards are spread across.
+
+    Parameters
+    __________
+    func : Callable
+        Function called as func(size, rng, **kwargs) for each shard, where rng is a np.random.Generator. Must be
+        defined at module level so it can be sent to other processes.
+    shard_sizes : List[int]
+        List of the number of draws in each shard.
+    seed : Union[int, np.random.SeedSequence]
+        Seed to spawn the streams of the shards from.
+    n_jobs : int
+        Number of processes to spread the shards across. Use -1 for one process per CPU, or 1 to run in the current
+        process.
+    **kwargs
+        These parameters will be passed to func.
+
+    Returns
+    _______
+    list
+        List of the results of each shard, in order.
+
+    Examples
+    ________
+    >>> results = map_shards(func=lambda size, rng: rng.integers(10, size=size), shard_sizes=[2, 3], seed=1)
+    >>> [len(result) for result in results]
+    [2, 3]
+    """
+    try:
+        if isinstance(seed, np.random.SeedSequence):
+            # spawn from a copy, as spawning advances the caller's sequence and would change the next call
+            seed = np.random.SeedSequence(
+                entropy=seed.entropy, spawn_key=seed.spawn_key
+            )
+        else:
+            seed = np.random.SeedSequence(seed)
+        rngs = [
+            np.random.default_rng(seed=child) for child in seed.spawn(len(shard_sizes))
+        ]
+        func = functools.partial(func, **kwargs)
+
+        n_jobs = os.cpu_count() if n_jobs == -1 else n_jobs
+        if n_jobs == 1 or len(shard_sizes) <= 1:
+            return [func(size, rng) for size, rng in zip(shard_sizes, rngs)]
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(shard_sizes))) as executor:
+            return list(executor.map(func, shard_sizes, rngs))
+    except Exception:
+        raise
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
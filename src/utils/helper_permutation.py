@@ -0,0 +1,204 @@
+from typing import Callable, Iterator
+import numpy as np
+
+
+def _run_permutations(
+    batches: Iterator[np.ndarray],
+    observed: float,
+    n_permutations: int,
+    confidence_level: float,
+    stopping_level: float,
+) -> (float, int):
+    """
+    Counts permuted differences at least as extreme as the observed difference, batch by batch.
+
+    Stops early once the Clopper-Pearson interval, at stopping_level, of the p-value lies entirely on one side of
+    confidence_level, as more permutations would not change the decision.
+    """
+    import scipy.stats as st
+
+    # allow for floating point error when comparing differences
+    threshold = abs(observed) * (1 - 1e-12)
+    n_extreme = 0
+    n_done = 0
+    for differences in batches:
+        n_extreme += int(np.count_nonzero(np.abs(differences) >= threshold))
+        n_done += len(differences)
+        if stopping_level is not None and n_done < n_permutations:
+            lower = st.beta.ppf(stopping_level / 2, n_extreme, n_done - n_extreme + 1)
+            upper = st.beta.ppf(
+                1 - stopping_level / 2, n_extreme + 1, n_done - n_extreme
+            )
+            if np.nan_to_num(lower) > confidence_level or upper < confidence_level:
+                break
+
+    return (n_extreme + 1) / (n_done + 1), n_done
+
+
+def get_permutation_p_value(
+    conversions_control: int,
+    conversions_treatment: int,
+    total_users_control: int,
+    total_users_treatment: int,
+    n_permutations: int = 10_000,
+    batch_size: int = 10_000,
+    confidence_level: float = 0.05,
+    stopping_level: float = 0.001,
+    seed: int = None,
+) -> (float, int):
+    """
+    Calculates the two sided permutation test p-value of the difference in conversion rates between the treatment
+    and control groups.
+
+    Permuting the group labels of users with binary conversions only changes how many of the conversions land in the
+    treatment group, which follows a hypergeometric distribution. Permutations are therefore drawn as batches of
+    hypergeometric samples, so their cost does not depend on the number of users.
+
+    Parameters
+    __________
+    conversions_control : int
+        Number of people who converted in the control group.
+    conversions_treatment : int
+        Number of people who converted in the treatment group.
+    total_users_control : int
+        Number of people in the control group.
+    total_users_treatment : int
+        Number of people in the treatment group.
+    n_permutations : int
+        Largest number of permutations to draw.
+    batch_size : int
+        Number of permutations to draw at a time.
+    confidence_level : float
+        Float of the significance level the p-value will be compared against, used for stopping early.
+    stopping_level : float
+        Float of the error allowed in the early stopping decision. Use None to always draw n_permutations.
+    seed : int
+        Seed of the random number generator, for reproducible p-values.
+
+    Returns
+    _______
+    p_value, n_permutations : float, int
+        Float of the p-value and integer of the number of permutations drawn.
+
+    See Also
+    ________
+    get_ab_test_ci : Conducts an A/B test on the two sided hypothesis.
+
+    Examples
+    ________
+    >>> p_value, n_permutations = get_permutation_p_value(conversions_control=5329,
+    ...                                                   conversions_treatment=5648,
+    ...                                                   total_users_control=58583,
+    ...                                                   total_users_treatment=56350,
+    ...                                                   batch_size=1000,
+    ...                                                   seed=2021)
+    >>> p_value, n_permutations
+    (0.000999000999000999, 1000)
+    """
+    try:
+        rng = np.random.default_rng(seed=seed)
+        total_users = total_users_control + total_users_treatment
+        conversions = conversions_control + conversions_treatment
+
+        def batches():
+            for start in range(0, n_permutations, batch_size):
+                conversions_permuted = rng.hypergeometric(
+                    ngood=conversions,
+                    nbad=total_users - conversions,
+                    nsample=total_users_treatment,
+                    size=min(batch_size, n_permutations - start),
+                )
+                yield conversions_permuted / total_users_treatment - (
+                    conversions - conversions_permuted
+                ) / total_users_control
+
+        return _run_permutations(
+            batches=batches(),
+            observed=conversions_treatment / total_users_treatment
+            - conversions_control / total_users_control,
+            n_permutations=n_permutations,
+            confidence_level=confidence_level,
+            stopping_level=stopping_level,
+        )
+    except Exception:
+        raise
+
+
+def get_permutation_p_value_user_level(
+    values_control: np.ndarray,
+    values_treatment: np.ndarray,
+    statistic: Callable = np.mean,
+    n_permutations: int = 10_000,
+    confidence_level: float = 0.05,
+    stopping_level: float = 0.001,
+    seed: int = None,
+    max_elements: int = 10_000_000,
+) -> (float, int):
+    """
+    Calculates the two sided permutation test p-value of the difference in a user-level statistic between the
+    treatment and control groups.
+
+    For metrics that are not binary, the pooled values are permuted as a batch of rows at a time, with batches of at
+    most max_elements values to bound memory.
+
+    Parameters
+    __________
+    values_control : np.ndarray
+        Array of the metric of each user in the control group.
+    values_treatment : np.ndarray
+        Array of the metric of each user in the treatment group.
+    statistic : Callable
+        Function that reduces a 2d array along axis=1, such as np.mean or np.median.
+    n_permutations : int
+        Largest number of permutations to draw.
+    confidence_level : float
+        Float of the significance level the p-value will be compared against, used for stopping early.
+    stopping_level : float
+        Float of the error allowed in the early stopping decision. Use None to always draw n_permutations.
+    seed : int
+        Seed of the random number generator, for reproducible p-values.
+    max_elements : int
+        Largest number of permuted values held in memory at once.
+
+    Returns
+    _______
+    p_value, n_permutations : float, int
+        Float of the p-value and integer of the number of permutations drawn.
+
+    See Also
+    ________
+    get_permutation_p_value : Calculates the permutation test p-value of the difference in conversion rates.
+    """
+    try:
+        rng = np.random.default_rng(seed=seed)
+        values_control = np.asarray(values_control)
+        values_treatment = np.asarray(values_treatment)
+        pooled = np.concatenate([values_treatment, values_control])
+        n_treatment = len(values_treatment)
+        batch_size = max(1, max_elements // len(pooled))
+
+        def batches():
+            for start in range(0, n_permutations, batch_size):
+                size = min(batch_size, n_permutations - start)
+                permuted = rng.permuted(
+                    np.broadcast_to(pooled, (size, len(pooled))), axis=1
+                )
+                yield statistic(permuted[:, :n_treatment], axis=1) - statistic(
+                    permuted[:, n_treatment:], axis=1
+                )
+
+        return _run_permutations(
+            batches=batches(),
+            observed=statistic(values_treatment) - statistic(values_control),
+            n_permutations=n_permutations,
+            confidence_level=confidence_level,
+            stopping_level=stopping_level,
+        )
+    except Exception:
+        raise
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
@@ -0,0 +1,388 @@
+from typing import NamedTuple, Sequence, Tuple, Union
+import numpy as np
+from src.utils.helper_ab_test import get_sample_sizes
+
+# factor applied to the second derivatives estimated from the grid when bounding interpolation errors
+SAFETY_FACTOR = 2.0
+
+
+class SampleSizeTable(NamedTuple):
+    """
+    Precomputed sample sizes over a grid of baseline rates and practical significances.
+
+    Attributes
+    __________
+    baseline_rate : np.ndarray
+        Sorted array of the baseline rates the table was built over.
+    practical_significance : np.ndarray
+        Sorted array of the practical significances the table was built over.
+    confidence_level : np.ndarray
+        Array of the confidence level of each setting in the table.
+    sensitivity : np.ndarray
+        Array of the sensitivity of each setting in the table.
+    log_sample_size : np.ndarray
+        Array of shape (settings, baseline rates, practical significances) of the log of the sample sizes.
+    error_bound : np.ndarray
+        Array of shape (settings, baseline rates - 1, practical significances - 1) of the bound on the relative
+        interpolation error within each grid cell, verified against the exact solver. Cells whose bound could not be
+        verified have an infinite bound, so lookups in them always fall back to the exact solver.
+    """
+
+    baseline_rate: np.ndarray
+    practical_significance: np.ndarray
+    confidence_level: np.ndarray
+    sensitivity: np.ndarray
+    log_sample_size: np.ndarray
+    error_bound: np.ndarray
+
+
+def _interpolate(
+    table: SampleSizeTable,
+    setting: np.ndarray,
+    baseline_rate: np.ndarray,
+    practical_significance: np.ndarray,
+) -> (np.ndarray, np.ndarray):
+    """
+    Bilinearly interpolates the log sample sizes of in-grid points, returning the sample sizes and the error bounds
+    of their grid cells.
+    """
+    i = np.clip(
+        np.searchsorted(table.baseline_rate, baseline_rate, side="right") - 1,
+        0,
+        len(table.baseline_rate) - 2,
+    )
+    j = np.clip(
+        np.searchsorted(
+            table.practical_significance, practical_significance, side="right"
+        )
+        - 1,
+        0,
+        len(table.practical_significance) - 2,
+    )
+    u = (baseline_rate - table.baseline_rate[i]) / (
+        table.baseline_rate[i + 1] - table.baseline_rate[i]
+    )
+    v = (practical_significance - table.practical_significance[j]) / (
+        table.practical_significance[j + 1] - table.practical_significance[j]
+    )
+
+    # cast only the corners of each query, rather than copying the whole table
+    grid = table.log_sample_size
+    log_sample_size = (
+        (1 - u) * (1 - v) * grid[setting, i, j].astype(float)
+        + u * (1 - v) * grid[setting, i + 1, j].astype(float)
+        + (1 - u) * v * grid[setting, i, j + 1].astype(float)
+        + u * v * grid[setting, i + 1, j + 1].astype(float)
+    )
+    return np.exp(log_sample_size), table.error_bound[setting, i, j]
+
+
+def _curvature(
+    log_sample_size: np.ndarray, axis_values: np.ndarray, axis: int
+) -> np.ndarray:
+    """
+    Estimates the largest absolute second derivative of the log sample sizes within each cell along one axis of the
+    grid.
+
+    Second differences are taken at the interior nodes, extended to the end nodes, and each cell takes the larger of
+    the values at its two nodes.
+    """
+    log_sample_size = np.moveaxis(log_sample_size, axis, -1)
+    slope = np.diff(log_sample_size, axis=-1) / np.diff(axis_values)
+    second = np.abs(2 * np.diff(slope, axis=-1) / (axis_values[2:] - axis_values[:-2]))
+    second = np.concatenate([second[..., :1], second, second[..., -1:]], axis=-1)
+    return np.moveaxis(np.maximum(second[..., :-1], second[..., 1:]), -1, axis)
+
+
+def _midpoint_errors(
+    grid: np.ndarray,
+    baseline_rate: np.ndarray,
+    practical_significance: np.ndarray,
+    confidence_level: np.ndarray,
+    sensitivity: np.ndarray,
+) -> np.ndarray:
+    """
+    Calculates the largest absolute error of the interpolated log sample sizes of each cell, against the exact solver,
+    at the midpoints of the cell's edges and at its centre.
+
+    Along an edge, bilinear interpolation is linear interpolation, whose error peaks at the midpoint of the edge, so
+    these points check the bound where it is tightest.
+    """
+    mid_rate = (baseline_rate[1:] + baseline_rate[:-1]) / 2
+    mid_significance = (practical_significance[1:] + practical_significance[:-1]) / 2
+    checks = (
+        # midpoints of the edges along the baseline rates, centres of the cells
+        (mid_rate, practical_significance, (grid[:, 1:, :] + grid[:, :-1, :]) / 2),
+        (baseline_rate, mid_significance, (grid[:, :, 1:] + grid[:, :, :-1]) / 2),
+        (
+            mid_rate,
+            mid_significance,
+            (grid[:, 1:, 1:] + grid[:, 1:, :-1] + grid[:, :-1, 1:] + grid[:, :-1, :-1])
+            / 4,
+        ),
+    )
+    errors = []
+    for rates, significances, interpolated in checks:
+        exact = np.log(
+            get_sample_sizes(
+                baseline_rate=rates[None, :, None],
+                practical_significance=significances[None, None, :],
+                confidence_level=confidence_level[:, None, None],
+                sensitivity=sensitivity[:, None, None],
+            )
+        )
+        errors.append(np.abs(exact - interpolated))
+
+    # each cell has two edges of each kind, shared with its neighbours
+    error_rate, error_significance, error_centre = errors
+    return np.fmax.reduce(
+        [
+            error_rate[:, :, 1:],
+            error_rate[:, :, :-1],
+            error_significance[:, 1:, :],
+            error_significance[:, :-1, :],
+            error_centre,
+        ]
+    )
+
+
+def build_sample_size_table(
+    baseline_rate: Sequence[float],
+    practical_significance: Sequence[float],
+    settings: Sequence[Tuple[float, float]] = ((0.05, 0.8),),
+) -> SampleSizeTable:
+    """
+    Precomputes the required sample sizes over a dense grid of baseline rates and practical significances.
+
+    Sample sizes are stored as float32 logs, which vary smoothly enough to interpolate bilinearly. The error of
+    bilinear interpolation within a cell is at most h_x^2 / 8 * max|f_xx| + h_y^2 / 8 * max|f_yy|. The second
+    derivatives are estimated from second differences of the grid and multiplied by SAFETY_FACTOR, and the rounding
+    error of float32 storage is added on top.
+
+    Each bound is then verified by solving for the exact sample sizes at the midpoints of the cell's edges and at its
+    centre, where the interpolation error peaks, at the cost of about three more evaluations of the grid. A cell
+    whose interpolated values there miss the exact ones by more than its bound is given an infinite bound, so
+    lookup_sample_sizes() never interpolates in it.
+
+    Parameters
+    __________
+    baseline_rate : Sequence[float]
+        Sorted sequence of at least three baseline rates to build the grid over.
+    practical_significance : Sequence[float]
+        Sorted sequence of at least three practical significances to build the grid over. Should not cross zero,
+        where the required sample size is infinite.
+    settings : Sequence[Tuple[float, float]]
+        Sequence of the (confidence_level, sensitivity) pairs to build a grid for.
+
+    Returns
+    _______
+    SampleSizeTable
+        The precomputed table.
+
+    See Also
+    ________
+    get_sample_sizes : Calculates the required sample sizes over arrays of inputs.
+
+    Examples
+    ________
+    >>> table = build_sample_size_table(baseline_rate=np.linspace(0.05, 0.2, 151),
+    ...                                 practical_significance=np.linspace(0.005, 0.05, 451))
+    >>> table.log_sample_size.shape, table.error_bound.shape
+    ((1, 151, 451), (1, 150, 450))
+    """
+    try:
+        baseline_rate = np.asarray(baseline_rate, dtype=float)
+        practical_significance = np.asarray(practical_significance, dtype=float)
+        confidence_level, sensitivity = (
+            np.asarray(a=x, dtype=float) for x in zip(*settings)
+        )
+
+        # evaluate every setting over the grid in one call
+        log_sample_size = np.log(
+            get_sample_sizes(
+                baseline_rate=baseline_rate[None, :, None],
+                practical_significance=practical_significance[None, None, :],
+                confidence_level=confidence_level[:, None, None],
+                sensitivity=sensitivity[:, None, None],
+            )
+        )
+
+        # bound the interpolation error of the log sample sizes within each cell
+        curvature_rate = _curvature(
+            log_sample_size=log_sample_size, axis_values=baseline_rate, axis=1
+        )
+        curvature_significance = _curvature(
+            log_sample_size=log_sample_size, axis_values=practical_significance, axis=2
+        )
+        log_error = SAFETY_FACTOR * (
+            np.diff(baseline_rate)[None, :, None] ** 2
+            / 8
+            * np.maximum(curvature_rate[:, :, 1:], curvature_rate[:, :, :-1])
+            + np.diff(practical_significance)[None, None, :] ** 2
+            / 8
+            * np.maximum(
+                curvature_significance[:, 1:, :], curvature_significance[:, :-1, :]
+            )
+        )
+        log_error += np.abs(log_sample_size).max() * np.finfo(np.float32).eps
+
+        # verify the bounds against the exact solver, interpolating from the values as stored
+        log_sample_size = log_sample_size.astype(np.float32)
+        verified = (
+            _midpoint_errors(
+                grid=log_sample_size.astype(float),
+                baseline_rate=baseline_rate,
+                practical_significance=practical_significance,
+                confidence_level=confidence_level,
+                sensitivity=sensitivity,
+            )
+            <= log_error
+        )
+
+        return SampleSizeTable(
+            baseline_rate=baseline_rate,
+            practical_significance=practical_significance,
+            confidence_level=confidence_level,
+            sensitivity=sensitivity,
+            log_sample_size=log_sample_size,
+            error_bound=np.where(verified, np.expm1(log_error), np.inf).astype(
+                np.float32
+            ),
+        )
+    except Exception:
+        raise
+
+
+def save_sample_size_table(table: SampleSizeTable, path: str):
+    """
+    Saves a sample size table to a compressed binary .npz file.
+
+    Parameters
+    __________
+    table : SampleSizeTable
+        The table to save.
+    path : str
+        String of the file path to save the table to.
+    """
+    try:
+        np.savez_compressed(file=path, **table._asdict())
+    except Exception:
+        raise
+
+
+def load_sample_size_table(path: str) -> SampleSizeTable:
+    """
+    Loads a sample size table saved by save_sample_size_table().
+
+    Parameters
+    __________
+    path : str
+        String of the file path of the saved table.
+
+    Returns
+    _______
+    SampleSizeTable
+        The loaded table.
+    """
+    try:
+        with np.load(file=path) as saved:
+            return SampleSizeTable(
+                **{field: saved[field] for field in SampleSizeTable._fields}
+            )
+    except Exception:
+        raise
+
+
+def lookup_sample_sizes(
+    table: SampleSizeTable,
+    baseline_rate: Union[float, np.ndarray],
+    practical_significance: Union[float, np.ndarray] = 0.01,
+    confidence_level: float = 0.05,
+    sensitivity: float = 0.8,
+    max_error: float = 1e-3,
+) -> np.ndarray:
+    """
+    Looks up the required sample sizes from a precomputed table, falling back to the exact solver where needed.
+
+    Queries are interpolated from the table when their confidence level and sensitivity match a setting of the table,
+    they lie inside the grid and the verified error bound of their grid cell is within max_error. All other queries
+    are answered by get_sample_sizes().
+
+    Parameters
+    __________
+    table : SampleSizeTable
+        The precomputed table.
+    baseline_rate : Union[float, np.ndarray]
+        Float or array of estimates of the metric being analyzed before making any changes.
+    practical_significance : Union[float, np.ndarray]
+        Float or array of the minimum change to the baseline rate that is useful to the business.
+    confidence_level : float
+        Float of the probability that the null hypothesis (experiment and control are the same) is rejected when it
+        should not be. Also called significance level.
+    sensitivity : float
+        Float of the probability that the null hypothesis is rejected when it should be. Also called power.
+    max_error : float
+        Float of the largest relative error allowed from interpolation.
+
+    Returns
+    _______
+    sample_size : np.ndarray
+        Array of the sample sizes per group.
+
+    Examples
+    ________
+    >>> table = build_sample_size_table(baseline_rate=np.linspace(0.05, 0.2, 31),
+    ...                                 practical_significance=np.linspace(0.005, 0.05, 46))
+    >>> lookup_sample_sizes(table=table, baseline_rate=[0.1204, 0.5]).round()
+    array([17210., 39239.])
+    """
+    try:
+        baseline_rate, practical_significance = np.broadcast_arrays(
+            np.asarray(baseline_rate, dtype=float),
+            np.asarray(practical_significance, dtype=float),
+        )
+        shape = baseline_rate.shape
+        baseline_rate, practical_significance = (
+            baseline_rate.ravel(),
+            practical_significance.ravel(),
+        )
+        sample_size = np.empty(shape=baseline_rate.shape)
+
+        matches = np.flatnonzero(
+            np.isclose(table.confidence_level, confidence_level)
+            & np.isclose(table.sensitivity, sensitivity)
+        )
+        use_table = np.zeros(shape=baseline_rate.shape, dtype=bool)
+        if len(matches) > 0:
+            use_table = (
+                (baseline_rate >= table.baseline_rate[0])
+                & (baseline_rate <= table.baseline_rate[-1])
+                & (practical_significance >= table.practical_significance[0])
+                & (practical_significance <= table.practical_significance[-1])
+            )
+            interpolated, error_bound = _interpolate(
+                table=table,
+                setting=np.full(shape=use_table.sum(), fill_value=matches[0]),
+                baseline_rate=baseline_rate[use_table],
+                practical_significance=practical_significance[use_table],
+            )
+            sample_size[use_table] = interpolated
+            # unverified cells are never interpolated, even with an unlimited error budget
+            use_table[use_table] = np.isfinite(error_bound) & (error_bound <= max_error)
+
+        # fall back to the exact solver for everything else
+        sample_size[~use_table] = get_sample_sizes(
+            baseline_rate=baseline_rate[~use_table],
+            practical_significance=practical_significance[~use_table],
+            confidence_level=confidence_level,
+            sensitivity=sensitivity,
+        )
+        return sample_size.reshape(shape)
+    except Exception:
+        raise
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
@@ -0,0 +1,86 @@
+from typing import Sequence
+import numpy as np
+import pandas as pd
+
+# compact dtypes of the Kaggle ab_data layout. User ids are read as int64, as narrower integers silently wrap
+# around for larger ids, and groups and pages as categoricals of whatever labels are in the data, so extra arms are
+# kept rather than turned into missing values
+AB_DATA_DTYPES = {
+    "user_id": np.int64,
+    "group": "category",
+    "landing_page": "category",
+    "converted": np.int8,
+}
+AB_DATA_DATES = ["timestamp"]
+AB_DATA_COLUMNS = ["user_id", "timestamp", "group", "landing_page", "converted"]
+
+# labels of the groups and pages of a two-arm experiment
+AB_DATA_CATEGORIES = {
+    "group": ["control", "treatment"],
+    "landing_page": ["new_page", "old_page"],
+}
+
+# pairs of group and the only landing page that group is expected to see
+GROUP_PAGES = (("control", "old_page"), ("treatment", "new_page"))
+
+# dtypes to cast to when storing the ab_data layout in a typed format, with fixed categories so the codes of every
+# chunk agree
+CLEAN_DTYPES = {
+    **AB_DATA_DTYPES,
+    **{
+        col: pd.CategoricalDtype(categories=categories)
+        for col, categories in AB_DATA_CATEGORIES.items()
+    },
+    "timestamp": "datetime64[ns]",
+}
+
+
+def read_ab_data(path: str, columns: Sequence[str] = None, **kwargs):
+    """
+    Reads a csv with the ab_data layout using compact dtypes.
+
+    Group and landing page are read as categoricals, conversions as narrow integers, user ids as int64 and timestamps
+    as datetimes. Only the requested columns are parsed, so unused columns are never materialised.
+
+    Parameters
+    __________
+    path : str
+        String of the file path of the csv.
+    columns : Sequence[str]
+        Sequence of the columns to read. Defaults to all columns.
+    **kwargs
+        These parameters will be passed to pd.read_csv(), such as chunksize to read the csv in chunks.
+
+    Returns
+    _______
+    Union[pd.DataFrame, pd.io.parsers.TextFileReader]
+        Dataframe of the data, or an iterator over chunks of it if chunksize is passed.
+
+    Examples
+    ________
+    >>> import io
+    >>> csv = io.StringIO('user_id,timestamp,group,landing_page,converted\\n'
+    ...                   '851104,2017-01-21 22:11:48.556739,control,old_page,0\\n'
+    ...                   '804228,2017-01-12 08:01:45.159739,treatment,new_page,1\\n')
+    >>> read_ab_data(path=csv, columns=['group', 'converted']).dtypes.map(str).to_dict()
+    {'group': 'category', 'converted': 'int8'}
+    """
+    try:
+        columns = AB_DATA_COLUMNS if columns is None else list(columns)
+        return pd.read_csv(
+            filepath_or_buffer=path,
+            usecols=columns,
+            dtype={
+                col: AB_DATA_DTYPES[col] for col in columns if col in AB_DATA_DTYPES
+            },
+            parse_dates=[col for col in AB_DATA_DATES if col in columns],
+            **kwargs,
+        )
+    except Exception:
+        raise
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
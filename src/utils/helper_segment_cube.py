@@ -0,0 +1,282 @@
+from typing import Iterable, Sequence
+import numpy as np
+import pandas as pd
+from src.utils.helper_ab_test import get_ab_test_ci_batch
+
+
+def add_day(
+    data: pd.DataFrame, timestamp_col: str = "timestamp", day_col: str = "day"
+) -> pd.DataFrame:
+    """
+    Adds a column of the day of each event, floored from its timestamp, to use as a segment dimension.
+
+    Parameters
+    __________
+    data : pd.DataFrame
+        Dataframe of events with a timestamp column.
+    timestamp_col : str
+        String of the column of the timestamps of the events.
+    day_col : str
+        String of the column to add the days to.
+
+    Returns
+    _______
+    pd.DataFrame
+        Dataframe of the events with the day column added.
+    """
+    try:
+        return data.assign(
+            **{day_col: pd.to_datetime(data[timestamp_col]).dt.floor("D")}
+        )
+    except Exception:
+        raise
+
+
+def build_segment_cube(
+    data: pd.DataFrame,
+    dims: Sequence[str],
+    group_col: str = "group",
+    convert_col: str = "converted",
+) -> pd.DataFrame:
+    """
+    Aggregates users and conversions per group and combination of segment dimensions, in one groupby.
+
+    Only the combinations observed in the data are kept, so the cube stays sparse however many dimensions it has.
+    Cubes of chunks of the data can be combined with merge_segment_cubes().
+
+    Parameters
+    __________
+    data : pd.DataFrame
+        Dataframe of the cleaned data, with one row per user.
+    dims : Sequence[str]
+        Sequence of the columns to segment by, such as country, device and day.
+    group_col : str
+        String of the grouping column that identifies whether conversion belongs to 'control' or 'treatment'.
+    convert_col : str
+        String of the column that identifies whether the user has converted or not.
+
+    Returns
+    _______
+    pd.DataFrame
+        Dataframe indexed by the segment dimensions and group, of total_users and conversions.
+
+    Examples
+    ________
+    >>> df = pd.DataFrame(data={'group': ['control', 'control', 'treatment', 'control', 'treatment'],
+    ...                         'device': ['mobile', 'desktop', 'mobile', 'mobile', 'mobile'],
+    ...                         'converted': [0, 1, 0, 0, 1]})
+    >>> build_segment_cube(data=df, dims=['device'])  # doctest: +NORMALIZE_WHITESPACE
+                       total_users  conversions
+    device  group
+    desktop control              1            1
+    mobile  control              2            0
+            treatment            2            1
+    """
+    try:
+        return (
+            data.groupby(by=list(dims) + [group_col], observed=True, sort=True)[
+                convert_col
+            ]
+            .agg(["size", "sum"])
+            .rename(columns={"size": "total_users", "sum": "conversions"})
+            .astype(np.int64)
+        )
+    except Exception:
+        raise
+
+
+def merge_segment_cubes(cubes: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Combines segment cubes built over separate chunks of users by summing their counts.
+
+    Parameters
+    __________
+    cubes : Iterable[pd.DataFrame]
+        Iterable of segment cubes with the same dimensions.
+
+    Returns
+    _______
+    pd.DataFrame
+        Segment cube of the counts over all the chunks.
+    """
+    try:
+        cube = pd.concat(cubes)
+        return cube.groupby(
+            level=list(cube.index.names), observed=True, sort=True
+        ).sum()
+    except Exception:
+        raise
+
+
+def save_segment_cube(cube: pd.DataFrame, path: str):
+    """
+    Writes a segment cube to a csv, one row per observed combination.
+    """
+    try:
+        cube.to_csv(path_or_buf=path)
+    except Exception:
+        raise
+
+
+def load_segment_cube(path: str, day_col: str = "day") -> pd.DataFrame:
+    """
+    Reads a segment cube written by save_segment_cube(), parsing the day dimension back to timestamps.
+    """
+    try:
+        cube = pd.read_csv(filepath_or_buffer=path)
+        if day_col in cube.columns:
+            cube[day_col] = pd.to_datetime(cube[day_col])
+        return cube.set_index(
+            [col for col in cube.columns if col not in ("total_users", "conversions")]
+        )
+    except Exception:
+        raise
+
+
+def query_segment_cube(
+    cube: pd.DataFrame,
+    by: Sequence[str] = (),
+    filters: dict = None,
+    group_col: str = "group",
+) -> pd.DataFrame:
+    """
+    Answers a roll-up or slice query from a segment cube, without touching the user-level data.
+
+    Parameters
+    __________
+    cube : pd.DataFrame
+        Segment cube from build_segment_cube().
+    by : Sequence[str]
+        Sequence of the dimensions to keep. All other dimensions are rolled up.
+    filters : dict
+        Dictionary of dimensions to the value, or list of values, to slice the cube to before rolling up.
+    group_col : str
+        String of the grouping column of the cube.
+
+    Returns
+    _______
+    pd.DataFrame
+        Dataframe indexed by the kept dimensions and group, of total_users, conversions and conversion_rate.
+
+    Examples
+    ________
+    >>> cube = pd.DataFrame(data={'device': ['desktop', 'mobile', 'mobile'],
+    ...                           'group': ['control', 'control', 'treatment'],
+    ...                           'total_users': [1, 2, 2],
+    ...                           'conversions': [1, 0, 1]}).set_index(['device', 'group'])
+    >>> query_segment_cube(cube=cube)  # doctest: +NORMALIZE_WHITESPACE
+               total_users  conversions  conversion_rate
+    group
+    control              3            1         0.333333
+    treatment            2            1         0.500000
+    >>> query_segment_cube(cube=cube, filters={'device': 'mobile'})  # doctest: +NORMALIZE_WHITESPACE
+               total_users  conversions  conversion_rate
+    group
+    control              2            0              0.0
+    treatment            2            1              0.5
+    """
+    try:
+        mask = np.ones(len(cube), dtype=bool)
+        for dim, values in (filters or {}).items():
+            level = cube.index.get_level_values(dim)
+            values = values if pd.api.types.is_list_like(values) else [values]
+            mask &= level.isin(pd.Index(values).astype(level.dtype))
+
+        df_query = (
+            cube.loc[mask, ["total_users", "conversions"]]
+            .groupby(level=list(by) + [group_col], observed=True, sort=True)
+            .sum()
+        )
+        df_query["conversion_rate"] = df_query["conversions"] / df_query["total_users"]
+        return df_query
+    except Exception:
+        raise
+
+
+def get_segment_lifts(
+    cube: pd.DataFrame,
+    by: Sequence[str] = (),
+    filters: dict = None,
+    group_col: str = "group",
+    control: str = "control",
+    treatment: str = "treatment",
+    confidence_level: float = 0.05,
+) -> pd.DataFrame:
+    """
+    Calculates the lift in conversion rate of treatment over control, and its C.I. from get_ab_test_ci_batch(), for
+    each segment of a query of a segment cube.
+
+    Segments missing either group are dropped, as they have no lift.
+
+    Parameters
+    __________
+    cube : pd.DataFrame
+        Segment cube from build_segment_cube().
+    by : Sequence[str]
+        Sequence of the dimensions of the segments. All other dimensions are rolled up.
+    filters : dict
+        Dictionary of dimensions to the value, or list of values, to slice the cube to before rolling up.
+    group_col : str
+        String of the grouping column of the cube.
+    control : str
+        String of the value of the grouping column for the control group.
+    treatment : str
+        String of the value of the grouping column for the treatment group.
+    confidence_level : float
+        Float of the significance level of the C.I.s.
+
+    Returns
+    _______
+    pd.DataFrame
+        Dataframe indexed by segment, of the counts and conversion rates of each group, lift, lower_bound and
+        upper_bound.
+
+    See Also
+    ________
+    get_ab_test_ci : Conducts an A/B test on the two sided hypothesis.
+    """
+    try:
+        df_query = query_segment_cube(
+            cube=cube, by=by, filters=filters, group_col=group_col
+        )
+        if not by:
+            # keep a segment level to unstack the groups from
+            df_query = pd.concat({"all": df_query}, names=["segment"])
+        df_query = df_query.unstack(level=group_col)
+        df_lifts = pd.DataFrame(
+            data={
+                f"{col}_{suffix}": df_query[(col, value)]
+                for suffix, value in (("control", control), ("treatment", treatment))
+                for col in ("total_users", "conversions", "conversion_rate")
+                if (col, value) in df_query.columns
+            },
+            columns=[
+                f"{col}_{suffix}"
+                for suffix in ("control", "treatment")
+                for col in ("total_users", "conversions", "conversion_rate")
+            ],
+        ).dropna()
+        # unstacking turns the counts into floats to hold the missing groups
+        df_lifts = df_lifts.astype(
+            {col: np.int64 for col in df_lifts.columns if "conversion_rate" not in col}
+        )
+
+        df_lifts["lift"] = (
+            df_lifts["conversion_rate_treatment"] - df_lifts["conversion_rate_control"]
+        )
+        df_lifts["lower_bound"], df_lifts["upper_bound"] = get_ab_test_ci_batch(
+            conversions_control=df_lifts["conversions_control"].to_numpy(),
+            conversions_treatment=df_lifts["conversions_treatment"].to_numpy(),
+            total_users_control=df_lifts["total_users_control"].to_numpy(),
+            total_users_treatment=df_lifts["total_users_treatment"].to_numpy(),
+            confidence_level=confidence_level,
+        )
+        return df_lifts
+    except Exception:
+        raise
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
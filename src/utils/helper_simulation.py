@@ -0,0 +1,241 @@
+from typing import NamedTuple, Union
+import numpy as np
+from src.utils.helper_ab_test import get_ab_test_ci_batch, get_powers
+from src.utils.helper_parallel import map_shards, split_shards
+
+
+class SimulationResult(NamedTuple):
+    """
+    Empirical rejection rate of a decision procedure over simulated experiments.
+
+    Attributes
+    __________
+    n_experiments : int
+        Number of simulated experiments.
+    n_rejected : int
+        Number of experiments where the null hypothesis was rejected.
+    rejection_rate : float
+        Proportion of experiments where the null hypothesis was rejected, the type I error of A/A experiments or the
+        power of A/B experiments.
+    standard_error : float
+        Monte Carlo standard error of the rejection rate.
+    lower_bound : float
+        Lower bound of the C.I. of the rejection rate.
+    upper_bound : float
+        Upper bound of the C.I. of the rejection rate.
+    """
+
+    n_experiments: int
+    n_rejected: int
+    rejection_rate: float
+    standard_error: float
+    lower_bound: float
+    upper_bound: float
+
+
+def _simulate_shard(
+    size: int,
+    rng: np.random.Generator,
+    conversion_rate_control: float,
+    conversion_rate_treatment: float,
+    total_users_control: int,
+    total_users_treatment: int,
+    confidence_level: float,
+    practical_significance: float,
+) -> int:
+    """
+    Simulates a shard of experiments as binomial draws on the counts of each arm, and counts how many reject the
+    null hypothesis by the same rule as conclude_ab_test().
+    """
+    lower_bound, upper_bound = get_ab_test_ci_batch(
+        conversions_control=rng.binomial(
+            n=total_users_control, p=conversion_rate_control, size=size
+        ),
+        conversions_treatment=rng.binomial(
+            n=total_users_treatment, p=conversion_rate_treatment, size=size
+        ),
+        total_users_control=total_users_control,
+        total_users_treatment=total_users_treatment,
+        confidence_level=confidence_level,
+    )
+    reject = (practical_significance < lower_bound) | (
+        practical_significance > upper_bound
+    )
+    return int(reject.sum())
+
+
+def simulate_ab_tests(
+    conversion_rate_control: float,
+    conversion_rate_treatment: float = None,
+    total_users_control: int = 10_000,
+    total_users_treatment: int = None,
+    n_experiments: int = 1_000_000,
+    confidence_level: float = 0.05,
+    practical_significance: float = 0.0,
+    shard_size: int = 100_000,
+    n_jobs: int = 1,
+    seed: Union[int, np.random.SeedSequence] = None,
+) -> SimulationResult:
+    """
+    Simulates experiments to measure how often get_ab_test_ci() and conclude_ab_test() reject the null hypothesis.
+
+    The conversions of each arm of every experiment in a shard are drawn at once from binomial distributions, and
+    the C.I.s and decisions of the whole shard come from a single get_ab_test_ci_batch() call. Shards are spread
+    across a process pool with independent random number streams, so results depend only on the seed and the shard
+    size, not on the number of processes.
+
+    Parameters
+    __________
+    conversion_rate_control : float
+        Float of the true conversion rate of the control group.
+    conversion_rate_treatment : float
+        Float of the true conversion rate of the treatment group. Defaults to that of the control group, for A/A
+        experiments where the rejection rate is the type I error.
+    total_users_control : int
+        Number of people in the control group of each experiment.
+    total_users_treatment : int
+        Number of people in the treatment group of each experiment. Defaults to that of the control group.
+    n_experiments : int
+        Number of experiments to simulate.
+    confidence_level : float
+        Float of the significance level of the C.I. of each experiment, and of the C.I. of the rejection rate.
+    practical_significance : float
+        Float of the difference in conversion rates under the null hypothesis, as in conclude_ab_test().
+    shard_size : int
+        Number of experiments simulated at a time in each process, which bounds memory.
+    n_jobs : int
+        Number of processes to spread the shards across. Use -1 for one process per CPU.
+    seed : Union[int, np.random.SeedSequence]
+        Seed to spawn the random number streams of the shards from.
+
+    Returns
+    _______
+    SimulationResult
+        Named tuple of the rejection rate and its Monte Carlo standard error and C.I.
+
+    Examples
+    ________
+    >>> result = simulate_ab_tests(conversion_rate_control=0.12, n_experiments=100_000, seed=2021)
+    >>> result.n_rejected, round(result.rejection_rate, 4), round(result.standard_error, 4)
+    (4976, 0.0498, 0.0007)
+    """
+    import scipy.stats as st
+
+    try:
+        if conversion_rate_treatment is None:
+            conversion_rate_treatment = conversion_rate_control
+        if total_users_treatment is None:
+            total_users_treatment = total_users_control
+
+        n_rejected = sum(
+            map_shards(
+                func=_simulate_shard,
+                shard_sizes=split_shards(n_total=n_experiments, shard_size=shard_size),
+                seed=seed,
+                n_jobs=n_jobs,
+                conversion_rate_control=conversion_rate_control,
+                conversion_rate_treatment=conversion_rate_treatment,
+                total_users_control=total_users_control,
+                total_users_treatment=total_users_treatment,
+                confidence_level=confidence_level,
+                practical_significance=practical_significance,
+            )
+        )
+        rejection_rate = n_rejected / n_experiments
+        standard_error = np.sqrt(rejection_rate * (1 - rejection_rate) / n_experiments)
+        z_score = st.norm.ppf(q=1 - confidence_level / 2)
+        return SimulationResult(
+            n_experiments=n_experiments,
+            n_rejected=n_rejected,
+            rejection_rate=rejection_rate,
+            standard_error=float(standard_error),
+            lower_bound=float(rejection_rate - z_score * standard_error),
+            upper_bound=float(rejection_rate + z_score * standard_error),
+        )
+    except Exception:
+        raise
+
+
+def validate_ab_test(
+    baseline_rate: float,
+    practical_significance: float = 0.01,
+    sample_size: int = 10_000,
+    confidence_level: float = 0.05,
+    **kwargs,
+) -> (SimulationResult, SimulationResult):
+    """
+    Validates the decision procedure empirically, by simulating A/A experiments for its type I error and A/B
+    experiments for its power, and reporting them against the nominal significance level and the power expected from
+    get_powers().
+
+    Parameters
+    __________
+    baseline_rate : float
+        Float of the true conversion rate of the control group.
+    practical_significance : float
+        Float of the true change to the baseline rate in the A/B experiments.
+    sample_size : int
+        Number of people in each group of each experiment.
+    confidence_level : float
+        Float of the significance level of the C.I. of each experiment.
+    **kwargs
+        These parameters will be passed to simulate_ab_tests(), such as n_experiments, n_jobs and seed.
+
+    Returns
+    _______
+    aa_result, ab_result : SimulationResult, SimulationResult
+        Named tuples of the simulated type I error and power.
+
+    See Also
+    ________
+    simulate_ab_tests : Simulates experiments to measure how often the null hypothesis is rejected.
+    """
+    try:
+        seed = kwargs.pop("seed", None)
+        if isinstance(seed, np.random.SeedSequence):
+            # spawn from a copy, as spawning advances the caller's sequence and would change the next call
+            seed = np.random.SeedSequence(
+                entropy=seed.entropy, spawn_key=seed.spawn_key
+            )
+        else:
+            seed = np.random.SeedSequence(seed)
+        seed_aa, seed_ab = seed.spawn(2)
+        aa_result = simulate_ab_tests(
+            conversion_rate_control=baseline_rate,
+            total_users_control=sample_size,
+            confidence_level=confidence_level,
+            seed=seed_aa,
+            **kwargs,
+        )
+        ab_result = simulate_ab_tests(
+            conversion_rate_control=baseline_rate,
+            conversion_rate_treatment=baseline_rate + practical_significance,
+            total_users_control=sample_size,
+            confidence_level=confidence_level,
+            seed=seed_ab,
+            **kwargs,
+        )
+        power = get_powers(
+            baseline_rate=baseline_rate,
+            practical_significance=practical_significance,
+            sample_size=sample_size,
+            confidence_level=confidence_level,
+        )
+
+        print(
+            f"Type I error: {aa_result.rejection_rate:.4f} +/- {aa_result.standard_error:.4f}",
+            f"(nominal {confidence_level})",
+        )
+        print(
+            f"Power: {ab_result.rejection_rate:.4f} +/- {ab_result.standard_error:.4f}",
+            f"(expected {float(power):.4f})",
+        )
+        return aa_result, ab_result
+    except Exception:
+        raise
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
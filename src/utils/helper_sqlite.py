@@ -0,0 +1,239 @@
+from contextlib import closing
+from typing import Sequence, Tuple
+import re
+import sqlite3
+import pandas as pd
+from src.utils.helper_schema import GROUP_PAGES, read_ab_data
+
+# identifiers are interpolated into the sql, so only plain names are accepted
+IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _quote(identifier: str) -> str:
+    """
+    Validates a table or column name and quotes it for use in sql.
+
+    Examples
+    ________
+    >>> _quote('group')
+    '"group"'
+    """
+    if not isinstance(identifier, str) or not IDENTIFIER.match(identifier):
+        raise ValueError(f"'{identifier}' is not a valid sql identifier.")
+    return f'"{identifier}"'
+
+
+def load_ab_data_sqlite(
+    path_in: str,
+    database: str,
+    table: str = "ab_data",
+    chunksize: int = 1_000_000,
+    user_col: str = "user_id",
+    group_col: str = "group",
+    page_col: str = "landing_page",
+    columns: Sequence[str] = None,
+) -> int:
+    """
+    Loads a csv of raw events with the ab_data layout into a table of a SQLite database, in chunks, and indexes it
+    for summarise_conversions_sqlite().
+
+    Rows are appended, so events can be loaded from several files. The user index includes the group and page, and
+    the group index the page, so the deduplication of users can be answered from the indexes alone.
+
+    Parameters
+    __________
+    path_in : str
+        String of the file path of the raw events csv.
+    database : str
+        String of the file path of the SQLite database, which is created if needed.
+    table : str
+        String of the table to append the events to.
+    chunksize : int
+        Number of rows to read and insert at a time.
+    user_col : str
+        String of the column that identifies the user.
+    group_col : str
+        String of the grouping column that identifies whether conversion belongs to 'control' or 'treatment'.
+    page_col: str
+        String of the column that identifies the page seen by the user.
+    columns : Sequence[str]
+        Sequence of the columns to load. Defaults to all columns of the ab_data layout.
+
+    Returns
+    _______
+    int
+        Number of rows loaded.
+    """
+    try:
+        table_quoted = _quote(table)
+        user_quoted, group_quoted, page_quoted = (
+            _quote(col) for col in (user_col, group_col, page_col)
+        )
+        n_rows = 0
+        with closing(sqlite3.connect(database)) as connection:
+            for chunk in read_ab_data(
+                path=path_in, columns=columns, chunksize=chunksize
+            ):
+                chunk.to_sql(
+                    name=table, con=connection, if_exists="append", index=False
+                )
+                n_rows += len(chunk)
+            connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{table}_{user_col}')} "
+                f"ON {table_quoted} ({user_quoted}, {group_quoted}, {page_quoted})"
+            )
+            connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{table}_{group_col}')} "
+                f"ON {table_quoted} ({group_quoted}, {page_quoted})"
+            )
+            connection.commit()
+        return n_rows
+    except Exception:
+        raise
+
+
+def _summary_query(
+    table: str,
+    user_col: str,
+    group_col: str,
+    convert_col: str,
+    page_col: str,
+    group_pages: Sequence[Tuple[str, str]],
+    dedup: bool,
+) -> (str, list):
+    """
+    Builds the sql and parameters of summarise_conversions_sqlite(), which aggregates the counts of each group.
+    """
+    table_quoted = _quote(table)
+    user_quoted, group_quoted, convert_quoted, page_quoted = (
+        _quote(col) for col in (user_col, group_col, convert_col, page_col)
+    )
+
+    where, params = "", []
+    if group_pages is not None:
+        where = "WHERE " + " OR ".join(
+            f"({group_quoted} = ? AND {page_quoted} = ?)" for _ in group_pages
+        )
+        params = [value for pair in group_pages for value in pair]
+    if dedup:
+        # keep the last row of each user, which the indexes answer without reading the table
+        where = f"WHERE rowid IN (SELECT MAX(rowid) FROM {table_quoted} {where} GROUP BY {user_quoted})"
+
+    sql = (
+        f"SELECT {group_quoted} AS {group_quoted}, "
+        f"SUM({convert_quoted}) AS conversions, "
+        f"COUNT(*) AS total_users, "
+        f"COUNT(DISTINCT {page_quoted}) AS n_pages, "
+        f"MIN({page_quoted}) AS page "
+        f"FROM {table_quoted} {where} "
+        f"GROUP BY {group_quoted} ORDER BY {group_quoted}"
+    )
+    return sql, params
+
+
+def summarise_conversions_sqlite(
+    database: str,
+    table: str = "ab_data",
+    user_col: str = "user_id",
+    group_col: str = "group",
+    convert_col: str = "converted",
+    page_col: str = "landing_page",
+    group_pages: Sequence[Tuple[str, str]] = GROUP_PAGES,
+    dedup: bool = True,
+) -> pd.DataFrame:
+    """
+    Summarises conversions for every group inside a SQLite database, returning only the counts of each group.
+
+    This is the SQLite companion of summarise_conversions(). Rows where a group saw an unexpected landing page are
+    filtered out and the last row of each user is kept, as in clean_ab_data_chunked(), then the rows are aggregated
+    by group, all within the database. Memory in Python is therefore independent of the number of events.
+
+    Parameters
+    __________
+    database : str
+        String of the file path of the SQLite database.
+    table : str
+        String of the table of raw events, such as from load_ab_data_sqlite().
+    user_col : str
+        String of the column that identifies the user.
+    group_col : str
+        String of the grouping column that identifies whether conversion belongs to 'control' or 'treatment'.
+    convert_col: str
+        String of the column that identifies whether the user has converted or not.
+    page_col: str
+        String of the column that identifies the page seen by the user.
+    group_pages : Sequence[Tuple[str, str]]
+        Sequence of pairs of group and the landing page that group is expected to see. Use None to keep every row.
+    dedup : bool
+        Boolean of whether to keep only the last row of each user, by order of insertion.
+
+    Returns
+    _______
+    pd.DataFrame
+        Dataframe indexed by group with the same columns as summarise_conversions().
+
+    See Also
+    ________
+    summarise_conversions : Summarises conversions for every group in a single groupby pass over the data.
+
+    Examples
+    ________
+    >>> import os, tempfile
+    >>> df = pd.DataFrame(data={'user_id': [1, 2, 3, 1, 4],
+    ...                         'group': ['control', 'control', 'treatment', 'control', 'treatment'],
+    ...                         'landing_page': ['old_page', 'old_page', 'new_page', 'old_page', 'old_page'],
+    ...                         'converted': [0, 1, 0, 1, 1]})
+    >>> with tempfile.TemporaryDirectory() as tmp_dir:
+    ...     database = os.path.join(tmp_dir, 'ab_data.db')
+    ...     with closing(sqlite3.connect(database)) as connection:
+    ...         _ = df.to_sql(name='ab_data', con=connection, index=False)
+    ...     df_summary = summarise_conversions_sqlite(database=database)
+    >>> df_summary[['conversions', 'total_users', 'conversion_rate']]  # doctest: +NORMALIZE_WHITESPACE
+               conversions  total_users  conversion_rate
+    group
+    control              2            2              1.0
+    treatment            0            1              0.0
+    """
+    try:
+        sql, params = _summary_query(
+            table=table,
+            user_col=user_col,
+            group_col=group_col,
+            convert_col=convert_col,
+            page_col=page_col,
+            group_pages=group_pages,
+            dedup=dedup,
+        )
+        with closing(sqlite3.connect(database)) as connection:
+            df_summary = pd.read_sql(
+                sql=sql, con=connection, params=params, index_col=group_col
+            )
+
+        df_summary["conversion_rate"] = (
+            df_summary["conversions"] / df_summary["total_users"]
+        )
+        # expect only one page seen by each group
+        df_summary["unique_page"] = df_summary["n_pages"] == 1
+        df_summary["page"] = df_summary["page"].where(df_summary["unique_page"])
+        df_summary["percent_users"] = (
+            df_summary["total_users"] / df_summary["total_users"].sum()
+        ) * 100
+
+        return df_summary[
+            [
+                "conversions",
+                "total_users",
+                "conversion_rate",
+                "unique_page",
+                "page",
+                "percent_users",
+            ]
+        ]
+    except Exception:
+        raise
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
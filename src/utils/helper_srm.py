@@ -0,0 +1,130 @@
+from typing import Sequence
+import numpy as np
+import pandas as pd
+
+
+class SrmMonitor:
+    """
+    Sample ratio mismatch (SRM) check, a chi-square test of the observed split of users across groups against the
+    expected split, updated incrementally over chunks of users.
+
+    Only the count of users in each group is kept, so the monitor can run inside a chunked pipeline without another
+    pass over the data. The test is re-run after every chunk and the first chunk at which it is significant is
+    recorded. As the test is repeated, use a small significance level, such as the default of 0.001.
+
+    Parameters
+    __________
+    groups : Sequence[str]
+        Sequence of the values of the grouping column for each group.
+    expected_ratio : Sequence[float]
+        Sequence of the expected share of users in each group. Defaults to an even split.
+    group_col : str
+        String of the grouping column that identifies whether conversion belongs to 'control' or 'treatment'.
+    confidence_level : float
+        Float of the significance level at which a mismatch is flagged.
+
+    Examples
+    ________
+    >>> monitor = SrmMonitor()
+    >>> monitor.update(batch=pd.DataFrame(data={'group': ['control'] * 500 + ['treatment'] * 510}))
+    SrmMonitor(counts=[500, 510], p_value=0.753, flagged_at=None)
+    >>> monitor.update(batch=pd.DataFrame(data={'group': ['control'] * 500 + ['treatment'] * 700}))
+    Sample ratio mismatch detected after chunk 2 (p-value 7.9e-06).
+    SrmMonitor(counts=[1000, 1210], p_value=7.93e-06, flagged_at=2)
+    """
+
+    __slots__ = (
+        "groups",
+        "expected_ratio",
+        "group_col",
+        "confidence_level",
+        "counts",
+        "n_chunks",
+        "p_value",
+        "flagged_at",
+    )
+
+    def __init__(
+        self,
+        groups: Sequence[str] = ("control", "treatment"),
+        expected_ratio: Sequence[float] = None,
+        group_col: str = "group",
+        confidence_level: float = 0.001,
+    ):
+        self.groups = pd.Index(groups)
+        expected_ratio = (
+            np.ones(len(groups)) if expected_ratio is None else expected_ratio
+        )
+        self.expected_ratio = np.asarray(expected_ratio, dtype=float) / np.sum(
+            expected_ratio
+        )
+        self.group_col = group_col
+        self.confidence_level = confidence_level
+        self.counts = np.zeros(len(groups), dtype=np.int64)
+        self.n_chunks = 0
+        self.p_value = 1.0
+        self.flagged_at = None
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}("
+            f"counts={self.counts.tolist()}, p_value={self.p_value:.4g}, flagged_at={self.flagged_at})"
+        )
+
+    @property
+    def flagged(self) -> bool:
+        return self.flagged_at is not None
+
+    def update(self, batch: pd.DataFrame) -> "SrmMonitor":
+        """
+        Adds a chunk of users, with one row per user, to the counts and re-runs the test.
+
+        Parameters
+        __________
+        batch : pd.DataFrame
+            Dataframe of the new users. Rows that belong to none of the groups are ignored.
+
+        Returns
+        _______
+        SrmMonitor
+            The updated monitor.
+        """
+        try:
+            codes = self.groups.get_indexer(batch[self.group_col])
+            return self.update_counts(
+                counts=np.bincount(codes[codes >= 0], minlength=len(self.groups))
+            )
+        except Exception:
+            raise
+
+    def update_counts(self, counts: Sequence[int]) -> "SrmMonitor":
+        """
+        Adds the number of new users in each group to the counts and re-runs the test.
+        """
+        import scipy.stats as st
+
+        try:
+            self.counts += np.asarray(counts, dtype=np.int64)
+            self.n_chunks += 1
+
+            total = self.counts.sum()
+            if total > 0:
+                expected = total * self.expected_ratio
+                statistic = np.sum((self.counts - expected) ** 2 / expected)
+                self.p_value = float(st.chi2.sf(statistic, df=len(self.groups) - 1))
+
+            if not self.flagged and self.p_value < self.confidence_level:
+                self.flagged_at = self.n_chunks
+                print(
+                    f"Sample ratio mismatch detected after chunk {self.n_chunks}",
+                    f"(p-value {self.p_value:.2g}).",
+                )
+            return self
+        except Exception:
+            raise
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
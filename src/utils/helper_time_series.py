@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+from src.utils.helper_ab_test import get_ab_test_ci_batch
+
+
+def get_cumulative_conversions(
+    data: pd.DataFrame,
+    freq: str = "D",
+    timestamp_col: str = "timestamp",
+    group_col: str = "group",
+    convert_col: str = "converted",
+    control: str = "control",
+    treatment: str = "treatment",
+    confidence_level: float = 0.05,
+) -> pd.DataFrame:
+    """
+    Calculates the cumulative conversion rates of each group, and the C.I. of the lift of treatment over control, at
+    the end of every period over the life of the experiment.
+
+    Rather than re-running the A/B test on the data truncated at each period, the rows are counted per period and
+    group in a single bincount over the sorted periods, and the counts are accumulated with prefix sums. The C.I.s of
+    every period then come from one get_ab_test_ci_batch() call, so the whole trajectory costs one pass over the
+    data.
+
+    Parameters
+    __________
+    data : pd.DataFrame
+        Dataframe of the users, with one row per user.
+    freq : str
+        String of the length of the periods, as a pandas offset alias such as 'D' for days or 'h' for hours.
+    timestamp_col : str
+        String of the column of the time the user entered the experiment.
+    group_col : str
+        String of the grouping column that identifies whether conversion belongs to 'control' or 'treatment'.
+    convert_col: str
+        String of the column that identifies whether the user has converted or not.
+    control : str
+        String of the value of the grouping column for the control group.
+    treatment : str
+        String of the value of the grouping column for the treatment group.
+    confidence_level : float
+        Float of the significance level of the C.I.s.
+
+    Returns
+    _______
+    pd.DataFrame
+        Dataframe indexed by the start of each period, of the cumulative counts and conversion rates of each group,
+        lift, lower_bound and upper_bound. Periods before both groups have users are dropped.
+
+    See Also
+    ________
+    get_ab_test_ci_batch : Vectorised version of get_ab_test_ci() over arrays of experiments.
+
+    Examples
+    ________
+    >>> df = pd.DataFrame(data={'timestamp': ['2017-01-02 10:00', '2017-01-02 12:00', '2017-01-03 09:00',
+    ...                                       '2017-01-03 18:00', '2017-01-04 08:00', '2017-01-04 11:00'],
+    ...                         'group': ['control', 'treatment', 'control', 'treatment', 'control', 'treatment'],
+    ...                         'converted': [0, 1, 1, 1, 0, 0]})
+    >>> get_cumulative_conversions(data=df)[['total_users_control', 'conversion_rate_control', 'lift']]
+    ... # doctest: +NORMALIZE_WHITESPACE
+                total_users_control  conversion_rate_control      lift
+    timestamp
+    2017-01-02                    1                 0.000000  1.000000
+    2017-01-03                    2                 0.500000  0.500000
+    2017-01-04                    3                 0.333333  0.333333
+    """
+    try:
+        arm = pd.Index([control, treatment]).get_indexer(data[group_col])
+        mask = arm >= 0
+        period = pd.to_datetime(data[timestamp_col]).dt.floor(freq)[mask]
+        codes, periods = pd.factorize(period, sort=True)
+        bins = codes * 2 + arm[mask]
+
+        # counts of each period and group, accumulated over the periods
+        total_users = np.bincount(bins, minlength=2 * len(periods)).reshape(-1, 2)
+        conversions = np.bincount(
+            bins,
+            weights=data[convert_col].to_numpy(dtype=float)[mask],
+            minlength=2 * len(periods),
+        ).reshape(-1, 2)
+        total_users = np.cumsum(total_users, axis=0)
+        conversions = np.cumsum(conversions, axis=0).round().astype(np.int64)
+
+        started = (total_users > 0).all(axis=1)
+        df_curve = pd.DataFrame(
+            data={
+                f"{col}_{suffix}": values[started, i]
+                for i, suffix in enumerate(("control", "treatment"))
+                for col, values in (
+                    ("total_users", total_users),
+                    ("conversions", conversions),
+                    ("conversion_rate", conversions / np.maximum(total_users, 1)),
+                )
+            },
+            index=pd.DatetimeIndex(periods[started], name=timestamp_col),
+        )
+
+        df_curve["lift"] = (
+            df_curve["conversion_rate_treatment"] - df_curve["conversion_rate_control"]
+        )
+        df_curve["lower_bound"], df_curve["upper_bound"] = get_ab_test_ci_batch(
+            conversions_control=df_curve["conversions_control"].to_numpy(),
+            conversions_treatment=df_curve["conversions_treatment"].to_numpy(),
+            total_users_control=df_curve["total_users_control"].to_numpy(),
+            total_users_treatment=df_curve["total_users_treatment"].to_numpy(),
+            confidence_level=confidence_level,
+        )
+        return df_curve
+    except Exception:
+        raise
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
@@ -0,0 +1,302 @@
+from typing import Iterable, NamedTuple, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from src.utils.helper_schema import AB_DATA_CATEGORIES, GROUP_PAGES
+
+
+def _codes(values: pd.Series, categories: pd.Index) -> np.ndarray:
+    """
+    Returns the position of each value in categories, or -1 if it is missing, looking up only the categories of
+    categorical values rather than every value.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        lookup = np.append(categories.get_indexer(values.cat.categories), -1)
+        return lookup[values.cat.codes.to_numpy()]
+    return categories.get_indexer(values)
+
+
+class ValidationReport(NamedTuple):
+    """
+    Data-quality report of the consistency of groups and landing pages.
+
+    Attributes
+    __________
+    crosstab : pd.DataFrame
+        Dataframe of the number of rows of each group (index) and landing page (columns).
+    n_rows : int
+        Number of rows validated.
+    n_invalid : int
+        Number of rows with a missing group or landing page.
+    n_mismatched : int
+        Number of rows where a group saw a landing page other than the one it is expected to see.
+    mismatch_examples : list
+        List of up to max_examples of the users of mismatched rows.
+    n_users_both_arms : int
+        Number of users with rows in more than one group.
+    both_arms_examples : list
+        List of up to max_examples of the users with rows in more than one group.
+    """
+
+    crosstab: pd.DataFrame
+    n_rows: int
+    n_invalid: int
+    n_mismatched: int
+    mismatch_examples: list
+    n_users_both_arms: int
+    both_arms_examples: list
+
+
+class DataValidator:
+    """
+    Validates the consistency of groups and landing pages over chunks of raw events, in one pass.
+
+    Groups and pages are converted to categorical codes, so the crosstab of each chunk is a single bincount. Labels
+    outside of group_pages, such as extra arms, are added to the crosstab as they are seen. The
+    smallest and largest group code of each user are kept to find users appearing in more than one arm, compacting
+    them as they grow so memory follows the number of distinct users rather than rows.
+
+    Parameters
+    __________
+    user_col : str
+        String of the column that identifies the user.
+    group_col : str
+        String of the grouping column that identifies whether conversion belongs to 'control' or 'treatment'.
+    page_col: str
+        String of the column that identifies the page seen by the user.
+    group_pages : Sequence[Tuple[str, str]]
+        Sequence of pairs of group and the landing page that group is expected to see.
+    max_examples : int
+        Largest number of example users to report for each issue.
+
+    Examples
+    ________
+    >>> df = pd.DataFrame(data={'user_id': [1, 2, 3, 4, 2],
+    ...                         'group': ['control', 'control', 'treatment', 'treatment', 'treatment'],
+    ...                         'landing_page': ['old_page', 'new_page', 'new_page', 'old_page', 'new_page']})
+    >>> report = DataValidator().update(batch=df).report()
+    >>> report.crosstab  # doctest: +NORMALIZE_WHITESPACE
+               old_page  new_page
+    control           1         1
+    treatment         1         2
+    >>> report.n_mismatched, report.mismatch_examples, report.n_users_both_arms, report.both_arms_examples
+    (2, [2, 4], 1, [2])
+    """
+
+    __slots__ = (
+        "user_col",
+        "group_col",
+        "page_col",
+        "max_examples",
+        "groups",
+        "pages",
+        "expected",
+        "counts",
+        "n_rows",
+        "n_invalid",
+        "n_mismatched",
+        "mismatch_examples",
+        "arms",
+        "n_arms",
+        "n_compacted",
+    )
+
+    def __init__(
+        self,
+        user_col: str = "user_id",
+        group_col: str = "group",
+        page_col: str = "landing_page",
+        group_pages: Sequence[Tuple[str, str]] = GROUP_PAGES,
+        max_examples: int = 5,
+    ):
+        self.user_col = user_col
+        self.group_col = group_col
+        self.page_col = page_col
+        self.max_examples = max_examples
+        self.groups = pd.Index([group for group, _ in group_pages]).union(
+            AB_DATA_CATEGORIES.get(group_col, []),
+            sort=False,
+        )
+        self.pages = pd.Index([page for _, page in group_pages]).union(
+            AB_DATA_CATEGORIES.get(page_col, []),
+            sort=False,
+        )
+        self.expected = np.zeros(shape=(len(self.groups), len(self.pages)), dtype=bool)
+        for group, page in group_pages:
+            self.expected[self.groups.get_loc(group), self.pages.get_loc(page)] = True
+        self.counts = np.zeros(shape=self.expected.shape, dtype=np.int64)
+        self.n_rows = 0
+        self.n_invalid = 0
+        self.n_mismatched = 0
+        self.mismatch_examples = []
+        self.arms = []
+        self.n_arms = 0
+        self.n_compacted = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}("
+            f"n_rows={self.n_rows}, n_invalid={self.n_invalid}, n_mismatched={self.n_mismatched})"
+        )
+
+    def update(self, batch: pd.DataFrame) -> "DataValidator":
+        """
+        Adds a chunk of raw events to the report.
+
+        Parameters
+        __________
+        batch : pd.DataFrame
+            Dataframe of the new events.
+
+        Returns
+        _______
+        DataValidator
+            The updated validator.
+        """
+        try:
+            self._extend(values=batch[self.group_col], axis=0)
+            self._extend(values=batch[self.page_col], axis=1)
+            group = _codes(values=batch[self.group_col], categories=self.groups)
+            page = _codes(values=batch[self.page_col], categories=self.pages)
+            valid = (group >= 0) & (page >= 0)
+            users = batch[self.user_col].to_numpy()
+
+            self.counts += np.bincount(
+                group[valid] * len(self.pages) + page[valid], minlength=self.counts.size
+            ).reshape(self.counts.shape)
+            mismatch = valid & ~self.expected[group, page]
+            self.n_rows += len(batch)
+            self.n_invalid += int((~valid).sum())
+            self.n_mismatched += int(mismatch.sum())
+            if len(self.mismatch_examples) < self.max_examples:
+                self.mismatch_examples += users[mismatch][
+                    : self.max_examples - len(self.mismatch_examples)
+                ].tolist()
+
+            self.arms.append(
+                pd.DataFrame(
+                    data={"min": group[valid], "max": group[valid]},
+                    index=users[valid],
+                )
+                .groupby(level=0)
+                .agg({"min": "min", "max": "max"})
+            )
+            self.n_arms += len(self.arms[-1])
+            # compact once the users have doubled, so memory follows distinct users rather than rows
+            if self.n_arms > 2 * max(self.n_compacted, len(batch)):
+                self._compact()
+            return self
+        except Exception:
+            raise
+
+    def _extend(self, values: pd.Series, axis: int):
+        """
+        Adds labels not seen before, such as extra arms, to the groups (axis 0) or pages (axis 1) of the crosstab.
+        """
+        labels = (
+            values.cat.categories
+            if isinstance(values.dtype, pd.CategoricalDtype)
+            else pd.Index(pd.unique(values.dropna()))
+        )
+        current = self.groups if axis == 0 else self.pages
+        new = labels.difference(current, sort=False)
+        if len(new) == 0:
+            return
+        if axis == 0:
+            self.groups = current.append(new)
+        else:
+            self.pages = current.append(new)
+        pad = [(0, 0), (0, 0)]
+        pad[axis] = (0, len(new))
+        # rows already counted are unaffected, as their codes only index the existing labels
+        self.counts = np.pad(self.counts, pad_width=pad)
+        self.expected = np.pad(self.expected, pad_width=pad)
+
+    def _compact(self):
+        arms = pd.concat(objs=self.arms)
+        self.arms = [arms.groupby(level=0).agg({"min": "min", "max": "max"})]
+        self.n_arms = self.n_compacted = len(self.arms[0])
+
+    def report(self) -> ValidationReport:
+        """
+        Returns the report of the events validated so far.
+        """
+        try:
+            if self.arms:
+                self._compact()
+                arms = self.arms[0]
+                both_arms = arms.index[(arms["min"] != arms["max"]).to_numpy()]
+            else:
+                both_arms = pd.Index([])
+
+            return ValidationReport(
+                crosstab=pd.DataFrame(
+                    data=self.counts, index=self.groups, columns=self.pages
+                ),
+                n_rows=self.n_rows,
+                n_invalid=self.n_invalid,
+                n_mismatched=self.n_mismatched,
+                mismatch_examples=list(self.mismatch_examples),
+                n_users_both_arms=len(both_arms),
+                both_arms_examples=both_arms[: self.max_examples].tolist(),
+            )
+        except Exception:
+            raise
+
+
+def validate_ab_data(
+    data: Union[pd.DataFrame, Iterable[pd.DataFrame]], **kwargs
+) -> ValidationReport:
+    """
+    Validates the consistency of groups and landing pages of raw events, which can be passed in chunks.
+
+    Parameters
+    __________
+    data : Union[pd.DataFrame, Iterable[pd.DataFrame]]
+        Dataframe of the raw events, or an iterable of chunks of them such as from read_ab_data(chunksize=...).
+    **kwargs
+        These parameters will be passed to DataValidator().
+
+    Returns
+    _______
+    ValidationReport
+        Named tuple of the crosstab of groups and pages, mismatched rows and users in more than one group.
+
+    See Also
+    ________
+    DataValidator : Validates the consistency of groups and landing pages over chunks of raw events.
+    """
+    try:
+        validator = DataValidator(**kwargs)
+        for chunk in [data] if isinstance(data, pd.DataFrame) else data:
+            validator.update(batch=chunk)
+        return validator.report()
+    except Exception:
+        raise
+
+
+def report_validation(report: ValidationReport):
+    """
+    Prints a data-quality report of the consistency of groups and landing pages.
+
+    Parameters
+    __________
+    report : ValidationReport
+        Report from DataValidator.report() or validate_ab_data().
+    """
+    print(report.crosstab)
+    print(
+        f"{report.n_mismatched} of {report.n_rows} rows saw an unexpected landing page,",
+        f"e.g. users {report.mismatch_examples}.",
+    )
+    print(
+        f"{report.n_users_both_arms} users appear in more than one group,",
+        f"e.g. users {report.both_arms_examples}.",
+    )
+    if report.n_invalid:
+        print(f"{report.n_invalid} rows have a missing group or landing page.")
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+
+    testmod(verbose=True)
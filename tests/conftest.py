@@ -4,6 +4,19 @@ import pandas as pd
 
 pytest_plugins = [
     "tests.fixtures.fixture_helper_ab_test",
+    "tests.fixtures.fixture_helper_bayesian",
+    "tests.fixtures.fixture_helper_accumulator",
+    "tests.fixtures.fixture_helper_bootstrap",
+    "tests.fixtures.fixture_helper_cuped",
+    "tests.fixtures.fixture_helper_data_wrangle",
+    "tests.fixtures.fixture_helper_multi_arm",
+    "tests.fixtures.fixture_helper_multiple_testing",
+    "tests.fixtures.fixture_helper_permutation",
+    "tests.fixtures.fixture_helper_sample_size_table",
+    "tests.fixtures.fixture_helper_segment_cube",
+    "tests.fixtures.fixture_helper_sqlite",
+    "tests.fixtures.fixture_helper_srm",
+    "tests.fixtures.fixture_helper_time_series",
 ]
 
 
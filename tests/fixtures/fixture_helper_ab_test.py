@@ -1,4 +1,5 @@
 import pytest
+import pandas as pd
 
 
 @pytest.fixture()
@@ -18,6 +19,16 @@ def out_sample_size():
     return 17210.118424055283
 
 
+@pytest.fixture()
+def in_sample_size_grid():
+    return {
+        "baseline_rate": [0.01, 0.1204, 0.5],
+        "practical_significance": [-0.005, 0.01, 0.05],
+        "confidence_level": [0.01, 0.05],
+        "sensitivity": [0.8, 0.9],
+    }
+
+
 @pytest.fixture()
 def in_ab_test_ci():
     return {
@@ -30,4 +41,32 @@ def in_ab_test_ci():
 
 @pytest.fixture()
 def out_ab_test_ci():
-    return 0.0092, 0.0145
+    return 0.0059, 0.0127
+
+
+@pytest.fixture()
+def in_ab_test_ci_batch():
+    return pd.DataFrame(
+        data={
+            "treatment_conv": [5648, 120, 120],
+            "control_conv": [5329, 100, 100],
+            "treatment_size": [56350, 1000, 1000],
+            "control_size": [58583, 1000, 1000],
+            "confidence_level": [0.05, 0.05, 0.01],
+        }
+    )
+
+
+@pytest.fixture()
+def out_summarise_conversions():
+    return pd.DataFrame(
+        data={
+            "conversions": [1, 1],
+            "total_users": [3, 2],
+            "conversion_rate": [0.3333333333333333, 0.5],
+            "unique_page": [True, True],
+            "page": ["old_page", "new_page"],
+            "percent_users": [60.0, 40.0],
+        },
+        index=pd.Index(data=["control", "treatment"], name="group"),
+    )
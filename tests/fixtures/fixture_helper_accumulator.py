@@ -0,0 +1,32 @@
+import pytest
+import pandas as pd
+
+
+@pytest.fixture()
+def df_ab_test_batches():
+    return [
+        pd.DataFrame(
+            data={
+                "user_id": [1, 2, 3],
+                "group": ["control", "treatment", "treatment"],
+                "converted": [1, 0, 1],
+            }
+        ),
+        pd.DataFrame(
+            data={
+                "user_id": [4, 5, 6, 7],
+                "group": ["control", "control", "treatment", "control"],
+                "converted": [0, 0, 1, 1],
+            }
+        ),
+    ]
+
+
+@pytest.fixture()
+def out_accumulator_counts():
+    return {
+        "conversions_control": 2,
+        "conversions_treatment": 2,
+        "total_users_control": 4,
+        "total_users_treatment": 3,
+    }
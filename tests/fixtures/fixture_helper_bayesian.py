@@ -0,0 +1,19 @@
+import pytest
+
+
+@pytest.fixture()
+def in_bayesian_counts():
+    return {
+        "conversions_control": 30,
+        "conversions_treatment": 41,
+        "total_users_control": 300,
+        "total_users_treatment": 320,
+    }
+
+
+@pytest.fixture()
+def out_bayesian_counts():
+    return {
+        "prob_treatment_better": 0.8620059871229269,
+        "expected_loss_treatment": 0.0018081099465194876,
+    }
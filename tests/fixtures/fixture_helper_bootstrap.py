@@ -0,0 +1,11 @@
+import pytest
+import numpy as np
+
+
+@pytest.fixture()
+def in_user_level_values():
+    rng = np.random.default_rng(seed=2021)
+    return {
+        "values_control": rng.binomial(n=1, p=0.10, size=3000).astype(float),
+        "values_treatment": rng.binomial(n=1, p=0.12, size=2000).astype(float),
+    }
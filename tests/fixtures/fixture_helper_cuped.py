@@ -0,0 +1,21 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+
+@pytest.fixture()
+def df_cuped_data():
+    rng = np.random.default_rng(seed=2021)
+    n_rows = 20_000
+    prior_converted = rng.binomial(n=1, p=0.3, size=n_rows)
+    group = rng.choice(["control", "treatment"], size=n_rows)
+    converted = rng.binomial(
+        n=1, p=0.05 + 0.4 * prior_converted + 0.02 * (group == "treatment")
+    )
+    return pd.DataFrame(
+        data={
+            "group": group,
+            "converted": converted,
+            "prior_converted": prior_converted,
+        }
+    )
@@ -0,0 +1,72 @@
+import pytest
+import pandas as pd
+
+
+@pytest.fixture()
+def df_raw_ab_data():
+    return pd.DataFrame(
+        data={
+            "user_id": [1, 2, 3, 1, 4, 5, 2, 6, 7, 3, 8],
+            "timestamp": [
+                "2017-01-21 22:11:48.556739",
+                "2017-01-12 08:01:45.159739",
+                "2017-01-11 16:55:06.154213",
+                "2017-01-08 18:28:03.143765",
+                "2017-01-21 01:52:26.210827",
+                "2017-01-10 15:20:49.083499",
+                "2017-01-19 03:26:46.940749",
+                "2017-01-05 04:20:30.236452",
+                "2017-01-02 14:11:28.712421",
+                "2017-01-14 05:41:07.118402",
+                "2017-01-22 11:45:11.327945",
+            ],
+            "group": [
+                "control",
+                "control",
+                "treatment",
+                "control",
+                "treatment",
+                "treatment",
+                "control",
+                "control",
+                "treatment",
+                "treatment",
+                "control",
+            ],
+            "landing_page": [
+                "old_page",
+                "old_page",
+                "new_page",
+                "old_page",
+                "old_page",
+                "new_page",
+                "old_page",
+                "new_page",
+                "new_page",
+                "new_page",
+                "old_page",
+            ],
+            "converted": [0, 0, 1, 1, 0, 0, 1, 1, 0, 0, 1],
+        }
+    )
+
+
+@pytest.fixture()
+def df_clean_ab_data(df_raw_ab_data):
+    mask_control_old = (df_raw_ab_data["group"] == "control") & (
+        df_raw_ab_data["landing_page"] == "old_page"
+    )
+    mask_treatment_new = (df_raw_ab_data["group"] == "treatment") & (
+        df_raw_ab_data["landing_page"] == "new_page"
+    )
+    df_clean = df_raw_ab_data.loc[mask_control_old | mask_treatment_new]
+    return df_clean.drop_duplicates(subset="user_id", keep="last").reset_index(
+        drop=True
+    )
+
+
+@pytest.fixture()
+def path_raw_ab_data(df_raw_ab_data, tmp_path):
+    path = tmp_path / "ab_data.csv"
+    df_raw_ab_data.to_csv(path_or_buf=path, index=False)
+    return path
@@ -0,0 +1,20 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+
+@pytest.fixture()
+def in_multi_arm_summary():
+    rng = np.random.default_rng(seed=2021)
+    total_users = rng.integers(low=5_000, high=20_000, size=20)
+    return pd.DataFrame(
+        data={
+            "conversions": rng.binomial(
+                n=total_users, p=rng.uniform(0.08, 0.14, size=20)
+            ),
+            "total_users": total_users,
+        },
+        index=pd.Index(
+            ["control"] + [f"variant_{i}" for i in range(1, 20)], name="group"
+        ),
+    )
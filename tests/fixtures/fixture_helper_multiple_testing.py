@@ -0,0 +1,7 @@
+import pytest
+import numpy as np
+
+
+@pytest.fixture()
+def in_p_values():
+    return np.random.default_rng(seed=2021).uniform(size=100_000) ** 4
@@ -0,0 +1,11 @@
+import pytest
+
+
+@pytest.fixture()
+def in_permutation_counts():
+    return {
+        "conversions_control": 100,
+        "conversions_treatment": 120,
+        "total_users_control": 1000,
+        "total_users_treatment": 1000,
+    }
@@ -0,0 +1,20 @@
+import pytest
+import numpy as np
+
+
+@pytest.fixture()
+def in_sample_size_table():
+    return {
+        "baseline_rate": np.linspace(start=0.05, stop=0.2, num=61),
+        "practical_significance": np.linspace(start=0.005, stop=0.05, num=91),
+        "settings": [(0.05, 0.8), (0.01, 0.9)],
+    }
+
+
+@pytest.fixture()
+def in_sample_size_queries():
+    rng = np.random.default_rng(seed=2021)
+    return {
+        "baseline_rate": rng.uniform(low=0.05, high=0.2, size=1000),
+        "practical_significance": rng.uniform(low=0.005, high=0.05, size=1000),
+    }
@@ -0,0 +1,21 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+
+@pytest.fixture()
+def df_segment_data():
+    rng = np.random.default_rng(seed=2021)
+    n_rows = 2000
+    return pd.DataFrame(
+        data={
+            "timestamp": pd.Timestamp("2017-01-02")
+            + pd.to_timedelta(
+                rng.integers(low=0, high=5 * 86_400, size=n_rows), unit="s"
+            ),
+            "group": rng.choice(["control", "treatment"], size=n_rows),
+            "country": rng.choice(["UK", "US", "CA"], size=n_rows),
+            "device": rng.choice(["mobile", "desktop"], size=n_rows, p=[0.9, 0.1]),
+            "converted": rng.binomial(n=1, p=0.12, size=n_rows),
+        }
+    )
@@ -0,0 +1,12 @@
+import pytest
+import src.utils.helper_sqlite as q
+
+
+@pytest.fixture()
+def path_sqlite_ab_data(path_raw_ab_data, tmp_path):
+    database = tmp_path / "ab_data.db"
+    assert (
+        q.load_ab_data_sqlite(path_in=path_raw_ab_data, database=database, chunksize=4)
+        == 11
+    )
+    return database
@@ -0,0 +1,18 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+
+@pytest.fixture()
+def df_srm_batches():
+    rng = np.random.default_rng(seed=2021)
+    return [
+        pd.DataFrame(
+            data={
+                "group": pd.Categorical(
+                    rng.choice(["control", "treatment"], size=1000, p=[1 / 3, 2 / 3])
+                )
+            }
+        )
+        for _ in range(5)
+    ]
@@ -0,0 +1,19 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+
+@pytest.fixture()
+def df_time_series_data():
+    rng = np.random.default_rng(seed=2021)
+    n_users = 5_000
+    group = rng.choice(["control", "treatment"], size=n_users)
+    return pd.DataFrame(
+        data={
+            "user_id": np.arange(n_users),
+            "timestamp": pd.Timestamp("2017-01-02")
+            + pd.to_timedelta(rng.uniform(0, 7 * 24 * 3600, size=n_users), unit="s"),
+            "group": pd.Categorical(group, categories=["control", "treatment"]),
+            "converted": rng.binomial(n=1, p=np.where(group == "control", 0.1, 0.12)),
+        }
+    )
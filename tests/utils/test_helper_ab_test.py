@@ -1,3 +1,11 @@
+import json
+import pathlib
+import subprocess
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+import statsmodels.stats.api as sms
 import src.utils.helper_ab_test as f
 
 
@@ -14,8 +22,71 @@ def test_report_conversions(df_ab_test, out_report_conversions):
     )
 
 
+def test_summarise_conversions(df_ab_test, out_summarise_conversions):
+    pd.testing.assert_frame_equal(
+        f.summarise_conversions(
+            data=df_ab_test,
+            group_col="group",
+            convert_col="converted",
+            page_col="landing_page",
+        ),
+        out_summarise_conversions,
+        check_dtype=False,
+    )
+
+
 def test_get_sample_size(baseline_rate, out_sample_size):
-    assert f.get_sample_size(baseline_rate=baseline_rate) == out_sample_size
+    assert f.get_sample_size(baseline_rate=baseline_rate) == pytest.approx(
+        out_sample_size, rel=1e-6
+    )
+
+
+@pytest.mark.parametrize(
+    "confidence_level, sensitivity",
+    [(0.001, 0.99), (0.05, 0.8), (0.2, 0.3), (0.5, 0.6), (0.9, 0.95)],
+)
+def test_get_sample_sizes_unconventional_settings(confidence_level, sensitivity):
+    # far from the conventional settings, the opposite rejection region takes more than two newton steps
+    expected = sms.NormalIndPower().solve_power(
+        effect_size=sms.proportion_effectsize(prop1=0.12, prop2=0.13),
+        power=sensitivity,
+        alpha=confidence_level,
+        ratio=1,
+    )
+    assert f.get_sample_sizes(
+        baseline_rate=0.12,
+        practical_significance=0.01,
+        confidence_level=confidence_level,
+        sensitivity=sensitivity,
+    ) == pytest.approx(expected, rel=1e-6)
+
+
+def test_get_sample_size_grid(in_sample_size_grid):
+    df_grid = f.get_sample_size_grid(**in_sample_size_grid)
+    expected = [
+        sms.NormalIndPower().solve_power(
+            effect_size=sms.proportion_effectsize(
+                prop1=row.baseline_rate,
+                prop2=row.baseline_rate + row.practical_significance,
+            ),
+            power=row.sensitivity,
+            alpha=row.confidence_level,
+            ratio=1,
+        )
+        for row in df_grid.itertuples()
+    ]
+
+    assert len(df_grid) == 36
+    np.testing.assert_allclose(df_grid["sample_size"], expected, rtol=1e-6)
+
+
+def test_check_sample_sizes(capsys):
+    f.check_sample_sizes(
+        total_users_control=20000, total_users_treatment=10000, baseline_rate=0.1204
+    )
+    assert capsys.readouterr().out.splitlines()[1] == (
+        "Treatment group not sufficiently large to conduct hypothesis testing."
+    )
 
 
 def test_get_ab_test_ci(in_ab_test_ci, out_ab_test_ci):
@@ -26,7 +97,127 @@ def test_get_ab_test_ci(in_ab_test_ci, out_ab_test_ci):
         total_users_treatment=in_ab_test_ci["treatment_size"],
     )
     lower_bound, upper_bound = round(number=lower_bound, ndigits=4), round(
-        number=upper_bound, ndigits=2
+        number=upper_bound, ndigits=4
+    )
+
+    assert (lower_bound, upper_bound) == out_ab_test_ci
+
+
+def test_get_ab_test_ci_batch(in_ab_test_ci_batch):
+    lower_bound, upper_bound = f.get_ab_test_ci_batch(
+        conversions_control=in_ab_test_ci_batch["control_conv"],
+        conversions_treatment=in_ab_test_ci_batch["treatment_conv"],
+        total_users_control=in_ab_test_ci_batch["control_size"],
+        total_users_treatment=in_ab_test_ci_batch["treatment_size"],
+        confidence_level=in_ab_test_ci_batch["confidence_level"],
+    )
+    expected = [
+        f.get_ab_test_ci(
+            conversions_control=row.control_conv,
+            conversions_treatment=row.treatment_conv,
+            total_users_control=row.control_size,
+            total_users_treatment=row.treatment_size,
+            confidence_level=row.confidence_level,
+        )
+        for row in in_ab_test_ci_batch.itertuples()
+    ]
+
+    np.testing.assert_allclose(lower_bound, [bound[0] for bound in expected])
+    np.testing.assert_allclose(upper_bound, [bound[1] for bound in expected])
+
+
+def test_import_is_lazy():
+    script = """
+import json, sys
+import src.utils.helper_ab_test as f
+loaded = [module for module in ("scipy", "statsmodels", "doctest") if module in sys.modules]
+f.get_ab_test_ci(1, 2, 10, 10)
+print(json.dumps({"loaded": loaded, "scipy": "scipy.stats" in sys.modules}))
+"""
+    result = json.loads(
+        subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=pathlib.Path(__file__).parents[2],
+        ).stdout
     )
 
-    assert lower_bound, upper_bound == out_ab_test_ci
+    assert result["loaded"] == []
+    assert result["scipy"]
+
+
+def test_get_ab_test_ci_from_moments(in_ab_test_ci_batch):
+    conversion_rate_control = (
+        in_ab_test_ci_batch["control_conv"] / in_ab_test_ci_batch["control_size"]
+    )
+    conversion_rate_treatment = (
+        in_ab_test_ci_batch["treatment_conv"] / in_ab_test_ci_batch["treatment_size"]
+    )
+    lower_bound, upper_bound = f.get_ab_test_ci_from_moments(
+        mean_control=conversion_rate_control,
+        mean_treatment=conversion_rate_treatment,
+        variance_control=conversion_rate_control * (1 - conversion_rate_control),
+        variance_treatment=conversion_rate_treatment * (1 - conversion_rate_treatment),
+        total_users_control=in_ab_test_ci_batch["control_size"],
+        total_users_treatment=in_ab_test_ci_batch["treatment_size"],
+    )
+    expected_lower_bound, expected_upper_bound = f.get_ab_test_ci_batch(
+        conversions_control=in_ab_test_ci_batch["control_conv"],
+        conversions_treatment=in_ab_test_ci_batch["treatment_conv"],
+        total_users_control=in_ab_test_ci_batch["control_size"],
+        total_users_treatment=in_ab_test_ci_batch["treatment_size"],
+    )
+
+    np.testing.assert_allclose(lower_bound, expected_lower_bound)
+    np.testing.assert_allclose(upper_bound, expected_upper_bound)
+
+
+def test_get_power_curve(in_sample_size_grid):
+    df_curve = f.get_power_curve(
+        baseline_rate=in_sample_size_grid["baseline_rate"],
+        practical_significance=in_sample_size_grid["practical_significance"],
+        sample_size=[1_000, 10_000, 100_000],
+        confidence_level=in_sample_size_grid["confidence_level"],
+    )
+    expected = [
+        sms.NormalIndPower().power(
+            effect_size=sms.proportion_effectsize(
+                prop1=row.baseline_rate,
+                prop2=row.baseline_rate + row.practical_significance,
+            ),
+            nobs1=row.sample_size,
+            alpha=row.confidence_level,
+            ratio=1,
+        )
+        for row in df_curve.itertuples()
+    ]
+
+    assert len(df_curve) == 54
+    np.testing.assert_allclose(df_curve["sensitivity"], expected, rtol=1e-10)
+
+
+@pytest.mark.parametrize("increase", [True, False])
+def test_get_mdes(in_sample_size_grid, increase):
+    baseline_rate = np.array(in_sample_size_grid["baseline_rate"])[:, np.newaxis]
+    sample_size = np.array([100, 10_000, 100_000])
+    mde = f.get_mdes(
+        baseline_rate=baseline_rate,
+        sample_size=sample_size,
+        sensitivity=0.9,
+        increase=increase,
+    )
+
+    # rates of 0.01 cannot fall far enough to be detected by 100 users
+    assert np.isnan(mde).sum() == (0 if increase else 1)
+    assert (np.sign(mde[~np.isnan(mde)]) == (1 if increase else -1)).all()
+    np.testing.assert_allclose(
+        f.get_powers(
+            baseline_rate=baseline_rate,
+            practical_significance=mde,
+            sample_size=sample_size,
+        )[~np.isnan(mde)],
+        0.9,
+        rtol=1e-8,
+    )
@@ -0,0 +1,80 @@
+import pytest
+import pandas as pd
+import src.utils.helper_ab_test as f
+from src.utils.helper_accumulator import ConversionAccumulator
+
+
+def test_update(df_ab_test_batches, out_accumulator_counts):
+    accumulator = ConversionAccumulator()
+    for batch in df_ab_test_batches:
+        accumulator.update(batch=batch)
+
+    assert accumulator.counts() == out_accumulator_counts
+
+
+def test_merge(df_ab_test_batches, out_accumulator_counts):
+    accumulators = [
+        ConversionAccumulator().update(batch=batch) for batch in df_ab_test_batches
+    ]
+    assert (
+        accumulators[0].merge(other=accumulators[1]).counts() == out_accumulator_counts
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"group_col": "arm"},
+        {"convert_col": "clicked"},
+        {"control": "a"},
+        {"treatment": "b"},
+    ],
+)
+def test_merge_mismatch(df_ab_test_batches, kwargs):
+    accumulator = ConversionAccumulator().update(batch=df_ab_test_batches[0])
+    with pytest.raises(ValueError):
+        accumulator.merge(other=ConversionAccumulator(**kwargs))
+
+
+def test_update_matches_full_history(df_ab_test_batches):
+    accumulator = ConversionAccumulator().update(
+        batch=pd.concat(objs=df_ab_test_batches)
+    )
+    merged = ConversionAccumulator()
+    for batch in df_ab_test_batches:
+        merged.merge(other=ConversionAccumulator().update(batch=batch))
+
+    assert merged.counts() == accumulator.counts()
+
+
+def test_slots():
+    with pytest.raises(AttributeError):
+        ConversionAccumulator().users = 1
+
+
+def test_to_ci(in_ab_test_ci):
+    accumulator = ConversionAccumulator()
+    accumulator.users_control = in_ab_test_ci["control_size"]
+    accumulator.conversions_control = in_ab_test_ci["control_conv"]
+    accumulator.users_treatment = in_ab_test_ci["treatment_size"]
+    accumulator.conversions_treatment = in_ab_test_ci["treatment_conv"]
+
+    assert accumulator.to_ci() == f.get_ab_test_ci(**accumulator.counts())
+
+
+def test_check_sample_sizes_and_conclude(df_ab_test_batches, capsys):
+    accumulator = ConversionAccumulator()
+    for batch in df_ab_test_batches:
+        accumulator.update(batch=batch)
+    accumulator.check_sample_sizes()
+    accumulator.conclude(practical_significance=0)
+
+    assert capsys.readouterr().out.splitlines()[1:] == [
+        "Control and treatment groups not sufficiently large to conduct hypothesis testing.",
+        "Insufficient evidence to reject null hypothesis.",
+    ]
+
+
+def test_check_sample_sizes_no_control_users():
+    with pytest.raises(ValueError, match="no control users"):
+        ConversionAccumulator().check_sample_sizes()
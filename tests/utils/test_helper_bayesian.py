@@ -0,0 +1,60 @@
+import pytest
+import numpy as np
+import src.utils.helper_bayesian as b
+
+
+def test_get_bayesian_ab_test_exact(in_bayesian_counts, out_bayesian_counts):
+    result = b.get_bayesian_ab_test(**in_bayesian_counts)
+
+    assert result.prob_treatment_better == pytest.approx(
+        out_bayesian_counts["prob_treatment_better"], rel=1e-9
+    )
+    assert result.expected_loss_treatment == pytest.approx(
+        out_bayesian_counts["expected_loss_treatment"], rel=1e-6
+    )
+    assert result.expected_loss_control - result.expected_loss_treatment == (
+        pytest.approx(42 / 322 - 31 / 302)
+    )
+
+
+def test_get_bayesian_ab_test_monte_carlo(in_bayesian_counts, out_bayesian_counts):
+    result = b.get_bayesian_ab_test(
+        prior_alpha=1 + 1e-9, seed=2021, **in_bayesian_counts
+    )
+
+    assert result == b.get_bayesian_ab_test(
+        prior_alpha=1 + 1e-9, seed=2021, **in_bayesian_counts
+    )
+    assert result.prob_treatment_better == pytest.approx(
+        out_bayesian_counts["prob_treatment_better"], abs=0.01
+    )
+    assert result.expected_loss_treatment == pytest.approx(
+        out_bayesian_counts["expected_loss_treatment"], abs=1e-4
+    )
+
+
+def test_get_bayesian_ab_test_batch(in_ab_test_ci_batch):
+    counts = {
+        "conversions_control": in_ab_test_ci_batch["control_conv"].to_numpy(),
+        "conversions_treatment": in_ab_test_ci_batch["treatment_conv"].to_numpy(),
+        "total_users_control": in_ab_test_ci_batch["control_size"].to_numpy(),
+        "total_users_treatment": in_ab_test_ci_batch["treatment_size"].to_numpy(),
+    }
+    result = b.get_bayesian_ab_test(max_elements=1000, **counts)
+    monte_carlo_result = b.get_bayesian_ab_test(
+        prior_alpha=1 + 1e-9, seed=2021, **counts
+    )
+
+    assert result.prob_treatment_better.shape == (len(in_ab_test_ci_batch),)
+    for exact, estimate in zip(result, monte_carlo_result):
+        np.testing.assert_allclose(exact, estimate, atol=0.01)
+
+
+def test_conclude_bayesian_ab_test(capsys):
+    b.conclude_bayesian_ab_test(
+        expected_loss_treatment=0.0001,
+        expected_loss_control=0.01,
+        threshold_of_caring=0.001,
+    )
+
+    assert capsys.readouterr().out == "Choose treatment.\n"
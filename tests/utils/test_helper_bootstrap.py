@@ -0,0 +1,78 @@
+import pytest
+import numpy as np
+import src.utils.helper_ab_test as f
+import src.utils.helper_bootstrap as b
+
+
+def test_get_bootstrap_ci_matches_normal_ci(in_ab_test_ci):
+    counts = {
+        "conversions_control": in_ab_test_ci["control_conv"],
+        "conversions_treatment": in_ab_test_ci["treatment_conv"],
+        "total_users_control": in_ab_test_ci["control_size"],
+        "total_users_treatment": in_ab_test_ci["treatment_size"],
+    }
+    lower_bound, upper_bound = f.get_ab_test_ci(**counts)
+    bootstrap_lower_bound, bootstrap_upper_bound = b.get_bootstrap_ci(
+        seed=2021, **counts
+    )
+
+    width = upper_bound - lower_bound
+    assert bootstrap_lower_bound == pytest.approx(lower_bound, abs=0.05 * width)
+    assert bootstrap_upper_bound == pytest.approx(upper_bound, abs=0.05 * width)
+
+
+def test_get_bootstrap_ci_reproducible_across_processes(in_ab_test_ci):
+    counts = {
+        "conversions_control": in_ab_test_ci["control_conv"],
+        "conversions_treatment": in_ab_test_ci["treatment_conv"],
+        "total_users_control": in_ab_test_ci["control_size"],
+        "total_users_treatment": in_ab_test_ci["treatment_size"],
+    }
+    assert b.get_bootstrap_ci(
+        shard_size=2500, n_jobs=1, seed=2021, **counts
+    ) == b.get_bootstrap_ci(shard_size=2500, n_jobs=2, seed=2021, **counts)
+
+
+def test_get_bootstrap_ci_seed_sequence_reused(in_ab_test_ci):
+    counts = {
+        "conversions_control": in_ab_test_ci["control_conv"],
+        "conversions_treatment": in_ab_test_ci["treatment_conv"],
+        "total_users_control": in_ab_test_ci["control_size"],
+        "total_users_treatment": in_ab_test_ci["treatment_size"],
+    }
+    seed = np.random.SeedSequence(2021)
+
+    # the caller's sequence is left as it was, so reusing it repeats the results
+    assert b.get_bootstrap_ci(seed=seed, **counts) == b.get_bootstrap_ci(
+        seed=seed, **counts
+    )
+    assert seed.n_children_spawned == 0
+
+
+def test_get_bootstrap_ci_batch(in_ab_test_ci_batch):
+    lower_bound, upper_bound = b.get_bootstrap_ci(
+        conversions_control=in_ab_test_ci_batch["control_conv"],
+        conversions_treatment=in_ab_test_ci_batch["treatment_conv"],
+        total_users_control=in_ab_test_ci_batch["control_size"],
+        total_users_treatment=in_ab_test_ci_batch["treatment_size"],
+        seed=2021,
+    )
+
+    assert lower_bound.shape == upper_bound.shape == (len(in_ab_test_ci_batch),)
+    assert np.all(lower_bound < upper_bound)
+
+
+def test_get_bootstrap_ci_user_level(in_user_level_values):
+    lower_bound, upper_bound = b.get_bootstrap_ci_user_level(
+        n_resamples=2000, max_elements=100_000, seed=2021, **in_user_level_values
+    )
+    expected_lower_bound, expected_upper_bound = f.get_ab_test_ci(
+        conversions_control=in_user_level_values["values_control"].sum(),
+        conversions_treatment=in_user_level_values["values_treatment"].sum(),
+        total_users_control=len(in_user_level_values["values_control"]),
+        total_users_treatment=len(in_user_level_values["values_treatment"]),
+    )
+
+    width = expected_upper_bound - expected_lower_bound
+    assert lower_bound == pytest.approx(expected_lower_bound, abs=0.1 * width)
+    assert upper_bound == pytest.approx(expected_upper_bound, abs=0.1 * width)
@@ -0,0 +1,54 @@
+import pytest
+import numpy as np
+import pandas as pd
+import src.utils.helper_columnar as c
+
+
+def _is_memory_mapped(values) -> bool:
+    while values is not None:
+        if isinstance(values, np.memmap):
+            return True
+        values = getattr(values, "base", None)
+    return False
+
+
+def test_write_read_columnar(df_clean_ab_data, tmp_path):
+    c.write_columnar(data=df_clean_ab_data, path=tmp_path / "df_conversion_clean")
+    df_columnar = c.read_columnar(path=tmp_path / "df_conversion_clean")
+
+    assert _is_memory_mapped(df_columnar["user_id"].to_numpy())
+    assert _is_memory_mapped(df_columnar["group"].cat.codes.to_numpy())
+    assert df_columnar["group"].cat.codes.dtype == np.int8
+    assert df_columnar["converted"].dtype == np.int8
+    pd.testing.assert_frame_equal(
+        c.read_columnar(path=tmp_path / "df_conversion_clean", mmap_mode=None).astype(
+            {"group": str, "landing_page": str, "converted": int}
+        ),
+        df_clean_ab_data.astype({"timestamp": "datetime64[ns]"}),
+        check_dtype=False,
+    )
+
+
+def test_read_columnar_columns(df_clean_ab_data, tmp_path):
+    c.write_columnar(data=df_clean_ab_data, path=tmp_path / "df_conversion_clean")
+    df_columnar = c.read_columnar(
+        path=tmp_path / "df_conversion_clean", columns=["group", "converted"]
+    )
+    assert df_columnar.columns.to_list() == ["group", "converted"]
+
+
+def test_columnar_writer_row_count(df_clean_ab_data, tmp_path):
+    with pytest.raises(ValueError):
+        with c.ColumnarWriter(
+            path=tmp_path / "df_conversion_clean",
+            n_rows=len(df_clean_ab_data) + 1,
+            dtypes=c.CLEAN_DTYPES,
+        ) as writer:
+            writer.write(chunk=df_clean_ab_data)
+
+
+def test_columnar_writer_unknown_category(df_clean_ab_data, tmp_path):
+    df = df_clean_ab_data.assign(group="variant_b")
+
+    with pytest.raises(ValueError, match="variant_b"):
+        c.write_columnar(data=df, path=tmp_path / "df_conversion_clean")
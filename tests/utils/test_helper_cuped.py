@@ -0,0 +1,81 @@
+import pytest
+import numpy as np
+import src.utils.helper_ab_test as f
+from src.utils.helper_cuped import CupedAccumulator
+
+
+def test_update_matches_merge(df_cuped_data):
+    accumulator = CupedAccumulator()
+    merged = CupedAccumulator()
+    for start in range(0, len(df_cuped_data), 3000):
+        batch = df_cuped_data.iloc[slice(start, start + 3000)]
+        accumulator.update(batch=batch)
+        merged.merge(other=CupedAccumulator().update(batch=batch))
+    full = CupedAccumulator().update(batch=df_cuped_data)
+
+    for moments in (accumulator.moments, merged.moments):
+        for moment, expected in zip(moments, full.moments):
+            np.testing.assert_allclose(moment, expected, rtol=1e-9)
+
+
+def test_adjusted_moments(df_cuped_data):
+    accumulator = CupedAccumulator().update(batch=df_cuped_data)
+    x = df_cuped_data["prior_converted"].to_numpy(dtype=float)
+    y = df_cuped_data["converted"].to_numpy(dtype=float)
+    treatment = (df_cuped_data["group"] == "treatment").to_numpy()
+    x_centred = x - np.where(treatment, x[treatment].mean(), x[~treatment].mean())
+    y_centred = y - np.where(treatment, y[treatment].mean(), y[~treatment].mean())
+    theta = (x_centred * y_centred).sum() / (x_centred**2).sum()
+    y_adjusted = y - theta * (x - x.mean())
+    moments = accumulator.adjusted_moments()
+
+    assert accumulator.theta() == pytest.approx(theta)
+    assert moments["mean_treatment"] == pytest.approx(y_adjusted[treatment].mean())
+    assert moments["variance_control"] == pytest.approx(
+        y_adjusted[~treatment].var(ddof=1)
+    )
+
+
+def test_to_ci(df_cuped_data):
+    accumulator = CupedAccumulator().update(batch=df_cuped_data)
+    lower_bound, upper_bound = accumulator.to_ci(adjust=False)
+    lower_bound_adjusted, upper_bound_adjusted = accumulator.to_ci()
+    counts = df_cuped_data.groupby("group")["converted"].agg(["sum", "count"])
+    expected_lower_bound, expected_upper_bound = f.get_ab_test_ci(
+        conversions_control=counts.at["control", "sum"],
+        conversions_treatment=counts.at["treatment", "sum"],
+        total_users_control=counts.at["control", "count"],
+        total_users_treatment=counts.at["treatment", "count"],
+    )
+
+    assert lower_bound == pytest.approx(expected_lower_bound, rel=1e-3)
+    assert upper_bound == pytest.approx(expected_upper_bound, rel=1e-3)
+    assert (upper_bound_adjusted - lower_bound_adjusted) / (
+        upper_bound - lower_bound
+    ) == pytest.approx(np.sqrt(1 - accumulator.variance_reduction()), rel=1e-2)
+
+
+def test_report_sample_sizes(df_cuped_data, capsys):
+    accumulator = CupedAccumulator().update(batch=df_cuped_data)
+    sample_size, sample_size_adjusted = accumulator.report_sample_sizes(
+        baseline_rate=0.1
+    )
+
+    assert sample_size == pytest.approx(f.get_sample_sizes(baseline_rate=0.1))
+    assert sample_size_adjusted / sample_size == pytest.approx(
+        1 - accumulator.variance_reduction()
+    )
+    assert "with CUPED" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("col", ["converted", "prior_converted"])
+def test_no_variance(df_cuped_data, col):
+    accumulator = CupedAccumulator().update(batch=df_cuped_data.assign(**{col: 0}))
+
+    assert accumulator.variance_reduction() == 0.0
+    assert np.isfinite(accumulator.theta())
+
+
+def test_slots():
+    with pytest.raises(AttributeError):
+        CupedAccumulator().theta_ = 1
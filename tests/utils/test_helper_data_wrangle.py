@@ -0,0 +1,92 @@
+import pytest
+import pandas as pd
+import src.utils.helper_columnar as c
+import src.utils.helper_data_wrangle as w
+from src.utils.helper_srm import SrmMonitor
+
+
+def test_filter_group_pages(df_raw_ab_data):
+    df_filter = w.filter_group_pages(data=df_raw_ab_data)
+    assert df_filter.index.to_list() == [0, 1, 2, 3, 5, 6, 8, 9, 10]
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 3, 100])
+def test_clean_ab_data_chunked(path_raw_ab_data, df_clean_ab_data, tmp_path, chunksize):
+    path_out = tmp_path / "df_conversion_clean.csv"
+    n_written = w.clean_ab_data_chunked(
+        path_in=path_raw_ab_data, path_out=path_out, chunksize=chunksize
+    )
+
+    assert n_written == len(df_clean_ab_data)
+    pd.testing.assert_frame_equal(pd.read_csv(path_out), df_clean_ab_data)
+
+
+def test_clean_ab_data_chunked_columnar(path_raw_ab_data, df_clean_ab_data, tmp_path):
+    path_out = tmp_path / "df_conversion_clean"
+    w.clean_ab_data_chunked(
+        path_in=path_raw_ab_data,
+        path_out=path_out,
+        chunksize=2,
+        output_format="columnar",
+    )
+    df_expected = tmp_path / "df_expected"
+    c.write_columnar(data=df_clean_ab_data, path=df_expected)
+
+    pd.testing.assert_frame_equal(
+        c.read_columnar(path=path_out), c.read_columnar(path=df_expected)
+    )
+
+
+def test_clean_ab_data_chunked_srm_monitor(
+    path_raw_ab_data, df_clean_ab_data, tmp_path
+):
+    srm_monitor = SrmMonitor()
+    w.clean_ab_data_chunked(
+        path_in=path_raw_ab_data,
+        path_out=tmp_path / "df_conversion_clean.csv",
+        chunksize=2,
+        srm_monitor=srm_monitor,
+    )
+    counts = df_clean_ab_data["group"].value_counts()
+
+    assert srm_monitor.counts.tolist() == [counts["control"], counts["treatment"]]
+    assert srm_monitor.n_chunks > 1
+
+
+@pytest.mark.parametrize(
+    "chunksize, n_buckets, n_jobs", [(1, 1, 1), (2, 3, 1), (3, 4, 2)]
+)
+def test_clean_ab_data_partitioned(
+    path_raw_ab_data, df_clean_ab_data, tmp_path, chunksize, n_buckets, n_jobs
+):
+    path_out = tmp_path / "df_conversion_clean.csv"
+    report = w.clean_ab_data_partitioned(
+        path_in=path_raw_ab_data,
+        path_out=path_out,
+        chunksize=chunksize,
+        n_buckets=n_buckets,
+        n_jobs=n_jobs,
+    )
+
+    assert report.n_users == len(df_clean_ab_data)
+    pd.testing.assert_frame_equal(pd.read_csv(path_out), df_clean_ab_data)
+
+
+@pytest.mark.parametrize(
+    "clean", [w.clean_ab_data_chunked, w.clean_ab_data_partitioned]
+)
+def test_clean_ab_data_empty(df_raw_ab_data, df_clean_ab_data, tmp_path, clean):
+    path_in = tmp_path / "ab_data.csv"
+    df_raw_ab_data.iloc[:0].to_csv(path_or_buf=path_in, index=False)
+    path_out = tmp_path / "df_conversion_clean.csv"
+    path_columnar = tmp_path / "df_conversion_clean"
+    # outputs of an earlier run
+    df_clean_ab_data.to_csv(path_or_buf=path_out, index=False)
+    c.write_columnar(data=df_clean_ab_data, path=path_columnar)
+
+    clean(path_in=path_in, path_out=path_out)
+    clean(path_in=path_in, path_out=path_columnar, output_format="columnar")
+
+    assert pd.read_csv(path_out).columns.to_list() == df_raw_ab_data.columns.to_list()
+    assert pd.read_csv(path_out).empty
+    assert c.read_columnar(path=path_columnar).empty
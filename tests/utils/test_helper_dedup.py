@@ -0,0 +1,42 @@
+import pandas as pd
+import src.utils.helper_data_wrangle as w
+import src.utils.helper_dedup as d
+
+
+def test_partition_by_user(df_raw_ab_data, tmp_path):
+    paths, n_rows = d.partition_by_user(
+        chunks=[df_raw_ab_data.iloc[:5], df_raw_ab_data.iloc[5:]],
+        bucket_dir=tmp_path,
+        n_buckets=4,
+    )
+    buckets = [pd.read_csv(path) for path in paths]
+
+    assert n_rows == len(df_raw_ab_data)
+    assert sum(len(bucket) for bucket in buckets) == len(df_raw_ab_data)
+    # every user lands in exactly one bucket, with rows in input order
+    assert sum(bucket["user_id"].nunique() for bucket in buckets) == 8
+    for bucket in buckets:
+        assert bucket[d.ROW_COL].is_monotonic_increasing
+
+
+def test_dedup_buckets_reports_conflicts(df_raw_ab_data, tmp_path):
+    df_filter = w.filter_group_pages(data=df_raw_ab_data)
+    paths, _ = d.partition_by_user(chunks=[df_filter], bucket_dir=tmp_path, n_buckets=2)
+    report = d.dedup_buckets(paths=paths, max_examples=10)
+
+    assert report.n_rows == len(df_filter)
+    assert report.n_users == 6
+    # users 1, 2 and 3 converted in one row but not in the other
+    assert report.n_conflicts == 3
+    assert sorted(report.conflict_examples) == [1, 2, 3]
+
+
+def test_merge_buckets(df_raw_ab_data, df_clean_ab_data, tmp_path):
+    df_filter = w.filter_group_pages(data=df_raw_ab_data)
+    paths, n_rows = d.partition_by_user(
+        chunks=[df_filter], bucket_dir=tmp_path, n_buckets=3
+    )
+    d.dedup_buckets(paths=paths)
+    df_merged = pd.concat(d.merge_buckets(paths=paths, n_rows=n_rows, chunksize=2))
+
+    assert df_merged["user_id"].tolist() == df_clean_ab_data["user_id"].tolist()
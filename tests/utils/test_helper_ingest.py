@@ -0,0 +1,141 @@
+import asyncio
+import math
+import pytest
+import src.utils.helper_accumulator as a
+import src.utils.helper_ingest as i
+
+
+async def _ingest(events, **kwargs):
+    service = await i.IngestService(**kwargs).start()
+    try:
+        return await i.send_events(port=service.port, events=events), service
+    finally:
+        await service.close()
+
+
+def test_ingest_service(df_ab_test):
+    events = df_ab_test[["group", "converted"]].to_dict(orient="records")
+    stats, _ = asyncio.run(_ingest(events=events))
+    accumulator = a.ConversionAccumulator().update(batch=df_ab_test)
+
+    assert {key: stats[key] for key in accumulator.counts()} == accumulator.counts()
+    assert (stats["lower_bound"], stats["upper_bound"]) == pytest.approx(
+        accumulator.to_ci()
+    )
+
+
+@pytest.mark.parametrize("batch_size, max_queue", [(5, 8), (1_000, 3)])
+def test_ingest_service_backpressure(batch_size, max_queue):
+    events = [
+        {"group": group, "converted": n % 3 == 0}
+        for n in range(500)
+        for group in ("control", "treatment")
+    ]
+    stats, service = asyncio.run(
+        _ingest(events=events, batch_size=batch_size, max_queue=max_queue)
+    )
+
+    # every event is committed, in batches no larger than batch_size
+    assert stats["total_users_control"] + stats["total_users_treatment"] == 1_000
+    assert stats["n_batches"] >= math.ceil(1_000 / batch_size)
+    assert service.queue.empty()
+
+
+def test_ingest_service_invalid_json():
+    async def main():
+        service = await i.IngestService().start()
+        reader, writer = await asyncio.open_connection(
+            host="127.0.0.1", port=service.port
+        )
+        writer.write(b'{"group": "control"\n{"query": "stats"}\n')
+        await writer.drain()
+        replies = [await reader.readline(), await reader.readline()]
+        writer.close()
+        await service.close()
+        return replies
+
+    error, stats = asyncio.run(main())
+
+    assert b"error" in error
+    assert b"total_users_control" in stats
+
+
+def test_ingest_service_bad_events(capsys):
+    events = [
+        {"group": "control", "converted": "x"},
+        {"group": 5, "converted": 0},
+        5,
+        {"group": "control", "converted": 1},
+        {"group": "treatment", "converted": True},
+    ]
+    stats, _ = asyncio.run(_ingest(events=events))
+
+    # bad events are rejected when read, so the valid events around them are committed
+    assert (stats["total_users_control"], stats["conversions_control"]) == (1, 1)
+    assert (stats["total_users_treatment"], stats["conversions_treatment"]) == (1, 1)
+    assert "3 events were rejected" in capsys.readouterr().out
+
+
+def test_ingest_service_survives_failed_commit(capsys):
+    class FailOnceAccumulator(a.ConversionAccumulator):
+        __slots__ = ("failed",)
+
+        def update(self, batch):
+            if not getattr(self, "failed", False):
+                self.failed = True
+                raise RuntimeError("disk full")
+            return super().update(batch=batch)
+
+    async def main():
+        service = await i.IngestService(accumulator=FailOnceAccumulator()).start()
+        await i.send_events(
+            port=service.port, events=[{"group": "control", "converted": 0}]
+        )
+        stats = await asyncio.wait_for(
+            i.send_events(
+                port=service.port, events=[{"group": "control", "converted": 1}]
+            ),
+            timeout=3,
+        )
+        await asyncio.wait_for(service.close(), timeout=3)
+        return stats
+
+    stats = asyncio.run(main())
+
+    assert (stats["total_users_control"], stats["conversions_control"]) == (1, 1)
+    assert "Failed to commit a batch of 1 events" in capsys.readouterr().out
+
+
+def test_ingest_service_wait_under_concurrent_producers():
+    async def flood(port):
+        _, writer = await asyncio.open_connection(host="127.0.0.1", port=port)
+        line = b'{"group": "treatment", "converted": 0}\n'
+        try:
+            while True:
+                writer.write(line * 100)
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def main():
+        service = await i.IngestService(batch_size=50, max_queue=100).start()
+        producers = [asyncio.create_task(flood(service.port)) for _ in range(2)]
+        await asyncio.sleep(0.2)
+        # waits only for the events queued before it, not for the producers to stop
+        stats = await asyncio.wait_for(
+            i.send_events(
+                port=service.port, events=[{"group": "control", "converted": 1}]
+            ),
+            timeout=5,
+        )
+        for producer in producers:
+            producer.cancel()
+        await asyncio.gather(*producers, return_exceptions=True)
+        await asyncio.wait_for(service.close(), timeout=5)
+        return stats, service
+
+    stats, service = asyncio.run(main())
+
+    assert (stats["total_users_control"], stats["conversions_control"]) == (1, 1)
+    assert stats["total_users_treatment"] > 0
+    assert service.n_committed == service.n_queued
@@ -0,0 +1,94 @@
+import pytest
+import numpy as np
+import pandas as pd
+import scipy.stats as st
+import src.utils.helper_ab_test as f
+import src.utils.helper_multi_arm as a
+
+
+def test_get_multi_arm_ci_unadjusted(in_multi_arm_summary):
+    df_ci = a.get_multi_arm_ci(summary=in_multi_arm_summary, adjustment=None)
+    control = in_multi_arm_summary.loc["control"]
+    variants = in_multi_arm_summary.drop(index="control")
+    lower_bound, upper_bound = f.get_ab_test_ci_batch(
+        conversions_control=control["conversions"],
+        conversions_treatment=variants["conversions"],
+        total_users_control=control["total_users"],
+        total_users_treatment=variants["total_users"],
+    )
+
+    assert df_ci.index.get_level_values("arm").equals(variants.index.rename("arm"))
+    np.testing.assert_allclose(df_ci["lower_bound"], lower_bound)
+    np.testing.assert_allclose(df_ci["upper_bound"], upper_bound)
+
+
+def test_get_multi_arm_ci_pairwise(in_multi_arm_summary):
+    df_ci = a.get_multi_arm_ci(
+        summary=in_multi_arm_summary, comparisons="pairwise", adjustment="bonferroni"
+    )
+    n_comparisons = 20 * 19 // 2
+    summary = in_multi_arm_summary.loc
+    lower_bound, upper_bound = f.get_ab_test_ci_batch(
+        conversions_control=summary[
+            df_ci.index.get_level_values("baseline"), "conversions"
+        ],
+        conversions_treatment=summary[
+            df_ci.index.get_level_values("arm"), "conversions"
+        ],
+        total_users_control=summary[
+            df_ci.index.get_level_values("baseline"), "total_users"
+        ],
+        total_users_treatment=summary[
+            df_ci.index.get_level_values("arm"), "total_users"
+        ],
+        confidence_level=0.05 / n_comparisons,
+    )
+
+    assert len(df_ci) == n_comparisons
+    assert not df_ci.index.duplicated().any()
+    np.testing.assert_allclose(df_ci["lower_bound"], lower_bound)
+    np.testing.assert_allclose(df_ci["upper_bound"], upper_bound)
+    assert (df_ci["p_value"] <= 1).all()
+
+
+def test_get_dunnett_critical_value(in_multi_arm_summary):
+    variance = (
+        in_multi_arm_summary["conversions"]
+        * (in_multi_arm_summary["total_users"] - in_multi_arm_summary["conversions"])
+        / in_multi_arm_summary["total_users"] ** 3
+    ).to_numpy()
+    weights = np.sqrt(variance[0] / (variance[0] + variance[1:6]))
+    z_score = a.get_dunnett_critical_value(weights=weights)
+    correlation = np.outer(weights, weights)
+    np.fill_diagonal(correlation, 1)
+
+    assert st.norm.ppf(0.975) < z_score < st.norm.ppf(1 - 0.025 / 5)
+    coverage = st.multivariate_normal(cov=correlation, seed=2021).cdf(
+        np.full(5, z_score), lower_limit=np.full(5, -z_score)
+    )
+    assert coverage == pytest.approx(0.95, abs=1e-3)
+
+
+def test_get_multi_arm_ci_dunnett(in_multi_arm_summary):
+    df_dunnett = a.get_multi_arm_ci(summary=in_multi_arm_summary)
+    df_bonferroni = a.get_multi_arm_ci(
+        summary=in_multi_arm_summary, adjustment="bonferroni"
+    )
+    df_unadjusted = a.get_multi_arm_ci(summary=in_multi_arm_summary, adjustment=None)
+
+    width = df_dunnett["upper_bound"] - df_dunnett["lower_bound"]
+    assert (width < df_bonferroni["upper_bound"] - df_bonferroni["lower_bound"]).all()
+    assert (width > df_unadjusted["upper_bound"] - df_unadjusted["lower_bound"]).all()
+    # a comparison is rejected exactly when its adjusted p-value is below the confidence level
+    pd.testing.assert_series_equal(
+        a.conclude_multi_arm_test(df_ci=df_dunnett),
+        df_dunnett["p_value"] < 0.05,
+        check_names=False,
+    )
+
+
+def test_get_multi_arm_ci_invalid(in_multi_arm_summary):
+    with pytest.raises(ValueError):
+        a.get_multi_arm_ci(summary=in_multi_arm_summary, comparisons="pairwise")
+    with pytest.raises(ValueError):
+        a.get_multi_arm_ci(summary=in_multi_arm_summary, adjustment="sidak")
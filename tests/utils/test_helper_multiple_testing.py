@@ -0,0 +1,54 @@
+import pytest
+import numpy as np
+from statsmodels.stats.multitest import multipletests
+import src.utils.helper_ab_test as f
+import src.utils.helper_multiple_testing as m
+
+
+@pytest.mark.parametrize(
+    "method, statsmodels_method",
+    [("bonferroni", "bonferroni"), ("holm", "holm"), ("bh", "fdr_bh")],
+)
+def test_adjust_p_values(in_p_values, method, statsmodels_method):
+    reject, p_adjusted, _, _ = multipletests(
+        pvals=in_p_values, alpha=0.05, method=statsmodels_method
+    )
+
+    np.testing.assert_allclose(
+        m.adjust_p_values(p_values=in_p_values, method=method), p_adjusted, rtol=1e-12
+    )
+    np.testing.assert_array_equal(
+        m.conclude_multiple_ab_tests(p_values=in_p_values, method=method), reject
+    )
+
+
+def test_adjust_p_values_invalid_method(in_p_values):
+    with pytest.raises(ValueError):
+        m.adjust_p_values(p_values=in_p_values, method="sidak")
+
+
+def test_get_ab_test_p_values_match_ci(in_ab_test_ci_batch):
+    counts = {
+        "conversions_control": in_ab_test_ci_batch["control_conv"],
+        "conversions_treatment": in_ab_test_ci_batch["treatment_conv"],
+        "total_users_control": in_ab_test_ci_batch["control_size"],
+        "total_users_treatment": in_ab_test_ci_batch["treatment_size"],
+    }
+    lower_bound, upper_bound = f.get_ab_test_ci_batch(
+        confidence_level=in_ab_test_ci_batch["confidence_level"], **counts
+    )
+    p_values = m.get_ab_test_p_values(practical_significance=0.01, **counts)
+
+    np.testing.assert_array_equal(
+        p_values < in_ab_test_ci_batch["confidence_level"],
+        (lower_bound > 0.01) | (upper_bound < 0.01),
+    )
+    np.testing.assert_allclose(
+        m.get_p_values_from_ci(
+            lower_bound=lower_bound,
+            upper_bound=upper_bound,
+            practical_significance=0.01,
+            confidence_level=in_ab_test_ci_batch["confidence_level"],
+        ),
+        p_values,
+    )
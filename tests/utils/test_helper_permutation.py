@@ -0,0 +1,69 @@
+import pytest
+import numpy as np
+import scipy.stats as st
+import src.utils.helper_permutation as p
+
+
+def test_get_permutation_p_value_matches_exact(in_permutation_counts):
+    total_users = (
+        in_permutation_counts["total_users_control"]
+        + in_permutation_counts["total_users_treatment"]
+    )
+    conversions = (
+        in_permutation_counts["conversions_control"]
+        + in_permutation_counts["conversions_treatment"]
+    )
+    conversions_treatment = np.arange(conversions + 1)
+    differences = (
+        conversions_treatment / in_permutation_counts["total_users_treatment"]
+        - (conversions - conversions_treatment)
+        / in_permutation_counts["total_users_control"]
+    )
+    observed = (
+        in_permutation_counts["conversions_treatment"]
+        / in_permutation_counts["total_users_treatment"]
+        - in_permutation_counts["conversions_control"]
+        / in_permutation_counts["total_users_control"]
+    )
+    probabilities = st.hypergeom(
+        total_users, conversions, in_permutation_counts["total_users_treatment"]
+    ).pmf(conversions_treatment)
+    expected = probabilities[np.abs(differences) >= observed * (1 - 1e-12)].sum()
+
+    p_value, n_permutations = p.get_permutation_p_value(
+        n_permutations=20_000, stopping_level=None, seed=2021, **in_permutation_counts
+    )
+
+    assert n_permutations == 20_000
+    assert p_value == pytest.approx(expected, abs=0.01)
+
+
+def test_get_permutation_p_value_stops_early():
+    p_value, n_permutations = p.get_permutation_p_value(
+        conversions_control=100,
+        conversions_treatment=200,
+        total_users_control=1000,
+        total_users_treatment=1000,
+        batch_size=500,
+        seed=2021,
+    )
+
+    assert n_permutations == 500
+    assert p_value < 0.05
+
+
+def test_get_permutation_p_value_user_level(in_user_level_values):
+    p_value, _ = p.get_permutation_p_value_user_level(
+        n_permutations=4000, stopping_level=None, seed=2021, **in_user_level_values
+    )
+    expected, _ = p.get_permutation_p_value(
+        conversions_control=int(in_user_level_values["values_control"].sum()),
+        conversions_treatment=int(in_user_level_values["values_treatment"].sum()),
+        total_users_control=len(in_user_level_values["values_control"]),
+        total_users_treatment=len(in_user_level_values["values_treatment"]),
+        n_permutations=4000,
+        stopping_level=None,
+        seed=2021,
+    )
+
+    assert p_value == pytest.approx(expected, abs=0.03)
@@ -0,0 +1,105 @@
+import pytest
+import numpy as np
+import src.utils.helper_ab_test as f
+import src.utils.helper_sample_size_table as t
+
+
+@pytest.mark.parametrize(
+    "setting, confidence_level, sensitivity", [(0, 0.05, 0.8), (1, 0.01, 0.9)]
+)
+def test_lookup_sample_sizes_within_error_bound(
+    in_sample_size_table, in_sample_size_queries, setting, confidence_level, sensitivity
+):
+    table = t.build_sample_size_table(**in_sample_size_table)
+    exact = f.get_sample_sizes(
+        confidence_level=confidence_level,
+        sensitivity=sensitivity,
+        **in_sample_size_queries,
+    )
+    interpolated = t.lookup_sample_sizes(
+        table=table,
+        confidence_level=confidence_level,
+        sensitivity=sensitivity,
+        max_error=np.inf,
+        **in_sample_size_queries,
+    )
+
+    # the error bound of the grid cell of each query
+    _, error_bound = t._interpolate(
+        table=table,
+        setting=np.full(shape=len(exact), fill_value=setting),
+        **in_sample_size_queries,
+    )
+
+    assert not np.array_equal(interpolated, exact)
+    assert np.all(np.abs(interpolated - exact) / exact <= error_bound)
+
+
+def test_build_sample_size_table_unverified_cells(
+    in_sample_size_table, in_sample_size_queries, monkeypatch
+):
+    # without the safety factor, the curvature estimated at the nodes understates the error within most cells
+    monkeypatch.setattr(t, "SAFETY_FACTOR", 0.0)
+    table = t.build_sample_size_table(**in_sample_size_table)
+    _, error_bound = t._interpolate(
+        table=table,
+        setting=np.zeros(shape=1000, dtype=int),
+        **in_sample_size_queries,
+    )
+
+    assert np.isinf(table.error_bound).any()
+    # queries in unverified cells are answered by the exact solver
+    np.testing.assert_array_equal(
+        t.lookup_sample_sizes(table=table, max_error=np.inf, **in_sample_size_queries)[
+            np.isinf(error_bound)
+        ],
+        f.get_sample_sizes(**in_sample_size_queries)[np.isinf(error_bound)],
+    )
+
+
+def test_lookup_sample_sizes_falls_back_to_exact(in_sample_size_table):
+    table = t.build_sample_size_table(**in_sample_size_table)
+    queries = {
+        "baseline_rate": np.array([0.01, 0.1, 0.1]),
+        "practical_significance": np.array([0.01, 0.1, 0.01]),
+    }
+
+    # outside the grid
+    np.testing.assert_array_equal(
+        t.lookup_sample_sizes(table=table, **queries)[:2],
+        f.get_sample_sizes(**queries)[:2],
+    )
+    # setting not in the table
+    np.testing.assert_array_equal(
+        t.lookup_sample_sizes(table=table, sensitivity=0.7, **queries),
+        f.get_sample_sizes(sensitivity=0.7, **queries),
+    )
+    # beyond the error budget
+    np.testing.assert_array_equal(
+        t.lookup_sample_sizes(table=table, max_error=0, **queries),
+        f.get_sample_sizes(**queries),
+    )
+
+
+def test_save_load_sample_size_table(in_sample_size_table, tmp_path):
+    table = t.build_sample_size_table(**in_sample_size_table)
+    path = tmp_path / "sample_size_table.npz"
+    t.save_sample_size_table(table=table, path=path)
+    loaded = t.load_sample_size_table(path=path)
+
+    for field in t.SampleSizeTable._fields:
+        np.testing.assert_array_equal(getattr(loaded, field), getattr(table, field))
+
+
+def test_get_sample_size_from_table(in_sample_size_table, baseline_rate):
+    table = t.build_sample_size_table(**in_sample_size_table)
+    _, error_bound = t._interpolate(
+        table=table,
+        setting=np.zeros(shape=1, dtype=int),
+        baseline_rate=np.array([baseline_rate]),
+        practical_significance=np.array([0.01]),
+    )
+    assert f.get_sample_size(baseline_rate=baseline_rate, table=table) == pytest.approx(
+        f.get_sample_size(baseline_rate=baseline_rate),
+        rel=float(error_bound[0]),
+    )
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import src.utils.helper_schema as s
+
+
+def test_read_ab_data_dtypes(path_raw_ab_data):
+    df = s.read_ab_data(path=path_raw_ab_data)
+
+    assert df["user_id"].dtype == np.int64
+    assert df["group"].cat.categories.tolist() == s.AB_DATA_CATEGORIES["group"]
+    assert (
+        df["landing_page"].cat.categories.tolist()
+        == s.AB_DATA_CATEGORIES["landing_page"]
+    )
+    assert df["converted"].dtype == np.int8
+    assert pd.api.types.is_datetime64_dtype(df["timestamp"])
+
+
+def test_read_ab_data_columns(path_raw_ab_data):
+    df = s.read_ab_data(path=path_raw_ab_data, columns=["converted", "group"])
+    assert df.columns.to_list() == ["group", "converted"]
+
+
+def test_read_ab_data_memory(path_raw_ab_data):
+    df_default = pd.read_csv(filepath_or_buffer=path_raw_ab_data)
+    df = s.read_ab_data(path=path_raw_ab_data)
+
+    assert (
+        df.memory_usage(deep=True).sum() < df_default.memory_usage(deep=True).sum() / 2
+    )
+    pd.testing.assert_frame_equal(
+        df.astype({"group": str, "landing_page": str}),
+        df_default.astype({"timestamp": "datetime64[us]"}),
+        check_dtype=False,
+    )
+
+
+def test_read_ab_data_large_ids_and_extra_arms(df_raw_ab_data, tmp_path):
+    path = tmp_path / "ab_data.csv"
+    df_raw_ab_data.assign(
+        user_id=df_raw_ab_data["user_id"] + 3_000_000_000,
+        group=df_raw_ab_data["group"].replace("treatment", "variant_b"),
+    ).to_csv(path_or_buf=path, index=False)
+    df = s.read_ab_data(path=path)
+
+    # ids beyond int32 are kept rather than wrapping around
+    assert (df["user_id"] == df_raw_ab_data["user_id"] + 3_000_000_000).all()
+    # labels outside the two-arm categories are kept rather than turned into missing values
+    assert df["group"].notna().all()
+    assert df["group"].cat.categories.tolist() == ["control", "variant_b"]
@@ -0,0 +1,83 @@
+import pytest
+import numpy as np
+import pandas as pd
+import src.utils.helper_ab_test as f
+import src.utils.helper_segment_cube as c
+
+
+def test_build_segment_cube_is_sparse(df_segment_data):
+    df = df_segment_data[
+        ~(
+            (df_segment_data["country"] == "CA")
+            & (df_segment_data["device"] == "desktop")
+        )
+    ]
+    cube = c.build_segment_cube(data=df, dims=["country", "device"])
+
+    assert len(cube) == 10
+    assert cube["total_users"].sum() == len(df)
+    assert cube["conversions"].sum() == df["converted"].sum()
+
+
+def test_merge_segment_cubes(df_segment_data):
+    df = c.add_day(data=df_segment_data)
+    cube = c.build_segment_cube(data=df, dims=["day", "country"])
+    cubes = [
+        c.build_segment_cube(
+            data=df.iloc[slice(start, start + 300)], dims=["day", "country"]
+        )
+        for start in range(0, len(df), 300)
+    ]
+
+    pd.testing.assert_frame_equal(c.merge_segment_cubes(cubes=cubes), cube)
+
+
+def test_query_segment_cube(df_segment_data):
+    cube = c.build_segment_cube(data=df_segment_data, dims=["country", "device"])
+    df_query = c.query_segment_cube(
+        cube=cube, by=["device"], filters={"country": ["UK", "US"]}
+    )
+    df = df_segment_data[df_segment_data["country"].isin(["UK", "US"])]
+    df_expected = df.groupby(["device", "group"])["converted"].agg(["size", "sum"])
+
+    np.testing.assert_array_equal(df_query["total_users"], df_expected["size"])
+    np.testing.assert_array_equal(df_query["conversions"], df_expected["sum"])
+
+
+def test_get_segment_lifts(df_segment_data):
+    cube = c.build_segment_cube(data=df_segment_data, dims=["country", "device"])
+    df_lifts = c.get_segment_lifts(
+        cube=cube, by=["country"], filters={"device": "mobile"}
+    )
+    df = df_segment_data[
+        (df_segment_data["country"] == "UK") & (df_segment_data["device"] == "mobile")
+    ]
+    df_summary = f.summarise_conversions(
+        data=df.assign(landing_page="page"),
+        group_col="group",
+        convert_col="converted",
+        page_col="landing_page",
+    )
+    lower_bound, upper_bound = f.get_ab_test_ci(
+        conversions_control=df_summary.loc["control", "conversions"],
+        conversions_treatment=df_summary.loc["treatment", "conversions"],
+        total_users_control=df_summary.loc["control", "total_users"],
+        total_users_treatment=df_summary.loc["treatment", "total_users"],
+    )
+
+    assert list(df_lifts.index) == ["CA", "UK", "US"]
+    assert df_lifts.loc["UK", "lower_bound"] == pytest.approx(lower_bound)
+    assert df_lifts.loc["UK", "upper_bound"] == pytest.approx(upper_bound)
+
+
+def test_save_load_segment_cube(df_segment_data, tmp_path):
+    cube = c.build_segment_cube(
+        data=c.add_day(data=df_segment_data), dims=["day", "device"]
+    )
+    c.save_segment_cube(cube=cube, path=tmp_path / "segment_cube.csv")
+
+    pd.testing.assert_frame_equal(
+        c.load_segment_cube(path=tmp_path / "segment_cube.csv"),
+        cube,
+        check_index_type=False,
+    )
@@ -0,0 +1,69 @@
+import pytest
+import numpy as np
+import src.utils.helper_ab_test as f
+import src.utils.helper_simulation as s
+
+
+def test_simulate_ab_tests_reproducible():
+    kwargs = {
+        "conversion_rate_control": 0.1,
+        "conversion_rate_treatment": 0.11,
+        "total_users_control": 5_000,
+        "n_experiments": 50_000,
+        "shard_size": 10_000,
+        "seed": 2021,
+    }
+
+    assert s.simulate_ab_tests(n_jobs=1, **kwargs) == s.simulate_ab_tests(
+        n_jobs=2, **kwargs
+    )
+
+
+def test_simulate_ab_tests_type_i_error():
+    result = s.simulate_ab_tests(
+        conversion_rate_control=0.12, n_experiments=200_000, seed=2021
+    )
+
+    assert result.lower_bound < result.rejection_rate < result.upper_bound
+    assert result.rejection_rate == pytest.approx(0.05, abs=4 * result.standard_error)
+
+
+def test_validate_ab_test(capsys):
+    aa_result, ab_result = s.validate_ab_test(
+        baseline_rate=0.12,
+        practical_significance=0.01,
+        n_experiments=200_000,
+        seed=2021,
+    )
+    power = f.get_powers(
+        baseline_rate=0.12, practical_significance=0.01, sample_size=10_000
+    )
+
+    assert aa_result.rejection_rate == pytest.approx(
+        0.05, abs=4 * aa_result.standard_error
+    )
+    assert ab_result.rejection_rate == pytest.approx(power, abs=0.005)
+    assert capsys.readouterr().out.startswith("Type I error: ")
+
+
+@pytest.mark.parametrize(
+    "seed", [2021, np.random.SeedSequence(2021)], ids=["int", "seed_sequence"]
+)
+def test_validate_ab_test_seed(seed):
+    results = s.validate_ab_test(baseline_rate=0.12, n_experiments=10_000, seed=seed)
+
+    # both seed types spawn the same streams
+    assert results == s.validate_ab_test(
+        baseline_rate=0.12, n_experiments=10_000, seed=2021
+    )
+
+
+def test_validate_ab_test_seed_sequence_reused():
+    seed = np.random.SeedSequence(2021)
+    results = s.validate_ab_test(baseline_rate=0.12, n_experiments=10_000, seed=seed)
+
+    # the caller's sequence is left as it was, so reusing it repeats the results
+    assert seed.n_children_spawned == 0
+    assert results == s.validate_ab_test(
+        baseline_rate=0.12, n_experiments=10_000, seed=seed
+    )
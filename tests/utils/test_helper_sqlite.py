@@ -0,0 +1,74 @@
+import sqlite3
+from contextlib import closing
+import pytest
+import pandas as pd
+import src.utils.helper_ab_test as f
+import src.utils.helper_data_wrangle as w
+import src.utils.helper_schema as s
+import src.utils.helper_sqlite as q
+
+
+def _summarise(data):
+    return f.summarise_conversions(
+        data=data, group_col="group", convert_col="converted", page_col="landing_page"
+    )
+
+
+def test_summarise_conversions_sqlite(path_sqlite_ab_data, path_raw_ab_data, tmp_path):
+    path_clean = tmp_path / "df_conversion_clean.csv"
+    w.clean_ab_data_chunked(path_in=path_raw_ab_data, path_out=path_clean, chunksize=4)
+    expected = _summarise(data=s.read_ab_data(path=path_clean))
+
+    pd.testing.assert_frame_equal(
+        q.summarise_conversions_sqlite(database=path_sqlite_ab_data),
+        expected.set_axis(expected.index.astype(str)).astype({"page": object}),
+        check_dtype=False,
+    )
+
+
+def test_summarise_conversions_sqlite_raw(path_sqlite_ab_data, df_raw_ab_data):
+    df_summary = q.summarise_conversions_sqlite(
+        database=path_sqlite_ab_data, group_pages=None, dedup=False
+    )
+    expected = _summarise(data=df_raw_ab_data)
+
+    pd.testing.assert_frame_equal(
+        df_summary[["conversions", "total_users", "unique_page"]],
+        expected[["conversions", "total_users", "unique_page"]],
+        check_dtype=False,
+    )
+
+
+@pytest.mark.parametrize("group_pages", [s.GROUP_PAGES, None])
+@pytest.mark.parametrize("analyze", [False, True])
+def test_summarise_conversions_sqlite_uses_index(
+    path_sqlite_ab_data, group_pages, analyze
+):
+    # the query run by summarise_conversions_sqlite()
+    sql, params = q._summary_query(
+        table="ab_data",
+        user_col="user_id",
+        group_col="group",
+        convert_col="converted",
+        page_col="landing_page",
+        group_pages=group_pages,
+        dedup=True,
+    )
+    with closing(sqlite3.connect(path_sqlite_ab_data)) as connection:
+        if analyze:
+            connection.execute("ANALYZE")
+        plan = [
+            row[-1] for row in connection.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        ]
+
+    # which index is used depends on the statistics, but the table is only read by rowid or through an index
+    assert any("INDEX" in step for step in plan)
+    assert all(
+        "INDEX" in step or "PRIMARY KEY" in step for step in plan if "ab_data" in step
+    )
+
+
+@pytest.mark.parametrize("column", ['group" --', "1group", None])
+def test_summarise_conversions_sqlite_invalid_identifier(path_sqlite_ab_data, column):
+    with pytest.raises(ValueError):
+        q.summarise_conversions_sqlite(database=path_sqlite_ab_data, group_col=column)
@@ -0,0 +1,44 @@
+import pytest
+import numpy as np
+import pandas as pd
+import scipy.stats as st
+from src.utils.helper_srm import SrmMonitor
+
+
+def test_update_matches_chisquare(df_srm_batches):
+    monitor = SrmMonitor(expected_ratio=[1, 2])
+    for batch in df_srm_batches:
+        monitor.update(batch=batch)
+    counts = pd.concat(df_srm_batches)["group"].value_counts()
+    counts = [counts["control"], counts["treatment"]]
+
+    assert monitor.counts.tolist() == counts
+    assert monitor.p_value == pytest.approx(
+        st.chisquare(
+            f_obs=counts, f_exp=np.multiply(sum(counts), [1 / 3, 2 / 3])
+        ).pvalue
+    )
+    assert not monitor.flagged
+
+
+def test_flags_first_significant_chunk(capsys):
+    monitor = SrmMonitor()
+    monitor.update_counts(counts=[500, 520])
+    monitor.update_counts(counts=[500, 700])
+    monitor.update_counts(counts=[500, 500])
+
+    assert monitor.flagged_at == 2
+    assert capsys.readouterr().out.count("Sample ratio mismatch") == 1
+
+
+def test_update_ignores_other_groups():
+    monitor = SrmMonitor().update(
+        batch=pd.DataFrame(data={"group": ["control", "treatment", "other"]})
+    )
+
+    assert monitor.counts.tolist() == [1, 1]
+
+
+def test_slots():
+    with pytest.raises(AttributeError):
+        SrmMonitor().expected = 1
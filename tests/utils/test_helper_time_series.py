@@ -0,0 +1,56 @@
+import pytest
+import numpy as np
+import pandas as pd
+import src.utils.helper_ab_test as f
+import src.utils.helper_time_series as t
+
+
+@pytest.mark.parametrize("freq, n_periods", [("D", 7), ("h", 7 * 24)])
+def test_get_cumulative_conversions(df_time_series_data, freq, n_periods):
+    df_curve = t.get_cumulative_conversions(data=df_time_series_data, freq=freq)
+
+    assert len(df_curve) == n_periods
+    assert df_curve.index.is_monotonic_increasing
+    # the last period covers every user
+    assert df_curve["total_users_control"].iloc[-1] + df_curve[
+        "total_users_treatment"
+    ].iloc[-1] == len(df_time_series_data)
+
+    # matches re-running the A/B test on the data truncated at the end of each of a few periods
+    for period in df_curve.index[[0, n_periods // 2, -1]]:
+        df = df_time_series_data[
+            df_time_series_data["timestamp"]
+            < period + pd.tseries.frequencies.to_offset(freq)
+        ]
+        counts = df.groupby(by="group", observed=True)["converted"].agg(
+            ["sum", "count"]
+        )
+        lower_bound, upper_bound = f.get_ab_test_ci(
+            conversions_control=counts.loc["control", "sum"],
+            conversions_treatment=counts.loc["treatment", "sum"],
+            total_users_control=counts.loc["control", "count"],
+            total_users_treatment=counts.loc["treatment", "count"],
+        )
+        assert (
+            df_curve.loc[period, "total_users_control"]
+            == counts.loc["control", "count"]
+        )
+        np.testing.assert_allclose(
+            df_curve.loc[period, ["lower_bound", "upper_bound"]].to_numpy(dtype=float),
+            [lower_bound, upper_bound],
+        )
+
+
+def test_get_cumulative_conversions_late_arm(df_time_series_data):
+    # treatment only starts on the third day, so the first two days have no lift
+    df = df_time_series_data[
+        (df_time_series_data["group"] == "control")
+        | (df_time_series_data["timestamp"] >= "2017-01-04")
+    ]
+    df_curve = t.get_cumulative_conversions(data=df)
+
+    assert df_curve.index[0] == pd.Timestamp("2017-01-04")
+    assert (
+        df_curve["total_users_control"].iloc[0]
+        == ((df["group"] == "control") & (df["timestamp"] < "2017-01-05")).sum()
+    )
@@ -0,0 +1,102 @@
+import pytest
+import numpy as np
+import pandas as pd
+import src.utils.helper_data_wrangle as w
+import src.utils.helper_validation as v
+
+
+def test_validate_ab_data(df_raw_ab_data):
+    report = v.validate_ab_data(data=df_raw_ab_data)
+
+    pd.testing.assert_frame_equal(
+        report.crosstab,
+        pd.crosstab(df_raw_ab_data["group"], df_raw_ab_data["landing_page"])
+        .loc[["control", "treatment"], ["old_page", "new_page"]]
+        .rename_axis(index=None, columns=None),
+        check_dtype=False,
+    )
+    assert report.n_rows == len(df_raw_ab_data)
+    assert report.n_mismatched == 2
+    assert report.mismatch_examples == [4, 6]
+    assert report.n_users_both_arms == 0
+
+
+@pytest.mark.parametrize("chunksize", [1, 2, 4])
+def test_validate_ab_data_chunked(df_raw_ab_data, chunksize):
+    df = df_raw_ab_data.assign(
+        group=df_raw_ab_data["group"].where(
+            df_raw_ab_data.index != 3, other="treatment"
+        )
+    )
+    report = v.validate_ab_data(
+        data=[
+            df.iloc[slice(start, start + chunksize)]
+            for start in range(0, len(df), chunksize)
+        ]
+    )
+    expected = v.validate_ab_data(data=df)
+
+    pd.testing.assert_frame_equal(report.crosstab, expected.crosstab)
+    assert report[1:] == expected[1:]
+    # user 1 is now in both groups
+    assert report.n_users_both_arms == 1
+    assert report.both_arms_examples == [1]
+
+
+def test_validate_ab_data_invalid(df_raw_ab_data):
+    df = df_raw_ab_data.assign(
+        landing_page=df_raw_ab_data["landing_page"].where(
+            df_raw_ab_data.index != 0, other=None
+        )
+    )
+    report = v.validate_ab_data(data=df)
+
+    assert report.n_invalid == 1
+
+
+@pytest.mark.parametrize("chunksize", [2, 11])
+def test_validate_ab_data_extra_labels(df_raw_ab_data, chunksize):
+    df = df_raw_ab_data.assign(
+        group=df_raw_ab_data["group"]
+        .replace("treatment", "variant_b")
+        .astype("category"),
+        landing_page=df_raw_ab_data["landing_page"].replace("new_page", "beta_page"),
+    )
+    report = v.validate_ab_data(
+        data=[
+            df.iloc[slice(start, start + chunksize)]
+            for start in range(0, len(df), chunksize)
+        ]
+    )
+
+    # labels outside of the expected pairs are kept in the crosstab rather than dropped
+    rows, columns = ["control", "variant_b"], ["old_page", "beta_page"]
+    np.testing.assert_array_equal(
+        report.crosstab.loc[rows, columns].to_numpy(),
+        pd.crosstab(df["group"], df["landing_page"]).loc[rows, columns].to_numpy(),
+    )
+    assert report.crosstab.to_numpy().sum() == len(df)
+    assert report.n_invalid == 0
+    # control never sees its page replaced, so only its mismatched row and every variant_b row are unexpected
+    assert report.n_mismatched == 1 + (df["group"] == "variant_b").sum()
+
+
+def test_clean_ab_data_chunked_validator(path_raw_ab_data, df_raw_ab_data, tmp_path):
+    validator = v.DataValidator()
+    w.clean_ab_data_chunked(
+        path_in=path_raw_ab_data,
+        path_out=tmp_path / "df_conversion_clean.csv",
+        chunksize=3,
+        validator=validator,
+    )
+    report = validator.report()
+    expected = v.validate_ab_data(data=df_raw_ab_data)
+
+    pd.testing.assert_frame_equal(report.crosstab, expected.crosstab)
+    assert report[1:] == expected[1:]
+
+
+def test_report_validation(df_raw_ab_data, capsys):
+    v.report_validation(report=v.validate_ab_data(data=df_raw_ab_data))
+
+    assert "2 of 11 rows saw an unexpected landing page" in capsys.readouterr().out